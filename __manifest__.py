@@ -11,27 +11,41 @@ customer sales, staff performance, and service tracking.
     'author': "iStallana Solutions",
     'website': "https://www.yourcompany.com",
     'category': 'Point of Sale',
-    'version': '0.1',
+    'version': '0.2',
 
     # Dependencies
-    'depends': ['base', 'point_of_sale'],
+    'depends': ['base', 'hr', 'point_of_sale', 'pos_hr'],
 
     # Data files loaded always
     'data': [
         'security/ir.model.access.csv',
+        'data/pos_report_daily_fact_data.xml',
+        'data/pos_report_job_data.xml',
+        'data/pos_report_retention_data.xml',
+        'data/pos_commission_sales_view_data.xml',
+        'data/pos_report_precompute_data.xml',
         'views/pos_commission_report.xml',
         'views/pos_customer_report.xml',
         'views/staff_service_performance_report_wizard_view.xml',
+        'views/pos_report_run.xml',
+        'views/pos_report.xml',
         # 'views/customer_report_views.xml',
         # 'views/pos_sales_report.xml',
         'views/menus.xml',
     ],
 
+    'assets': {
+        'web.assets_backend': [
+            'myreport/static/src/pos_report_grid/*',
+        ],
+    },
+
     # Demo dataValueError: No record found for unique ID base.public_user. It may have been deleted.
 
     'demo': ['demo/demo.xml'],
 
     # Technical flags
+    'post_init_hook': 'post_init_hook',
     'installable': True,
     'application': True,
     'auto_install': False,
@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+"""Synthetic POS dataset generator and report benchmark.
+
+Seed a database with a synthetic POS history, then time the generate and export
+actions of every report model::
+
+    python benchmarks/pos_report_benchmark.py -c odoo.conf -d pos_bench seed --scale 1m
+    python benchmarks/pos_report_benchmark.py -c odoo.conf -d pos_bench run --output run.jsonl
+    python benchmarks/pos_report_benchmark.py compare baseline.jsonl run.jsonl
+
+Seeded rows are tagged with the ``BENCH/`` name prefix and can be dropped with
+``seed --reset``. Report runs are rolled back, so the dataset is reused between
+runs. Each measurement is one JSON line keyed by (scale, model, action) so runs
+are directly comparable.
+"""
+import argparse
+import json
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from datetime import date, timedelta
+
+# Volumes per scale: order lines, employees, branches, days of history
+SCALES = {
+    '10k': {'lines': 10_000, 'employees': 20, 'branches': 3, 'days': 30},
+    '1m': {'lines': 1_000_000, 'employees': 200, 'branches': 12, 'days': 365},
+    '10m': {'lines': 10_000_000, 'employees': 1000, 'branches': 40, 'days': 3 * 365},
+}
+LINES_PER_ORDER = 4
+PREFIX = 'BENCH/'
+
+
+def _boot(config_file, dbname):
+    import odoo
+    from odoo.modules.registry import Registry
+    odoo.tools.config.parse_config(['-c', config_file, '-d', dbname] if config_file else ['-d', dbname])
+    return Registry(dbname)
+
+
+# ---------------------------------------------------------------------------
+# Seeding
+# ---------------------------------------------------------------------------
+
+def reset(env):
+    cr = env.cr
+    # Facts reference the seeded branches (ON DELETE RESTRICT) and cached results cover their orders
+    cr.execute("""
+        DELETE FROM pos_report_daily_fact
+        WHERE config_id IN (SELECT id FROM pos_config WHERE name LIKE %s)
+    """, (PREFIX + '%',))
+    env['pos.customer.report.cache'].search([]).unlink()
+    cr.execute("DELETE FROM pos_payment WHERE name LIKE %s", (PREFIX + '%',))
+    cr.execute("DELETE FROM pos_order_line WHERE name LIKE %s", (PREFIX + '%',))
+    cr.execute("DELETE FROM pos_order WHERE name LIKE %s", (PREFIX + '%',))
+    cr.execute("DELETE FROM pos_session WHERE name LIKE %s", (PREFIX + '%',))
+    env['hr.employee'].search([('name', '=like', PREFIX + '%')]).unlink()
+    env['pos.config'].search([('name', '=like', PREFIX + '%')]).unlink()
+
+
+def seed(env, scale):
+    volumes = SCALES[scale]
+    cr = env.cr
+    company = env.company
+    end_day = date.today() - timedelta(days=1)
+    start_day = end_day - timedelta(days=volumes['days'] - 1)
+
+    employees = env['hr.employee'].create([{
+        'name': f'{PREFIX}Employee {index:05d}',
+        'barcode': f'BENCH{index:07d}',
+    } for index in range(volumes['employees'])])
+    configs = env['pos.config'].create([{
+        'name': f'{PREFIX}Branch {index:03d}',
+    } for index in range(volumes['branches'])])
+    products = env['product.product'].search([('available_in_pos', '=', True)], limit=200) \
+        or env['product.product'].search([], limit=200)
+    payment_methods = configs.mapped('payment_method_ids') or env['pos.payment.method'].search([], limit=3)
+    pricelist = env['product.pricelist'].search([], limit=1)
+    env.flush_all()
+
+    # One session per branch and day
+    cr.execute("""
+        INSERT INTO pos_session (name, config_id, user_id, state, start_at, stop_at, sequence_number, login_number)
+        SELECT %s || c.id || '/' || d::date, c.id, %s, 'closed', d, d + interval '12 hours', 1, 0
+        FROM unnest(%s::int[]) AS c(id), generate_series(%s::timestamp, %s::timestamp, interval '1 day') AS d
+    """, (PREFIX, env.uid, configs.ids, start_day, end_day))
+
+    orders = volumes['lines'] // LINES_PER_ORDER
+    cr.execute("""
+        WITH sessions AS (
+            SELECT row_number() OVER (ORDER BY id) - 1 AS rn, id, config_id, start_at
+            FROM pos_session WHERE name LIKE %s
+        )
+        INSERT INTO pos_order (name, pos_reference, company_id, session_id, config_id, user_id, employee_id,
+                               pricelist_id, date_order, state, amount_tax, amount_total, amount_paid,
+                               amount_return, sequence_number)
+        SELECT %s || n, 'Order ' || n, %s, s.id, s.config_id, %s,
+               (%s::int[])[1 + n %% %s], %s,
+               s.start_at + (n %% 43200) * interval '1 second',
+               (ARRAY['paid', 'done', 'invoiced', 'paid', 'cancel'])[1 + n %% 5],
+               0, 0, 0, 0, n
+        FROM generate_series(1, %s) AS n
+        JOIN sessions s ON s.rn = n %% (SELECT COUNT(*) FROM sessions)
+    """, (PREFIX + '%', PREFIX, company.id, env.uid, employees.ids, len(employees), pricelist.id or None, orders))
+
+    cr.execute("""
+        INSERT INTO pos_order_line (name, full_product_name, order_id, product_id, company_id, qty,
+                                    price_unit, discount, price_subtotal, price_subtotal_incl, note,
+                                    employee_id)
+        SELECT %s || po.id || '-' || l, 'Bench product', po.id,
+               (%s::int[])[1 + (po.id + l) %% %s], po.company_id,
+               1 + (po.id + l) %% 3, 10 + (po.id * l) %% 90, 0,
+               (1 + (po.id + l) %% 3) * (10 + (po.id * l) %% 90),
+               (1 + (po.id + l) %% 3) * (10 + (po.id * l) %% 90) * 1.15,
+               he.barcode, he.id
+        FROM pos_order po
+        JOIN hr_employee he ON he.id = po.employee_id
+        CROSS JOIN generate_series(1, %s) AS l
+        WHERE po.name LIKE %s
+    """, (PREFIX, products.ids, len(products), LINES_PER_ORDER, PREFIX + '%'))
+
+    cr.execute("""
+        UPDATE pos_order po SET amount_total = t.total, amount_paid = t.total, amount_tax = t.tax
+        FROM (
+            SELECT order_id, SUM(price_subtotal_incl) AS total, SUM(price_subtotal_incl - price_subtotal) AS tax
+            FROM pos_order_line WHERE name LIKE %s GROUP BY order_id
+        ) t
+        WHERE po.id = t.order_id
+    """, (PREFIX + '%',))
+
+    # One or two payments per order
+    cr.execute("""
+        INSERT INTO pos_payment (name, pos_order_id, session_id, payment_method_id, amount, payment_date)
+        SELECT %s || po.id || '-' || p, po.id, po.session_id,
+               (%s::int[])[1 + (po.id + p) %% %s],
+               CASE WHEN po.id %% 3 = 0 THEN po.amount_total / 2 ELSE po.amount_total END,
+               po.date_order
+        FROM pos_order po, generate_series(1, 2) AS p
+        WHERE po.name LIKE %s AND (p = 1 OR po.id %% 3 = 0)
+    """, (PREFIX, payment_methods.ids, len(payment_methods), PREFIX + '%'))
+
+    if 'pos.report.daily.fact' in env:
+        env['pos.report.daily.fact']._backfill(start_day, end_day)
+    return {'start': start_day, 'end': end_day}
+
+
+# ---------------------------------------------------------------------------
+# Measurements
+# ---------------------------------------------------------------------------
+
+def measure(fn):
+    """Run ``fn`` and return its metrics; ``fn`` returns (rows, bytes)"""
+    thread = threading.current_thread()
+    thread.query_count, thread.query_time = 0, 0.0
+    tracemalloc.start()
+    started = time.perf_counter()
+    rows, produced = fn()
+    wall = time.perf_counter() - started
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'wall_s': round(wall, 4),
+        'sql_s': round(thread.query_time, 4),
+        'sql_count': thread.query_count,
+        'rows': rows,
+        'peak_mem_kb': peak // 1024,
+        'bytes': produced,
+    }
+
+
+def _export_bytes(report):
+    return sum(len(chunk) for chunk in report._iter_csv_chunks())
+
+
+def report_cases(env, start_day, end_day):
+    """Yield (model, action, callable) for every installed report"""
+    if 'pos.customer.report' in env:
+        report = env['pos.customer.report'].create({'start_date': start_day, 'end_date': end_day})
+        yield 'pos.customer.report', 'generate', lambda: (
+            report.action_generate_report() and len(report.report_line_ids), 0)
+        yield 'pos.customer.report', 'export_csv', lambda: (report.total_orders, _export_bytes(report))
+
+    if 'pos.staff.performance.report' in env:
+        report = env['pos.staff.performance.report'].create({
+            'start_date': f'{start_day} 00:00:00', 'end_date': f'{end_day} 23:59:59',
+        })
+        yield 'pos.staff.performance.report', 'generate', lambda: (
+            report.action_generate_report() and len(report.report_line_ids), 0)
+        yield 'pos.staff.performance.report', 'export_csv', lambda: (report.total_orders, _export_bytes(report))
+
+    if 'pos.commission.report' in env:
+        report = env['pos.commission.report'].create({'start_date': start_day, 'end_date': end_day})
+        yield 'pos.commission.report', 'generate', lambda: (
+            report.action_generate_report() and len(report.employee_line_ids), 0)
+        yield 'pos.commission.report', 'export_csv', lambda: (report.employee_count, _export_bytes(report))
+
+    if 'pos.sales.report' in env:
+        report = env['pos.sales.report'].create({'start_date': start_day, 'end_date': end_day})
+        yield 'pos.sales.report', 'generate', lambda: (len(report.fetch_report_data()), 0)
+
+    if 'pos.sales.report.wizard' in env:
+        wizard = env['pos.sales.report.wizard'].create({'start_date': start_day, 'end_date': end_day})
+        yield 'pos.sales.report.wizard', 'generate', lambda: (
+            wizard.action_fetch_details() and len(wizard.line_ids), 0)
+
+
+def run(env, scale, output):
+    from odoo import SUPERUSER_ID
+    env.cr.execute("SELECT MIN(date_order)::date, MAX(date_order)::date FROM pos_order WHERE name LIKE %s",
+                   (PREFIX + '%',))
+    start_day, end_day = env.cr.fetchone()
+    if not start_day:
+        sys.exit("No benchmark data, run the 'seed' command first.")
+
+    try:
+        revision = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    run_id = uuid.uuid4().hex[:8]
+
+    user = env.ref('base.user_admin', raise_if_not_found=False)
+    env = env(user=user.id if user else SUPERUSER_ID)
+    with open(output, 'a') as out:
+        for model, action, fn in report_cases(env, start_day, end_day):
+            result = {
+                'run_id': run_id, 'revision': revision, 'scale': scale,
+                'model': model, 'action': action, **measure(fn),
+            }
+            out.write(json.dumps(result) + '\n')
+            print(f"{model:32} {action:12} {result['wall_s']:>10.3f}s  sql {result['sql_s']:>9.3f}s "
+                  f"rows {result['rows']:>9}  mem {result['peak_mem_kb']:>9} KB  bytes {result['bytes']}")
+            env.flush_all()
+    env.cr.rollback()
+
+
+def compare(baseline, candidate, threshold):
+    def load(path):
+        with open(path) as f:
+            results = [json.loads(line) for line in f if line.strip()]
+        # Keep the last measurement of each case
+        return {(r['scale'], r['model'], r['action']): r for r in results}
+
+    before, after = load(baseline), load(candidate)
+    regressions = 0
+    for key in sorted(set(before) & set(after)):
+        old, new = before[key], after[key]
+        ratio = new['wall_s'] / old['wall_s'] if old['wall_s'] else 1.0
+        flag = ''
+        if ratio > 1 + threshold:
+            flag = 'REGRESSION'
+            regressions += 1
+        print(f"{key[0]:4} {key[1]:32} {key[2]:12} {old['wall_s']:>9.3f}s -> {new['wall_s']:>9.3f}s "
+              f"x{ratio:5.2f}  mem {old['peak_mem_kb']} -> {new['peak_mem_kb']} KB  {flag}")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-c', '--config', help='Odoo configuration file')
+    parser.add_argument('-d', '--database', help='Benchmark database')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    seed_parser = sub.add_parser('seed', help='Generate the synthetic POS dataset')
+    seed_parser.add_argument('--scale', choices=SCALES, default='10k')
+    seed_parser.add_argument('--reset', action='store_true', help='Drop previously seeded data first')
+
+    run_parser = sub.add_parser('run', help='Benchmark the report actions')
+    run_parser.add_argument('--scale', choices=SCALES, default='10k', help='Label stored with the results')
+    run_parser.add_argument('--output', default='bench_output.jsonl')
+
+    compare_parser = sub.add_parser('compare', help='Compare two result files')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('candidate')
+    compare_parser.add_argument('--threshold', type=float, default=0.2, help='Allowed slowdown (0.2 = 20%%)')
+
+    args = parser.parse_args()
+    if args.command == 'compare':
+        sys.exit(compare(args.baseline, args.candidate, args.threshold))
+    if not args.database:
+        parser.error('--database is required')
+
+    from odoo import api, SUPERUSER_ID
+    registry = _boot(args.config, args.database)
+    with registry.cursor() as cr:
+        env = api.Environment(cr, SUPERUSER_ID, {})
+        if args.command == 'seed':
+            if args.reset:
+                reset(env)
+            bounds = seed(env, args.scale)
+            print(f"Seeded {args.scale} dataset from {bounds['start']} to {bounds['end']}")
+        else:
+            run(env, args.scale, args.output)
+
+
+if __name__ == '__main__':
+    main()
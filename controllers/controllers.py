@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
-from odoo import http
-from odoo.http import request
+from odoo import api, http
+from odoo.http import request, content_disposition, Response
+from odoo.modules.registry import Registry
 import io
 import csv
 
@@ -63,3 +64,75 @@ class PosSalesReportController(http.Controller):
             ]
         )
         return response
+
+
+class PosReportExportController(http.Controller):
+
+    _export_formats = {
+        'csv': ('text/csv;charset=utf-8', '_iter_csv_chunks'),
+        'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', '_iter_xlsx_chunks'),
+    }
+
+    def _stream_report(self, model_name, report_id, file_format='csv'):
+        """Stream a report export while rows are read from a server-side cursor.
+
+        The request cursor is closed once the response object is returned, so the
+        generator opens its own cursor for the lifetime of the download.
+        """
+        report = request.env[model_name].browse(report_id)
+        if not report.exists():
+            return request.not_found()
+        report.check_access('read')
+        report._check_export_ready()
+        if file_format == 'xlsx':
+            report._check_xlsx_available()
+
+        content_type, chunk_method = self._export_formats[file_format]
+        filename = report._get_export_filename(file_format)
+        dbname, uid, context = request.db, request.env.uid, dict(request.env.context)
+
+        def generate():
+            with Registry(dbname).cursor() as cr:
+                env = api.Environment(cr, uid, context)
+                yield from getattr(env[model_name].browse(report_id), chunk_method)()
+
+        return Response(
+            generate(),
+            headers=[
+                ('Content-Type', content_type),
+                ('Content-Disposition', content_disposition(filename)),
+            ],
+            direct_passthrough=True,
+        )
+
+    @http.route('/pos_report/customer/<int:report_id>/csv', type='http', auth='user')
+    def download_customer_report_csv(self, report_id, **kwargs):
+        return self._stream_report('pos.customer.report', report_id)
+
+    @http.route('/pos_report/staff/<int:report_id>/csv', type='http', auth='user')
+    def download_staff_report_csv(self, report_id, **kwargs):
+        return self._stream_report('pos.staff.performance.report', report_id)
+
+    @http.route('/pos_report/commission/<int:report_id>/csv', type='http', auth='user')
+    def download_commission_report_csv(self, report_id, **kwargs):
+        return self._stream_report('pos.commission.report', report_id)
+
+    @http.route('/pos_report/customer/<int:report_id>/xlsx', type='http', auth='user')
+    def download_customer_report_xlsx(self, report_id, **kwargs):
+        return self._stream_report('pos.customer.report', report_id, 'xlsx')
+
+    @http.route('/pos_report/staff/<int:report_id>/xlsx', type='http', auth='user')
+    def download_staff_report_xlsx(self, report_id, **kwargs):
+        return self._stream_report('pos.staff.performance.report', report_id, 'xlsx')
+
+    @http.route('/pos_report/commission/<int:report_id>/xlsx', type='http', auth='user')
+    def download_commission_report_xlsx(self, report_id, **kwargs):
+        return self._stream_report('pos.commission.report', report_id, 'xlsx')
+
+    @http.route('/pos_report/employee_details/<int:report_id>/csv', type='http', auth='user')
+    def download_employee_details_csv(self, report_id, **kwargs):
+        return self._stream_report('pos.employee.detail.wizard', report_id)
+
+    @http.route('/pos_report/employee_details/<int:report_id>/xlsx', type='http', auth='user')
+    def download_employee_details_xlsx(self, report_id, **kwargs):
+        return self._stream_report('pos.employee.detail.wizard', report_id, 'xlsx')
@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+
+
+def post_init_hook(env):
+    """Resolve the employee of the existing order lines and build their daily facts"""
+    env['pos.order.line']._backfill_employee_id()
+    Fact = env['pos.report.daily.fact']
+    Fact._init_fact_tz()
+    Fact._backfill()
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+import logging
+from odoo import api, SUPERUSER_ID
+
+_logger = logging.getLogger(__name__)
+
+
+def migrate(cr, version):
+    """Resolve the new pos.order.line employee_id and build the daily facts of the existing orders"""
+    if not version:
+        return
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    updated = env['pos.order.line']._backfill_employee_id()
+    _logger.info("Resolved the employee of %s POS order lines", updated)
+
+    # Commission reports read the fact table, it must cover the whole history
+    Fact = env['pos.report.daily.fact']
+    Fact._init_fact_tz()
+    rows = Fact._backfill()
+    _logger.info("Built %s POS daily fact rows", rows)
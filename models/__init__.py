@@ -1,9 +1,28 @@
 # -*- coding: utf-8 -*-
 
 # from . import models
+from . import pos_report_date_range
+from . import pos_report_run
+from . import pos_report_dimension
+from . import pos_report_export
+from . import pos_report_snapshot
+from . import pos_report_partition
+from . import pos_report_refresh
+from . import pos_report_line
+from . import pos_report_retention
+from . import pos_report_precompute
+from . import pos_report_job
+from . import pos_report_daily_fact
+from . import pos_order
+from . import pos_order_line
+from . import hr_employee
+from . import pos_commission_rule
+from . import pos_commission_sales_view
 from . import  pos_commission_report
 from . import  pos_customer_report
+from . import pos_customer_report_cache
 from . import staff_service_performance_report
+from . import pos_report
 
 # from . import customer_report
 # from . import pos_sales_report
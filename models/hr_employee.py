@@ -0,0 +1,81 @@
+from odoo import models, api, tools
+from .pos_report_dimension import create_cache_version, get_cache_version, bump_cache_version
+
+# Sequence versioning the cached POS report employee lists
+EMPLOYEE_CACHE_VERSION = 'pos_report_employee_version'
+
+
+class HrEmployee(models.Model):
+    _inherit = "hr.employee"
+
+    # Fields the cached POS report employee list depends on
+    _pos_report_cache_fields = {
+        'name', 'active', 'company_id', 'individual_sale_target', 'individual_commission_rate',
+    }
+
+    def init(self):
+        super().init()
+        create_cache_version(self.env.cr, EMPLOYEE_CACHE_VERSION)
+
+    def _get_pos_report_cache_version(self):
+        return get_cache_version(self.env.cr, EMPLOYEE_CACHE_VERSION)
+
+    def _bump_pos_report_cache(self):
+        bump_cache_version(self.env.cr, EMPLOYEE_CACHE_VERSION)
+
+    @api.model
+    @tools.ormcache('self.env.uid', 'tuple(sorted(self.env.companies.ids))', 'include_archived',
+                    'self._get_pos_report_cache_version()')
+    def _get_pos_report_employees(self, include_archived=False):
+        """Return the employees visible to the current user, ordered by name.
+
+        One set-based query applying the hr.employee record rules and the allowed
+        companies, cached per (uid, allowed companies). Each item is an
+        (id, name, target_amount, commission_rate) tuple; callers must not mutate it.
+        Archived employees are only included with ``include_archived``.
+        """
+        if not self.has_access('read'):
+            return ()
+        domain = [('active', 'in', (True, False))] if include_archived else [('active', '=', True)]
+        query = self._search(domain, order='name')
+        self.env.cr.execute(query.select(
+            '"hr_employee"."id"',
+            '"hr_employee"."name"',
+            'COALESCE("hr_employee"."individual_sale_target", 0)',
+            'COALESCE("hr_employee"."individual_commission_rate", 0)',
+        ))
+        return tuple(self.env.cr.fetchall())
+
+    def _pos_report_cache_changed(self, vals):
+        """Whether writing ``vals`` changes a field of ``self`` the cached employee list depends on"""
+        for name in self._pos_report_cache_fields.intersection(vals):
+            field = self._fields[name]
+            value = field.convert_to_cache(vals[name], self)
+            if any(field.convert_to_cache(record[name], record) != value for record in self):
+                return True
+        return False
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        employees = super().create(vals_list)
+        if employees:
+            self._bump_pos_report_cache()
+        self.env['pos.order.line'].sudo()._resolve_unassigned_lines(employees)
+        return employees
+
+    def write(self, vals):
+        cache_changed = self._pos_report_cache_changed(vals)
+        res = super().write(vals)
+        if cache_changed:
+            self._bump_pos_report_cache()
+        if vals.get('barcode'):
+            self.env['pos.order.line'].sudo()._resolve_unassigned_lines(self)
+        return res
+
+    def unlink(self):
+        # Their fact rows would otherwise collide with the rows without employee
+        self.env['pos.report.daily.fact'].sudo()._merge_employees(self.ids)
+        res = super().unlink()
+        if self:
+            self._bump_pos_report_cache()
+        return res
@@ -1,21 +1,35 @@
-import io
-import csv
-import base64
-from datetime import date, datetime
+from datetime import datetime, timedelta
+from dateutil.relativedelta import relativedelta
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError
+from .pos_report_daily_fact import FACT_ORDER_STATES
+from ..tools.commission_engine import compute_commissions
+from .pos_report_run import report_run
 
 
 class PosCommissionReport(models.Model):
     _name = 'pos.commission.report'
+    _inherit = [
+        'pos.report.date.range.mixin', 'pos.report.export.mixin', 'pos.report.job.mixin', 'pos.report.trace.mixin',
+        'pos.report.precompute.mixin',
+    ]
     _description = 'POS Commission Report'
     _order = 'create_date desc'
     _rec_name = 'display_name'
+    _export_route = 'commission'
+    _job_cron_xmlid = 'ir_cron_pos_commission_report_queue'
+    _retention_line_models = ('pos.commission.report.line',)
+    _precompute_copy_fields = (
+        'total_sales', 'total_commission', 'employee_count',
+        'previous_total_sales', 'previous_growth', 'last_year_total_sales', 'last_year_growth',
+    )
 
     # Filter fields
     start_date = fields.Date(required=True, default=fields.Date.context_today)
     end_date = fields.Date(required=True, default=fields.Date.context_today)
     category_ids = fields.Many2many('product.category', string='Product Categories')
+    compare_previous_period = fields.Boolean(string='Compare with Previous Period')
+    compare_previous_year = fields.Boolean(string='Compare with Same Period Last Year')
 
     # Display name
     display_name = fields.Char(string='Report Name', compute='_compute_display_name', store=True)
@@ -27,6 +41,10 @@ class PosCommissionReport(models.Model):
     total_sales = fields.Float(readonly=True)
     total_commission = fields.Float(readonly=True)
     employee_count = fields.Integer(readonly=True)
+    previous_total_sales = fields.Float(string='Previous Period Sales', readonly=True)
+    previous_growth = fields.Float(string='Growth vs Previous Period %', readonly=True)
+    last_year_total_sales = fields.Float(string='Last Year Sales', readonly=True)
+    last_year_growth = fields.Float(string='Growth vs Last Year %', readonly=True)
 
     # Employee lines
     employee_line_ids = fields.One2many('pos.commission.report.line', 'report_id', string='Employee Lines',
@@ -50,84 +68,249 @@ class PosCommissionReport(models.Model):
             if record.start_date > record.end_date:
                 raise UserError(_("Start date cannot be after end date."))
 
-    def _get_commission_data(self):
-        """Get commission data for ALL employees"""
-        self.ensure_one()
+    def _get_comparison_periods(self):
+        """Return {key: (start_date, end_date)} of the periods the report is compared with.
 
-        # Get ALL employees first (respecting multi-company rules)
-        all_employees_query = """
+        Reports covering whole months are compared with the same number of whole
+        months, other ranges with the same number of days.
+        """
+        self.ensure_one()
+        start, end = self.start_date, self.end_date
+        whole_months = start.day == 1 and (end + timedelta(days=1)).day == 1
+
+        def shift(months):
+            delta = relativedelta(months=months)
+            if whole_months:
+                # Keep the end on the last day of its month, e.g. Feb 28 -> Feb 29
+                return start - delta, end + timedelta(days=1) - delta - timedelta(days=1)
+            return start - delta, end - delta
+
+        periods = {}
+        if self.compare_previous_period:
+            if whole_months:
+                periods['previous'] = shift((end.year - start.year) * 12 + end.month - start.month + 1)
+            else:
+                periods['previous'] = (start - (end - start) - timedelta(days=1), start - timedelta(days=1))
+        if self.compare_previous_year:
+            periods['last_year'] = shift(12)
+        return periods
+
+    def _get_sales_relation(self, periods=None):
+        """Return (sql, params) of the sales per employee, day and category.
+
+        ``periods`` is a list of (start_date, end_date) pairs, the report period
+        by default. All of them are read in one scan; callers tell them apart
+        by ``day``, which is in the report timezone.
+
+        Reads the pos_report_daily_fact table when its days are cut in the same
+        timezone as the report. Otherwise the hours within the window of the
+        pos_commission_sales_hourly view are read from it and only the slices
+        outside it are aggregated live from the POS order lines.
+        """
+        periods = periods or [(self.start_date, self.end_date)]
+        tz = self._get_report_tz()
+        Fact = self.env['pos.report.daily.fact']
+        if Fact._get_fact_tz() == tz:
+            clause, params = self._get_ranges_clause('day', periods, inclusive=True)
+            query = f"""
+                SELECT employee_id, day, categ_id, qty, subtotal_incl
+                FROM pos_report_daily_fact
+                WHERE {clause}
+            """
+            return query, params
+
+        bounds = [self._get_date_range_bounds(start, end) for start, end in periods]
+        complete = self.env['pos.commission.sales.hourly']._get_complete_range()
+        if not complete:
+            return self._get_live_sales_relation(bounds)
+        complete_from, complete_until = complete
+        # Hour buckets only add up to the report days when these start on whole hours
+        view_bounds = [(max(lower, complete_from), min(upper, complete_until)) for lower, upper in bounds
+                       if lower < complete_until and upper > complete_from]
+        if not view_bounds or any(lower.minute or upper.minute for lower, upper in bounds):
+            return self._get_live_sales_relation(bounds)
+
+        clause, params = self._get_ranges_clause('hour', view_bounds)
+        query = f"""
             SELECT
-                he.id as employee_id,
-                he.name as employee_name,
-                COALESCE(he.individual_sale_target, 0) as target_amount,
-                COALESCE(he.individual_commission_rate, 0) as commission_rate
-            FROM hr_employee he
-            WHERE he.active = True
-            ORDER BY he.name
+                employee_id,
+                (hour AT TIME ZONE 'UTC' AT TIME ZONE %s)::date as day,
+                categ_id,
+                SUM(qty) as qty,
+                SUM(subtotal_incl) as subtotal_incl
+            FROM pos_commission_sales_hourly
+            WHERE {clause}
+            GROUP BY 1, 2, 3
         """
-        self.env.cr.execute(all_employees_query)
-        all_employees = self.env.cr.dictfetchall()
-
-        # Filter employees by company access
-        accessible_employees = []
-        for emp in all_employees:
-            employee = self.env['hr.employee'].browse(emp['employee_id'])
-            if employee and employee.check_access_rights('read', raise_exception=False):
-                accessible_employees.append(emp)
-
-        # Get sales data for the period
-        sales_query = """
+        params = [tz] + params
+        live_bounds = [(lower, min(upper, complete_from)) for lower, upper in bounds if lower < complete_from]
+        live_bounds += [(max(lower, complete_until), upper) for lower, upper in bounds if upper > complete_until]
+        if live_bounds:
+            live_query, live_params = self._get_live_sales_relation(live_bounds)
+            query = f"{query} UNION ALL {live_query}"
+            params += live_params
+        return query, params
+
+    def _get_live_sales_relation(self, bounds):
+        """Return (sql, params) of the sales in the UTC ``bounds`` aggregated from the POS order lines"""
+        clause, params = self._get_ranges_clause('po.date_order', bounds)
+        query = f"""
             SELECT
                 po.employee_id,
-                SUM(pol.price_subtotal_incl) as total_sales
+                (po.date_order AT TIME ZONE 'UTC' AT TIME ZONE %s)::date as day,
+                pt.categ_id,
+                SUM(pol.qty) as qty,
+                SUM(pol.price_subtotal_incl) as subtotal_incl
             FROM pos_order_line pol
             JOIN pos_order po ON pol.order_id = po.id
             JOIN product_product pp ON pol.product_id = pp.id
             JOIN product_template pt ON pp.product_tmpl_id = pt.id
-            WHERE po.date_order::date BETWEEN %s AND %s
-                AND po.state IN ('paid', 'done', 'invoiced')
-                AND po.employee_id IS NOT NULL
+            WHERE {clause}
+                AND po.state IN %s
+            GROUP BY 1, 2, 3
         """
+        return query, [self._get_report_tz()] + params + [FACT_ORDER_STATES]
 
-        params = [self.start_date, self.end_date]
+    def _get_commission_data(self):
+        """Get commission data for ALL employees, with their sales in each comparison period"""
+        self.ensure_one()
+
+        # Employees visible to the current user (record rules and allowed companies)
+        accessible_employees = [
+            {
+                'employee_id': employee_id,
+                'employee_name': name,
+                'target_amount': target_amount,
+                'commission_rate': commission_rate,
+            }
+            for employee_id, name, target_amount, commission_rate
+            in self.env['hr.employee']._get_pos_report_employees()
+        ]
+
+        # Get sales data for the period and the comparison periods in one scan
+        periods = {'total_sales': (self.start_date, self.end_date)}
+        for key, period in self._get_comparison_periods().items():
+            periods[f'{key}_sales'] = period
+        sales_relation, relation_params = self._get_sales_relation(list(periods.values()))
+        columns, params = [], []
+        for name, (start, end) in periods.items():
+            columns.append(f"SUM(sales.subtotal_incl) FILTER (WHERE sales.day >= %s AND sales.day <= %s) as {name}")
+            params += [start, end]
+        sales_query = f"""
+            SELECT
+                sales.employee_id,
+                {', '.join(columns)}
+            FROM ({sales_relation}) sales
+            WHERE sales.employee_id IS NOT NULL
+        """
+        params += relation_params
 
         if self.category_ids:
-            sales_query += " AND pt.categ_id IN %s"
+            sales_query += " AND sales.categ_id IN %s"
             params.append(tuple(self.category_ids.ids))
 
-        sales_query += " GROUP BY po.employee_id"
+        sales_query += " GROUP BY sales.employee_id"
 
-        self.env.cr.execute(sales_query, tuple(params))
-        sales_data = self.env.cr.dictfetchall()
+        sales_data = self._report_execute(sales_query, tuple(params)).dictfetchall()
 
         # Create a dictionary for quick sales lookup
-        sales_dict = {sale['employee_id']: sale['total_sales'] for sale in sales_data}
+        sales_dict = {sale.pop('employee_id'): sale for sale in sales_data}
 
         # Combine employee data with sales data
         result = []
         for emp in accessible_employees:
-            employee_id = emp['employee_id']
-            total_sales = sales_dict.get(employee_id, 0.0)
-
-            result.append({
-                'employee_id': employee_id,
-                'employee_name': emp['employee_name'],
-                'target_amount': emp['target_amount'],
-                'commission_rate': emp['commission_rate'],
-                'total_sales': total_sales
-            })
+            sales = sales_dict.get(emp['employee_id'], {})
+            result.append(dict(emp, **{name: sales.get(name) or 0.0 for name in periods}))
 
         return result
 
+    def _get_category_sales(self, category_ids):
+        """Sales per employee in each of the given categories, as {(employee_id, categ_id): amount}"""
+        sales_relation, params = self._get_sales_relation()
+        query = f"""
+            SELECT sales.employee_id, sales.categ_id, SUM(sales.subtotal_incl)
+            FROM ({sales_relation}) sales
+            WHERE sales.employee_id IS NOT NULL
+                AND sales.categ_id = ANY(%s)
+        """
+        params.append(list(category_ids))
+        if self.category_ids:
+            query += " AND sales.categ_id IN %s"
+            params.append(tuple(self.category_ids.ids))
+        query += " GROUP BY sales.employee_id, sales.categ_id"
+        rows = self._report_execute(query, tuple(params)).fetchall()
+        return {(employee_id, categ_id): amount for employee_id, categ_id, amount in rows}
+
+    def _compute_commissions(self, commission_data):
+        """Run the commission engine on all employees, returns (earned, achievement) lists"""
+        rules = self.env['pos.commission.rule']._get_engine_rules()
+        category_ids = list(rules['category_rates'])
+        category_sales = None
+        if category_ids:
+            amounts = self._get_category_sales(category_ids)
+            category_sales = [
+                [amounts.get((emp['employee_id'], categ_id), 0.0) for categ_id in category_ids]
+                for emp in commission_data
+            ]
+        return compute_commissions(
+            [emp['total_sales'] or 0 for emp in commission_data],
+            [emp['target_amount'] or 0 for emp in commission_data],
+            [emp['commission_rate'] or 0 for emp in commission_data],
+            category_sales=category_sales,
+            category_rates=[rules['category_rates'][categ_id] for categ_id in category_ids],
+            tiers=rules['tiers'],
+            cap=rules['cap'],
+        )
+
+    @api.model
+    def _get_comparison_vals(self, key, current, base):
+        """Sales, delta and growth % of a line against comparison period ``key``"""
+        current, base = current or 0.0, base or 0.0
+        return {
+            f'{key}_sales': base,
+            f'{key}_delta': current - base,
+            f'{key}_growth': (current - base) * 100 / base if base else 0.0,
+        }
+
+    def _get_precompute_fingerprint(self):
+        return self._hash_filters({
+            'start_date': str(self.start_date),
+            'end_date': str(self.end_date),
+            'tz': self._get_report_tz(),
+            'category_ids': sorted(self.category_ids.ids),
+            'compare_previous_period': self.compare_previous_period,
+            'compare_previous_year': self.compare_previous_year,
+            # Employees the user may see with their targets and rates, and the company's rules
+            'employees': self.env['hr.employee']._get_pos_report_employees(),
+            'rules': self.env['pos.commission.rule']._get_engine_rules(),
+        })
+
+    @api.model
+    def _get_precompute_targets(self, configs):
+        """Yesterday's commissions of each company with POS branches; they are not split by branch"""
+        targets = []
+        for company in configs.company_id:
+            day = fields.Date.context_today(self._get_precompute_env(company)) - timedelta(days=1)
+            targets.append((company, {'start_date': day, 'end_date': day}))
+        return targets
+
+    @report_run('generate')
     def action_generate_report(self):
         """Generate the complete report"""
         self.ensure_one()
 
         # Clear previous lines
-        self.employee_line_ids.unlink()
+        with self._report_phase('persist'):
+            self.employee_line_ids.unlink()
+
+        precomputed = self._find_precomputed()
+        if precomputed:
+            return self._load_precomputed(precomputed)
 
         # Get commission data for ALL employees
-        commission_data = self._get_commission_data()
+        self._job_progress(_("Computing employee sales"))
+        with self._report_phase('query'):
+            commission_data = self._get_commission_data()
 
         if not commission_data:
             return {
@@ -142,43 +325,47 @@ class PosCommissionReport(models.Model):
                 }
             }
 
-        # Calculate totals and create lines
-        total_sales = 0
-        total_commission = 0
-        employee_lines = []
-
-        for emp in commission_data:
-            total_sales_emp = emp['total_sales'] or 0
-            target = emp['target_amount'] or 0
-            rate = emp['commission_rate'] or 0
-
-            # Calculate earned commission (only if target is met)
-            earned_commission = total_sales_emp * (rate / 100) if total_sales_emp >= target else 0
-            achievement_rate = (total_sales_emp / target * 100) if target > 0 else 0
-
-            # Create employee line
-            line_vals = {
-                'report_id': self.id,
-                'employee_id': emp['employee_id'],
-                'target_amount': target,
-                'commission_rate': rate,
-                'total_sales': total_sales_emp,
-                'earned_commission': earned_commission,
-                'achievement_rate': achievement_rate,
-            }
-            employee_lines.append((0, 0, line_vals))
-
-            total_sales += total_sales_emp
-            total_commission += earned_commission
+        # Calculate commissions for all employees in one batch
+        with self._report_phase('enrich'):
+            earned, achievement = self._compute_commissions(commission_data)
+
+            comparisons = list(self._get_comparison_periods())
+            employee_lines = []
+            for emp, earned_commission, achievement_rate in zip(commission_data, earned, achievement):
+                line = {
+                    'report_id': self.id,
+                    'employee_id': emp['employee_id'],
+                    'target_amount': emp['target_amount'] or 0,
+                    'commission_rate': emp['commission_rate'] or 0,
+                    'total_sales': emp['total_sales'] or 0,
+                    'earned_commission': earned_commission,
+                    'achievement_rate': achievement_rate,
+                }
+                for key in comparisons:
+                    line.update(self._get_comparison_vals(key, emp['total_sales'], emp[f'{key}_sales']))
+                employee_lines.append((0, 0, line))
+
+            total_sales = sum(emp['total_sales'] or 0 for emp in commission_data)
+            total_commission = sum(earned)
+            # Periods not compared are reset to 0
+            comparison_totals = {}
+            for key in ('previous', 'last_year'):
+                vals = self._get_comparison_vals(
+                    key, total_sales, sum(emp.get(f'{key}_sales', 0) for emp in commission_data))
+                comparison_totals[f'{key}_total_sales'] = vals[f'{key}_sales']
+                comparison_totals[f'{key}_growth'] = vals[f'{key}_growth']
 
         # Update report fields
-        self.write({
-            'employee_line_ids': employee_lines,
-            'total_sales': total_sales,
-            'total_commission': total_commission,
-            'employee_count': len(commission_data),
-            'report_generated': fields.Datetime.now()
-        })
+        self._job_progress(_("Saving employee lines"), rows=len(employee_lines))
+        with self._report_phase('persist'):
+            self.write({
+                'employee_line_ids': employee_lines,
+                'total_sales': total_sales,
+                'total_commission': total_commission,
+                'employee_count': len(commission_data),
+                'report_generated': fields.Datetime.now(),
+                **comparison_totals,
+            })
 
         # Return action to reload the current view
         return {
@@ -190,55 +377,49 @@ class PosCommissionReport(models.Model):
             'views': [(False, 'form')],
         }
 
-    def action_export_csv(self):
-        """Export summary to CSV"""
-        self.ensure_one()
-
-        if not self.employee_line_ids:
-            raise UserError(_("No data to export. Please generate the report first."))
-
-        output = io.StringIO()
-        writer = csv.writer(output)
-
-        # Write headers
-        headers = ['Employee', 'Target Amount', 'Commission Rate %', 'Total Sales', 'Earned Commission',
-                   'Achievement Rate %']
-        writer.writerow(headers)
-
-        # Write data
-        for line in self.employee_line_ids:
-            writer.writerow([
-                line.employee_id.sudo().name or 'Unknown',
-                f"{line.target_amount:,.2f}",
-                f"{line.commission_rate}%",
-                f"{line.total_sales:,.2f}",
-                f"{line.earned_commission:,.2f}",
-                f"{line.achievement_rate:.1f}%"
-            ])
-
-        # Write totals
-        writer.writerow([])
-        writer.writerow(['TOTAL', '', '',
-                         f"{self.total_sales:,.2f}",
-                         f"{self.total_commission:,.2f}", ''])
+    def _get_export_columns(self):
+        columns = [
+            ('Employee', 'char'), ('Target Amount', 'monetary'), ('Commission Rate %', 'percent'),
+            ('Total Sales', 'monetary'), ('Earned Commission', 'monetary'), ('Achievement Rate %', 'percent'),
+        ]
+        labels = {'previous': 'Previous Period', 'last_year': 'Last Year'}
+        for key in self._get_comparison_periods():
+            columns += [
+                (f'{labels[key]} Sales', 'monetary'), (f'Delta vs {labels[key]}', 'monetary'),
+                (f'Growth vs {labels[key]} %', 'percent'),
+            ]
+        return columns
+
+    def _get_export_query(self):
+        comparison_columns = ''.join(
+            f", COALESCE(line.{key}_sales, 0), COALESCE(line.{key}_delta, 0), COALESCE(line.{key}_growth, 0)"
+            for key in self._get_comparison_periods()
+        )
+        query = f"""
+            SELECT
+                COALESCE(he.name, 'Unknown'),
+                COALESCE(line.target_amount, 0),
+                COALESCE(line.commission_rate, 0),
+                COALESCE(line.total_sales, 0),
+                COALESCE(line.earned_commission, 0),
+                COALESCE(line.achievement_rate, 0)
+                {comparison_columns}
+            FROM pos_commission_report_line line
+            LEFT JOIN hr_employee he ON line.employee_id = he.id
+            WHERE line.report_id = %s
+            ORDER BY line.total_sales DESC, line.id
+        """
+        return query, (self.id,)
 
-        # Prepare file for download
-        csv_data = output.getvalue().encode('utf-8')
-        b64_data = base64.b64encode(csv_data)
+    def _get_export_summary_rows(self):
+        row = ['TOTAL', '', '', self.total_sales, self.total_commission, '']
+        for key in self._get_comparison_periods():
+            base = self[f'{key}_total_sales']
+            row += [base, self.total_sales - base, self[f'{key}_growth']]
+        return [row]
 
-        filename = f"commission_report_{self.start_date}_to_{self.end_date}.csv"
-
-        self.write({
-            'export_file': b64_data,
-            'export_filename': filename
-        })
-
-        # Return download URL
-        return {
-            'type': 'ir.actions.act_url',
-            'url': f'/web/content?model={self._name}&id={self.id}&field=export_file&filename={filename}&download=true',
-            'target': 'self',
-        }
+    def _get_export_filename(self, extension):
+        return f"commission_report_{self.start_date}_to_{self.end_date}.{extension}"
 
     def action_clear_filters(self):
         """Clear all filters and reset the form"""
@@ -250,9 +431,15 @@ class PosCommissionReport(models.Model):
             'start_date': fields.Date.context_today(self),
             'end_date': fields.Date.context_today(self),
             'category_ids': [(5, 0, 0)],
+            'compare_previous_period': False,
+            'compare_previous_year': False,
             'total_sales': 0,
             'total_commission': 0,
             'employee_count': 0,
+            'previous_total_sales': 0,
+            'previous_growth': 0,
+            'last_year_total_sales': 0,
+            'last_year_growth': 0,
             'report_generated': False,
         })
 
@@ -266,26 +453,15 @@ class PosCommissionReport(models.Model):
             'views': [(False, 'form')],
         }
 
-    def action_view_employee_details(self):
-        """View detailed sales for specific employee"""
-        self.ensure_one()
-        employee_id = self.env.context.get('employee_id')
-
-        if not employee_id:
-            return {'type': 'ir.actions.act_window_close'}
-
-        # Check if user has access to this employee
-        employee = self.env['hr.employee'].browse(employee_id)
-        if not employee.check_access_rights('read', raise_exception=False):
-            raise UserError(_("You don't have access to view details for this employee."))
-
-        # Get detailed data for the employee
-        query = """
+    def _get_employee_details_query(self, employee_id):
+        """Return (query, params) selecting the sold lines of one employee, in export column order"""
+        date_clause, params = self._get_date_range_clause()
+        query = f"""
             SELECT
                 po.name as order_ref,
                 po.date_order,
-                pt.name as product_name,
-                pc.name as category_name,
+                pt.id as product_tmpl_id,
+                pt.categ_id,
                 pol.qty as quantity,
                 pol.price_subtotal as subtotal_excl_tax,
                 pol.price_subtotal_incl as subtotal_incl_tax,
@@ -295,20 +471,42 @@ class PosCommissionReport(models.Model):
             JOIN pos_order po ON pol.order_id = po.id
             JOIN product_product pp ON pol.product_id = pp.id
             JOIN product_template pt ON pp.product_tmpl_id = pt.id
-            LEFT JOIN product_category pc ON pt.categ_id = pc.id
-            WHERE po.date_order::date BETWEEN %s AND %s
+            WHERE {date_clause}
                 AND po.state IN ('paid', 'done', 'invoiced')
                 AND po.employee_id = %s
         """
 
-        params = [self.start_date, self.end_date, employee_id]
+        params.append(employee_id)
 
         if self.category_ids:
             query += " AND pt.categ_id IN %s"
             params.append(tuple(self.category_ids.ids))
 
-        self.env.cr.execute(query, tuple(params))
-        details = self.env.cr.dictfetchall()
+        query += " ORDER BY po.date_order, pol.id"
+        return query, tuple(params)
+
+    @report_run('employee_details')
+    def action_view_employee_details(self):
+        """View detailed sales for specific employee"""
+        self.ensure_one()
+        employee_id = self.env.context.get('employee_id')
+
+        if not employee_id:
+            return {'type': 'ir.actions.act_window_close'}
+
+        # Check if user has access to this employee
+        employee = self.env['hr.employee'].browse(employee_id)
+        if not employee.has_access('read'):
+            raise UserError(_("You don't have access to view details for this employee."))
+
+        # Get detailed data for the employee
+        query, params = self._get_employee_details_query(employee_id)
+        with self._report_phase('query'):
+            details = self._report_execute(query, params).dictfetchall()
+        with self._report_phase('enrich'):
+            for line in details:
+                line['product_name'] = self._dimension_name('product.template', line.pop('product_tmpl_id'))
+                line['category_name'] = self._dimension_name('product.category', line.pop('categ_id'))
 
         # Create detailed view
         return {
@@ -318,6 +516,7 @@ class PosCommissionReport(models.Model):
             'view_mode': 'form',
             'target': 'new',
             'context': {
+                'default_report_id': self.id,
                 'default_employee_id': employee_id,
                 'default_start_date': self.start_date,
                 'default_end_date': self.end_date,
@@ -338,6 +537,12 @@ class PosCommissionReportLine(models.Model):
     total_sales = fields.Float(string='Total Sales')
     earned_commission = fields.Float(string='Earned Commission')
     achievement_rate = fields.Float(string='Achievement Rate %')
+    previous_sales = fields.Float(string='Previous Period Sales')
+    previous_delta = fields.Float(string='Delta vs Previous Period')
+    previous_growth = fields.Float(string='Growth vs Previous Period %')
+    last_year_sales = fields.Float(string='Last Year Sales')
+    last_year_delta = fields.Float(string='Delta vs Last Year')
+    last_year_growth = fields.Float(string='Growth vs Last Year %')
 
     def action_view_details(self):
         """Open employee details wizard"""
@@ -347,8 +552,11 @@ class PosCommissionReportLine(models.Model):
 
 class PosEmployeeDetailWizard(models.TransientModel):
     _name = 'pos.employee.detail.wizard'
+    _inherit = 'pos.report.export.mixin'
     _description = 'POS Employee Detail Wizard'
+    _export_route = 'employee_details'
 
+    report_id = fields.Many2one('pos.commission.report', string='Report', readonly=True, ondelete='cascade')
     employee_id = fields.Many2one('hr.employee', string='Employee', readonly=True)
     start_date = fields.Date(readonly=True)
     end_date = fields.Date(readonly=True)
@@ -362,10 +570,6 @@ class PosEmployeeDetailWizard(models.TransientModel):
 
     detail_lines = fields.One2many('pos.employee.detail.line', 'wizard_id', string='Detail Lines')
 
-    # Export fields
-    export_file = fields.Binary(readonly=True)
-    export_filename = fields.Char()
-
     @api.depends('detail_lines')
     def _compute_summary(self):
         for wizard in self:
@@ -376,54 +580,33 @@ class PosEmployeeDetailWizard(models.TransientModel):
             wizard.total_tax = sum(line.tax_amount for line in lines)
             wizard.total_amount = sum(line.order_total for line in lines)
 
-    def action_export_details(self):
-        """Export detailed data to CSV"""
-        self.ensure_one()
-
-        output = io.StringIO()
-        writer = csv.writer(output)
-
-        headers = ['Order Reference', 'Date', 'Product', 'Category', 'Quantity',
-                   'Subtotal (Excl Tax)', 'Subtotal (Incl Tax)', 'Tax Amount', 'Total']
-        writer.writerow(headers)
-
-        for line in self.detail_lines:
-            writer.writerow([
-                line.order_ref or '',
-                line.date_order.strftime('%Y-%m-%d %H:%M:%S') if line.date_order else '',
-                line.product_name or '',
-                line.category_name or '',
-                line.quantity,
-                f"{line.subtotal_excl_tax:,.2f}",
-                f"{line.subtotal_incl_tax:,.2f}",
-                f"{line.tax_amount:,.2f}",
-                f"{line.order_total:,.2f}"
-            ])
-
-        # Write summary
-        writer.writerow([])
-        writer.writerow(['SUMMARY', '', '', '', '', '', '', '', ''])
-        writer.writerow(['Total Orders', self.total_orders, '', '', '', '', '', '', ''])
-        writer.writerow(['Total Quantity', self.total_quantity, '', '', '', '', '', '', ''])
-        writer.writerow(['Total Subtotal', f"{self.total_subtotal:,.2f}", '', '', '', '', '', '', ''])
-        writer.writerow(['Total Tax', f"{self.total_tax:,.2f}", '', '', '', '', '', '', ''])
-        writer.writerow(['Total Amount', f"{self.total_amount:,.2f}", '', '', '', '', '', '', ''])
-
-        csv_data = output.getvalue().encode('utf-8')
-        b64_data = base64.b64encode(csv_data)
-
-        filename = f"employee_details_{self.employee_id.name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-
-        self.write({
-            'export_file': b64_data,
-            'export_filename': filename
-        })
-
-        return {
-            'type': 'ir.actions.act_url',
-            'url': f'/web/content?model={self._name}&id={self.id}&field=export_file&filename={filename}&download=true',
-            'target': 'self',
-        }
+    def _check_export_ready(self):
+        if not self.report_id or not self.employee_id:
+            raise UserError(_("No data to export."))
+
+    def _get_export_columns(self):
+        return [
+            ('Order Reference', 'char'), ('Date', 'datetime'), ('Product', 'char', 'product.template'),
+            ('Category', 'char', 'product.category'),
+            ('Quantity', 'float'), ('Subtotal (Excl Tax)', 'monetary'), ('Subtotal (Incl Tax)', 'monetary'),
+            ('Tax Amount', 'monetary'), ('Total', 'monetary'),
+        ]
+
+    def _get_export_query(self):
+        return self.report_id._get_employee_details_query(self.employee_id.id)
+
+    def _get_export_summary_rows(self):
+        return [
+            ['SUMMARY'],
+            ['Total Orders', self.total_orders],
+            ['Total Quantity', self.total_quantity],
+            ['Total Subtotal', self.total_subtotal],
+            ['Total Tax', self.total_tax],
+            ['Total Amount', self.total_amount],
+        ]
+
+    def _get_export_filename(self, extension):
+        return f"employee_details_{self.employee_id.name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
 
 
 class PosEmployeeDetailLine(models.TransientModel):
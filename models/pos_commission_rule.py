@@ -0,0 +1,38 @@
+from odoo import models, fields, api, _
+from odoo.exceptions import ValidationError
+
+
+class PosCommissionRule(models.Model):
+    _name = 'pos.commission.rule'
+    _description = 'POS Commission Rule'
+    _order = 'rule_type, min_sales, id'
+
+    name = fields.Char(required=True)
+    active = fields.Boolean(default=True)
+    company_id = fields.Many2one('res.company', required=True, default=lambda self: self.env.company)
+    rule_type = fields.Selection([
+        ('tier', 'Tier Bracket'),
+        ('category', 'Category Rate'),
+        ('cap', 'Commission Cap'),
+    ], string='Type', required=True, default='tier')
+    min_sales = fields.Float(string='Sales From', help='Tier brackets: sales above this amount earn the tier rate.')
+    categ_id = fields.Many2one('product.category', string='Product Category')
+    rate = fields.Float(string='Rate %')
+    max_commission = fields.Float(string='Maximum Commission')
+
+    @api.constrains('rule_type', 'categ_id')
+    def _check_category(self):
+        for rule in self:
+            if rule.rule_type == 'category' and not rule.categ_id:
+                raise ValidationError(_("Category rates need a product category."))
+
+    @api.model
+    def _get_engine_rules(self):
+        """Return the active rules of the current company in commission engine form"""
+        rules = self.search([('company_id', '=', self.env.company.id)])
+        caps = rules.filtered(lambda rule: rule.rule_type == 'cap').mapped('max_commission')
+        return {
+            'tiers': [(rule.min_sales, rule.rate) for rule in rules if rule.rule_type == 'tier'],
+            'category_rates': {rule.categ_id.id: rule.rate for rule in rules if rule.rule_type == 'category'},
+            'cap': min(caps) if caps else 0.0,
+        }
@@ -0,0 +1,122 @@
+import logging
+from datetime import timedelta
+from odoo import models, fields, api, tools
+from .pos_report_daily_fact import FACT_ORDER_STATES
+
+_logger = logging.getLogger(__name__)
+
+REFRESHED_AT_PARAM = 'myreport.commission_view_refreshed_at'
+
+
+class PosCommissionSalesHourly(models.Model):
+    """Materialized view of the paid sales per employee, UTC hour and category.
+
+    Buckets are whole UTC hours so any report timezone with whole-hour offsets
+    can add them up into its own days. The view only holds the ``_window_days``
+    before its last refresh and is refreshed concurrently by a cron; readers
+    use it for that window only and query the live tables for the rest.
+
+    Commission reports read it only when cut in another timezone than the
+    daily facts, so the cron skips the refresh while no user or company is.
+    """
+    _name = "pos.commission.sales.hourly"
+    _description = "POS Commission Sales per Hour"
+    _auto = False
+    _order = "hour desc"
+
+    # Hours before the last refresh still read live, for orders synced late
+    _live_margin = timedelta(days=1)
+    # Days of sales before the refresh held in the view, enough for year-on-year comparisons
+    _window_days = 400
+
+    hour = fields.Datetime(string="Hour", readonly=True)
+    employee_id = fields.Many2one("hr.employee", string="Employee", readonly=True)
+    categ_id = fields.Many2one("product.category", string="Product Category", readonly=True)
+    qty = fields.Float(string="Quantity", readonly=True)
+    subtotal_incl = fields.Float(string="Subtotal (Incl Tax)", readonly=True)
+
+    def init(self):
+        cr = self.env.cr
+        window = f"'{self._window_days} days'::interval"
+        cr.execute("SELECT position(%s in definition) FROM pg_matviews WHERE matviewname = %s",
+                   [window, self._table])
+        row = cr.fetchone()
+        if row and not row[0]:
+            # Created by an earlier version over the whole history
+            cr.execute(f"DROP MATERIALIZED VIEW {self._table}")
+            row = None
+        if not row:
+            # Created empty, the first cron run populates it
+            cr.execute(f"""
+                CREATE MATERIALIZED VIEW {self._table} AS
+                SELECT
+                    row_number() OVER (ORDER BY sales.hour, sales.employee_id, sales.categ_id) as id,
+                    sales.*
+                FROM (
+                    SELECT
+                        date_trunc('hour', po.date_order) as hour,
+                        po.employee_id,
+                        pt.categ_id,
+                        SUM(pol.qty) as qty,
+                        SUM(pol.price_subtotal_incl) as subtotal_incl
+                    FROM pos_order_line pol
+                    JOIN pos_order po ON pol.order_id = po.id
+                    JOIN product_product pp ON pol.product_id = pp.id
+                    JOIN product_template pt ON pp.product_tmpl_id = pt.id
+                    WHERE po.state IN %s
+                        AND po.date_order >= date_trunc('hour', now() AT TIME ZONE 'UTC') - {window}
+                        AND po.employee_id IS NOT NULL
+                        AND pt.categ_id IS NOT NULL
+                    GROUP BY 1, 2, 3
+                ) sales
+                WITH NO DATA
+            """, [FACT_ORDER_STATES])
+            self.env['ir.config_parameter'].sudo().set_param(REFRESHED_AT_PARAM, False)
+        # REFRESH ... CONCURRENTLY needs a unique index on plain columns
+        tools.create_unique_index(cr, f'{self._table}_key_uniq', self._table, ['hour', 'employee_id', 'categ_id'])
+
+    @api.model
+    def _is_populated(self):
+        self.env.cr.execute("SELECT ispopulated FROM pg_matviews WHERE matviewname = %s", [self._table])
+        row = self.env.cr.fetchone()
+        return bool(row and row[0])
+
+    @api.model
+    def _is_needed(self):
+        """Whether a report may be cut in another timezone than the daily facts.
+
+        Users without a timezone count as UTC, which at worst refreshes the
+        view for nothing.
+        """
+        self.env.cr.execute("""
+            SELECT 1 FROM res_partner p
+            WHERE COALESCE(p.tz, 'UTC') != %s
+                AND (p.id IN (SELECT partner_id FROM res_users WHERE active AND NOT share)
+                     OR p.id IN (SELECT partner_id FROM res_company))
+            LIMIT 1
+        """, [self.env['pos.report.daily.fact']._get_fact_tz()])
+        return bool(self.env.cr.fetchone())
+
+    @api.model
+    def _cron_refresh(self):
+        """Refresh the view, without blocking readers once it has been populated"""
+        if not self._is_needed():
+            _logger.info("Skipped the refresh of %s, all reports read the daily facts", self._table)
+            return
+        refreshed_at = self.env.cr.now()
+        concurrently = 'CONCURRENTLY' if self._is_populated() else ''
+        self.env.cr.execute(f"REFRESH MATERIALIZED VIEW {concurrently} {self._table}")
+        self.env['ir.config_parameter'].sudo().set_param(
+            REFRESHED_AT_PARAM, fields.Datetime.to_string(refreshed_at))
+        _logger.info("Refreshed %s as of %s", self._table, refreshed_at)
+
+    @api.model
+    def _get_complete_range(self):
+        """UTC hours [from, until) in which the view is complete, or None when it cannot be used"""
+        refreshed_at = fields.Datetime.to_datetime(
+            self.env['ir.config_parameter'].sudo().get_param(REFRESHED_AT_PARAM))
+        if not refreshed_at:
+            return None
+        refreshed_hour = refreshed_at.replace(minute=0, second=0, microsecond=0)
+        return (refreshed_hour - timedelta(days=self._window_days),
+                (refreshed_at - self._live_margin).replace(minute=0, second=0, microsecond=0))
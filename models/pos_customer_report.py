@@ -1,16 +1,46 @@
-import io
-import csv
-import base64
-from datetime import date, datetime
+import json
+import hashlib
+from datetime import timedelta
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError
+from .pos_report_run import report_run
+from ..tools.snapshot import SnapshotReader, build_snapshot
 
 
 class PosCustomerReport(models.Model):
     _name = "pos.customer.report"
+    _inherit = [
+        "pos.report.date.range.mixin", "pos.report.export.mixin", "pos.report.job.mixin", "pos.report.trace.mixin",
+        "pos.report.snapshot.mixin", "pos.report.partition.mixin", "pos.report.refresh.mixin",
+        "pos.report.precompute.mixin",
+    ]
     _description = "POS Customer Report"
     _order = "create_date desc"
     _rec_name = "name"
+    _export_route = "customer"
+    _job_cron_xmlid = "ir_cron_pos_customer_report_queue"
+    _retention_line_models = ("pos.customer.report.line",)
+    _refresh_line_model = "pos.customer.report.line"
+    # Row keys holding dimension ids, and their models
+    _line_dimensions = {
+        'config_id': 'pos.config',
+        'categ_id': 'product.category',
+        'product_tmpl_id': 'product.template',
+        'pricelist_id': 'product.pricelist',
+    }
+    _refresh_total_fields = {
+        'total_quantity': 'quantity',
+        'total_discount': 'discount',
+        'total_subtotal': 'subtotal_excl_tax',
+        'total_tax': 'tax_amount',
+        'total_sales': 'order_total',
+    }
+    _snapshot_columns = (
+        'order_id', 'order_reference', 'order_date', 'customer_name', 'contact', 'branch_name', 'employee_name',
+        'category_name', 'product_name', 'product_code', 'pricelist_name', 'quantity', 'unit_price',
+        'list_price', 'discount', 'line_discount_percent', 'subtotal_excl_tax', 'subtotal_incl_tax',
+        'tax_amount', 'order_total',
+    )
 
     # ==== Basic Fields ====
     name = fields.Char(string="Report Name", compute="_compute_name", store=True)
@@ -47,6 +77,19 @@ class PosCustomerReport(models.Model):
     total_subtotal = fields.Float(string="Total Subtotal", readonly=True)
 
     # ==== Report Lines ====
+    generation_mode = fields.Selection([
+        ('full', 'Full Lines'),
+        ('paged', 'Paged Lines'),
+        ('summary', 'Summary Only'),
+        ('snapshot', 'Compressed Snapshot'),
+    ], string="Lines Mode", default='full', required=True,
+        help="Paged Lines stores only the summary and reads the lines from the POS orders one page at a time. "
+             "Summary Only computes the totals without reading any lines. Compressed Snapshot freezes the "
+             "lines in a compressed attachment and shows them one page at a time.")
+    page_size = fields.Integer(string="Lines per Page", default=80)
+    page_number = fields.Integer(string="Page", readonly=True)
+    page_cursors = fields.Json(readonly=True)
+    has_next_page = fields.Boolean(readonly=True)
     report_line_ids = fields.One2many("pos.customer.report.line", "report_id", string="Report Lines", readonly=True)
 
     # ==== Export Fields ====
@@ -69,11 +112,8 @@ class PosCustomerReport(models.Model):
 
     def _build_where_clause(self):
         """Build WHERE clause for the SQL query"""
-        where_clauses = [
-            "po.date_order::date >= %s",
-            "po.date_order::date <= %s"
-        ]
-        params = [self.start_date, self.end_date]
+        date_clause, params = self._get_date_range_clause()
+        where_clauses = [date_clause]
 
         if self.branch_ids:
             where_clauses.append("po.config_id IN %s")
@@ -99,28 +139,23 @@ class PosCustomerReport(models.Model):
 
         return " AND ".join(where_clauses), params
 
-    def action_generate_report(self):
-        """Generate the complete report"""
-        self.ensure_one()
-
-        # Clear previous lines
-        self.report_line_ids.unlink()
-
-        where_clause, params = self._build_where_clause()
-
-        # Main query to get report data with additional fields
+    def _get_lines_query(self, where_clause, keyset=False, limit=False):
+        """Build the detail line SELECT, optionally as a keyset page"""
+        if keyset:
+            where_clause += " AND (po.date_order, po.id, COALESCE(pol.id, 0)) < (%s::timestamp, %s, %s)"
         query = f"""
             SELECT 
                 po.id as order_id,
+                pol.id as line_id,
                 po.name as order_reference,
                 po.date_order as order_date,
                 rp.name as customer_name,
                 COALESCE(rp.mobile, rp.phone, '') as contact,
-                pc.name as branch_name,
+                po.config_id,
                 emp.name as employee_name,
-                pcateg.name as category_name,
-                pt.name->>'en_US' as product_name,  
-                pricelist.name->>'en_US' as pricelist_name,
+                pt.categ_id,
+                pt.id as product_tmpl_id,
+                po.pricelist_id,
                 pol.qty as quantity,
                 pol.price_unit as unit_price,
                 pt.list_price as list_price,
@@ -135,160 +170,444 @@ class PosCustomerReport(models.Model):
             LEFT JOIN pos_order_line pol ON po.id = pol.order_id
             LEFT JOIN product_product pp ON pol.product_id = pp.id
             LEFT JOIN product_template pt ON pp.product_tmpl_id = pt.id
-            LEFT JOIN product_category pcateg ON pt.categ_id = pcateg.id
             LEFT JOIN res_partner rp ON po.partner_id = rp.id
-            LEFT JOIN pos_config pc ON po.config_id = pc.id
-            LEFT JOIN res_users ru ON po.user_id = ru.id
             LEFT JOIN hr_employee emp ON po.employee_id = emp.id
-            LEFT JOIN product_pricelist pricelist ON po.pricelist_id = pricelist.id
             WHERE {where_clause}
-            ORDER BY po.date_order DESC, po.id
+            ORDER BY po.date_order DESC, po.id DESC, COALESCE(pol.id, 0) DESC
+        """
+        if limit:
+            query += " LIMIT %s"
+        return query
+
+    def _get_summary_values(self):
+        """Compute the report totals in a single aggregate pass"""
+        where_clause, params = self._build_where_clause()
+        query = f"""
+            SELECT
+                COUNT(DISTINCT po.id) as total_orders,
+                COUNT(DISTINCT rp.name) as total_customers,
+                COALESCE(SUM(pol.qty), 0) as total_quantity,
+                COALESCE(SUM((pt.list_price - pol.price_unit) * pol.qty), 0) as total_discount,
+                COALESCE(SUM(pol.price_subtotal), 0) as total_subtotal,
+                COALESCE(SUM(pol.price_subtotal_incl - pol.price_subtotal), 0) as total_tax,
+                COALESCE(SUM(pol.price_subtotal_incl), 0) as total_sales
+            FROM pos_order po
+            LEFT JOIN pos_order_line pol ON po.id = pol.order_id
+            LEFT JOIN product_product pp ON pol.product_id = pp.id
+            LEFT JOIN product_template pt ON pp.product_tmpl_id = pt.id
+            LEFT JOIN res_partner rp ON po.partner_id = rp.id
+            WHERE {where_clause}
         """
+        return self._report_execute(query, tuple(params)).dictfetchone()
 
-        self.env.cr.execute(query, tuple(params))
-        results = self.env.cr.dictfetchall()
+    def _prepare_line_vals(self, row):
+        """Convert a report query row into pos.customer.report.line values"""
+        return {
+            'report_id': self.id,
+            'order_id': row['order_id'],
+            'order_reference': row['order_reference'],
+            'order_date': row['order_date'],
+            'customer_name': row['customer_name'] or 'Walk-in Customer',
+            'contact': row['contact'],
+            'branch_name': self._dimension_name('pos.config', row['config_id']),
+            'employee_name': row['employee_name'],
+            'category_name': self._dimension_name('product.category', row['categ_id']),
+            'product_name': self._dimension_name('product.template', row['product_tmpl_id']),
+            'product_code': row['product_code'],
+            'pricelist_name': self._dimension_name('product.pricelist', row['pricelist_id']),
+            'quantity': row['quantity'] or 0,
+            'unit_price': row['unit_price'] or 0,
+            'list_price': row['list_price'] or 0,
+            'discount': row['discount'] or 0,
+            'line_discount_percent': row['line_discount_percent'] or 0,
+            'subtotal_excl_tax': row['subtotal_excl_tax'] or 0,
+            'subtotal_incl_tax': row['subtotal_incl_tax'] or 0,
+            'tax_amount': row['tax_amount'] or 0,
+            'order_total': row['order_total'] or 0,
+        }
+
+    def get_line_page(self, cursor=None, limit=None):
+        """Return one keyset page of report lines straight from pos_order/pos_order_line.
+
+        ``cursor`` is the ``[date_order, order_id, line_id]`` key of the last row of the
+        previous page (None for the first page), so every page costs the same to read.
+        """
+        self.ensure_one()
+        limit = limit or self.page_size or 80
+
+        where_clause, params = self._build_where_clause()
+        if cursor:
+            params += list(cursor)
+        query = self._get_lines_query(where_clause, keyset=bool(cursor), limit=True)
+        params.append(limit + 1)
+
+        rows = self._report_execute(query, tuple(params)).dictfetchall()
+
+        has_next = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = False
+        if has_next:
+            last = rows[-1]
+            next_cursor = [fields.Datetime.to_string(last['order_date']), last['order_id'], last['line_id'] or 0]
+        return {'rows': rows, 'next_cursor': next_cursor}
+
+    def _load_line_page(self, page_number):
+        """Replace the displayed lines with the given page (1-based)"""
+        self.ensure_one()
+        if self.generation_mode == 'snapshot':
+            return self._load_snapshot_page(page_number)
+        cursors = list(self.page_cursors or [None])
+        with self._report_phase('query'):
+            page = self.get_line_page(cursor=cursors[page_number - 1])
+
+        next_cursor = page['next_cursor']
+        del cursors[page_number:]
+        if next_cursor:
+            cursors.append(next_cursor)
+
+        with self._report_phase('enrich'):
+            self._prefetch_dimensions(page['rows'], self._line_dimensions)
+            line_vals = [self._prepare_line_vals(row) for row in page['rows']]
+        with self._report_phase('persist'):
+            self.write({
+                'report_line_ids': [(5, 0, 0)] + [(0, 0, vals) for vals in line_vals],
+                'page_number': page_number,
+                'page_cursors': cursors,
+                'has_next_page': bool(next_cursor),
+            })
+
+    def _load_snapshot_page(self, page_number):
+        """Replace the displayed lines with the given page (1-based) of the snapshot"""
+        page_size = self.page_size or 80
+        with self._report_phase('query'):
+            rows = self._read_snapshot_rows((page_number - 1) * page_size, page_size)
+        with self._report_phase('persist'):
+            self.write({
+                'report_line_ids': [(5, 0, 0)] + [(0, 0, dict(row, report_id=self.id)) for row in rows],
+                'page_number': page_number,
+                'has_next_page': page_number * page_size < self.snapshot_rows,
+            })
+
+    @report_run('generate')
+    def action_generate_report(self):
+        """Generate the complete report"""
+        self.ensure_one()
+
+        # Clear previous lines
+        with self._report_phase('persist'):
+            self.report_line_ids.unlink()
+            self._drop_snapshot()
+
+        with self._report_phase('query'):
+            cache_entry = self.env['pos.customer.report.cache'].sudo()._lookup(self._get_cache_fingerprint())
+        if cache_entry and (cache_entry.has_lines or self.generation_mode in ('paged', 'summary')):
+            return self._generate_from_cache(cache_entry)
+
+        if self.generation_mode == 'snapshot':
+            return self._generate_snapshot_report()
+        if self.generation_mode != 'full':
+            return self._generate_summary_report()
+
+        where_clause, params = self._build_where_clause()
+
+        # Main query to get report data with additional fields
+        query = self._get_lines_query(where_clause)
+
+        self._job_progress(_("Fetching order lines"))
+        partitions = self._get_report_partitions()
+        with self._report_phase('query'):
+            if partitions:
+                results = self._fetch_partitioned(
+                    partitions,
+                    lambda partition: self._get_partition_query(where_clause, params, partition),
+                    key=lambda row: (row['order_date'], row['order_id'], row['line_id'] or 0),
+                    reverse=True,
+                )
+            else:
+                results = self._report_execute(query, tuple(params)).dictfetchall()
 
         if not results:
-            return {
-                'type': 'ir.actions.client',
-                'tag': 'display_notification',
-                'params': {
-                    'title': _('No Data Found'),
-                    'message': _('No sales data found for the selected period and filters.'),
-                    'type': 'warning',
-                    'sticky': True,
-                }
-            }
+            return self._no_data_notification()
+
+        with self._report_phase('query'):
+            summary = self._get_summary_values()
+
+        with self._report_phase('enrich'):
+            self._prefetch_dimensions(results, self._line_dimensions)
+            line_vals = [self._prepare_line_vals(row) for row in results]
+
+        self._job_progress(_("Saving report lines"), rows=len(results))
+        with self._report_phase('persist'):
+            self._store_in_cache(summary, line_vals)
+
+            # Update report with new data
+            self.env['pos.customer.report.line']._bulk_create(line_vals)
+            self.write({
+                **summary,
+                'page_number': 0,
+                'page_cursors': False,
+                'has_next_page': False,
+                'state': 'generated',
+                'report_generated': fields.Datetime.now(),
+            })
 
-        # Calculate totals and create lines
-        total_orders = len(set(row['order_id'] for row in results))
-        total_customers = len(set(row['customer_name'] for row in results if row['customer_name']))
-        total_quantity = sum(row['quantity'] or 0 for row in results)
-        total_discount = sum(row['discount'] or 0 for row in results)
-        total_subtotal = sum(row['subtotal_excl_tax'] or 0 for row in results)
-        total_tax = sum(row['tax_amount'] or 0 for row in results)
-        total_sales = sum(row['order_total'] or 0 for row in results)
-
-        report_lines = []
-        for row in results:
-            line_vals = {
-                'report_id': self.id,
-                'order_reference': row['order_reference'],
-                'order_date': row['order_date'],
-                'customer_name': row['customer_name'] or 'Walk-in Customer',
-                'contact': row['contact'],
-                'branch_name': row['branch_name'],
-                'employee_name': row['employee_name'],
-                'category_name': row['category_name'],
-                'product_name': row['product_name'],
-                'product_code': row['product_code'],
-                'pricelist_name': row['pricelist_name'],
-                'quantity': row['quantity'] or 0,
-                'unit_price': row['unit_price'] or 0,
-                'list_price': row['list_price'] or 0,
-                'discount': row['discount'] or 0,
-                'line_discount_percent': row['line_discount_percent'] or 0,
-                'subtotal_excl_tax': row['subtotal_excl_tax'] or 0,
-                'subtotal_incl_tax': row['subtotal_incl_tax'] or 0,
-                'tax_amount': row['tax_amount'] or 0,
-                'order_total': row['order_total'] or 0,
-            }
-            report_lines.append((0, 0, line_vals))
+        # Return action to reload the current view
+        return self._reload_action()
 
-        # Update report with new data
-        self.write({
-            'report_line_ids': report_lines,
-            'total_orders': total_orders,
-            'total_customers': total_customers,
-            'total_quantity': total_quantity,
-            'total_discount': total_discount,
-            'total_subtotal': total_subtotal,
-            'total_tax': total_tax,
-            'total_sales': total_sales,
+    def _can_refresh(self):
+        # Paged and snapshot reports only keep one page of lines
+        return self.generation_mode == 'full' and super()._can_refresh()
+
+    def _refresh_orders(self, order_ids):
+        """Replace the lines of the given orders and adjust the totals by difference"""
+        where_clause, params = self._build_where_clause()
+        query = self._get_lines_query(where_clause + " AND po.id IN %s")
+        with self._report_phase('query'):
+            rows = self._report_execute(query, tuple(params) + (tuple(order_ids),)).dictfetchall()
+        with self._report_phase('enrich'):
+            self._prefetch_dimensions(rows, self._line_dimensions)
+            line_vals = [self._prepare_line_vals(row) for row in rows]
+
+        with self._report_phase('persist'):
+            old_lines = self._get_refresh_lines(order_ids)
+            totals = self._get_delta_totals(old_lines, line_vals)
+            order_delta = len({vals['order_id'] for vals in line_vals}) - len(old_lines.order_id)
+
+            # Customers are counted by name, so only the names involved can change the count
+            customers = {vals['customer_name'] for vals in line_vals} | set(old_lines.mapped('customer_name'))
+            customers.discard('Walk-in Customer')
+            customers_before = self._get_present_values('customer_name', customers)
+
+            old_lines.unlink()
+            self.env['pos.customer.report.line']._bulk_create(line_vals)
+
+            customers_after = self._get_present_values('customer_name', customers)
+            self.write({
+                **totals,
+                'total_orders': self.total_orders + order_delta,
+                'total_customers': self.total_customers + len(customers_after) - len(customers_before),
+            })
+
+    def _generate_summary_report(self):
+        """Store only the summary; in paged mode the lines are then served page by page"""
+        self._job_progress(_("Computing summary"))
+        with self._report_phase('query'):
+            summary = self._get_summary_values()
+        if not summary['total_orders']:
+            return self._no_data_notification()
+        with self._report_phase('persist'):
+            self._store_in_cache(summary)
+            self.write({
+                **summary,
+                'page_number': 0,
+                'page_cursors': [None] if self.generation_mode == 'paged' else False,
+                'has_next_page': False,
+                'state': 'generated',
+                'report_generated': fields.Datetime.now(),
+            })
+        if self.generation_mode == 'paged':
+            self._load_line_page(1)
+        return self._reload_action()
+
+    def _generate_snapshot_report(self):
+        """Stream the lines into a compressed snapshot and show its first page"""
+        self._job_progress(_("Computing summary"))
+        with self._report_phase('query'):
+            summary = self._get_summary_values()
+        if not summary['total_orders']:
+            return self._no_data_notification()
+
+        self._job_progress(_("Writing snapshot"))
+        where_clause, params = self._build_where_clause()
+        rows = self._report_iter_rows(self._get_lines_query(where_clause), tuple(params), as_dict=True)
+        row_count = self._write_snapshot(self._prepare_line_vals(row) for row in rows)
+
+        self._job_progress(_("Saving summary"), rows=row_count)
+        with self._report_phase('persist'):
+            snapshot = None
+            if row_count <= self.env['pos.customer.report.cache'].sudo()._max_lines():
+                snapshot = self._get_snapshot_data()
+            self._store_in_cache(summary, snapshot=snapshot, line_count=row_count)
+            self.write({
+                **summary,
+                'page_cursors': False,
+                'state': 'generated',
+                'report_generated': fields.Datetime.now(),
+            })
+        self._load_line_page(1)
+        return self._reload_action()
+
+    def _get_cache_fingerprint(self):
+        """Canonical hash of everything that determines the report result"""
+        filters = {
+            'start_date': str(self.start_date),
+            'end_date': str(self.end_date),
+            'tz': self._get_report_tz(),
+            # Lines hold dimension names in the user's language
+            'lang': self.env.lang or 'en_US',
+            'branch_ids': sorted(self.branch_ids.ids),
+            'session_ids': sorted(self.session_ids.ids),
+            'user_ids': sorted(self.user_ids.ids),
+            'product_ids': sorted(self.product_ids.ids),
+            'category_ids': sorted(self.category_ids.ids),
+            'pricelist_ids': sorted(self.pricelist_ids.ids),
+            'state': self.state_filter or None,
+        }
+        return hashlib.sha256(json.dumps(filters, sort_keys=True).encode()).hexdigest()
+
+    def _get_precompute_fingerprint(self):
+        # Requests reuse the nightly result through the result cache
+        return self._get_cache_fingerprint()
+
+    @api.model
+    def _get_precompute_targets(self, configs):
+        """Yesterday's lines of each branch, frozen in a snapshot so the cache keeps them"""
+        targets = []
+        for config in configs:
+            day = fields.Date.context_today(self._get_precompute_env(config.company_id)) - timedelta(days=1)
+            targets.append((config.company_id, {
+                'start_date': day,
+                'end_date': day,
+                'branch_ids': [(6, 0, config.ids)],
+                'generation_mode': 'snapshot',
+            }))
+        return targets
+
+    def _store_in_cache(self, summary, line_vals=None, snapshot=None, line_count=0):
+        """Remember the result; lines are only kept below the size limit, as a snapshot"""
+        Cache = self.env['pos.customer.report.cache'].sudo()
+        if snapshot is None and line_vals is not None and len(line_vals) <= Cache._max_lines():
+            snapshot = build_snapshot(self._snapshot_columns, line_vals, self._snapshot_page_size)
+            line_count = len(line_vals)
+        date_from, date_to = self._get_date_range_bounds(self.start_date, self.end_date)
+        Cache._store(self._get_cache_fingerprint(), date_from, date_to, summary, snapshot, line_count)
+
+    def _generate_from_cache(self, entry):
+        """Fill the report from a cached result without querying the POS lines"""
+        self._job_progress(_("Loading cached result"))
+        vals = {
+            **entry.summary,
+            'page_number': 0,
+            'page_cursors': False,
+            'has_next_page': False,
             'state': 'generated',
             'report_generated': fields.Datetime.now(),
-        })
-
-        # Return action to reload the current view
+        }
+        if self.generation_mode == 'paged':
+            vals['page_cursors'] = [None]
+        with self._report_phase('persist'):
+            if self.generation_mode == 'full':
+                with SnapshotReader.from_bytes(entry._get_lines_snapshot()) as reader:
+                    self.env['pos.customer.report.line']._bulk_create(
+                        dict(line, report_id=self.id) for line in reader)
+            elif self.generation_mode == 'snapshot':
+                self._attach_snapshot(entry._get_lines_snapshot(), entry.line_count)
+            self.write(vals)
+        if self.generation_mode in ('paged', 'snapshot'):
+            self._load_line_page(1)
+        return self._reload_action()
+
+    def _no_data_notification(self):
         return {
-            'type': 'ir.actions.act_window',
-            'res_model': self._name,
-            'res_id': self.id,
-            'view_mode': 'form',
-            'target': 'current',
-            'views': [(False, 'form')],
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('No Data Found'),
+                'message': _('No sales data found for the selected period and filters.'),
+                'type': 'warning',
+                'sticky': True,
+            }
         }
 
-    def action_export_csv(self):
-        """Export report to CSV"""
+    @report_run('page')
+    def action_next_page(self):
+        """Show the next page of report lines"""
         self.ensure_one()
+        if self.generation_mode not in ('paged', 'snapshot') or not self.has_next_page:
+            return False
+        self._load_line_page(self.page_number + 1)
+        return self._reload_action()
+
+    @report_run('page')
+    def action_previous_page(self):
+        """Show the previous page of report lines"""
+        self.ensure_one()
+        if self.generation_mode not in ('paged', 'snapshot') or self.page_number <= 1:
+            return False
+        self._load_line_page(self.page_number - 1)
+        return self._reload_action()
+
+    def _get_export_columns(self):
+        return [
+            ('Order Reference', 'char'), ('Order Date', 'datetime'), ('Customer', 'char'),
+            ('Contact', 'char'), ('Branch', 'char', 'pos.config'), ('Employee', 'char'),
+            ('Category', 'char', 'product.category'), ('Product', 'char', 'product.template'),
+            ('Product Code', 'char'), ('Pricelist', 'char', 'product.pricelist'), ('Quantity', 'float'),
+            ('Unit Price', 'monetary'), ('List Price', 'monetary'), ('Discount Amount', 'monetary'),
+            ('Discount %', 'percent'), ('Subtotal (Excl Tax)', 'monetary'),
+            ('Subtotal (Incl Tax)', 'monetary'), ('Tax Amount', 'monetary'), ('Total', 'monetary'),
+        ]
 
-        if not self.report_line_ids:
-            raise UserError(_("No data to export. Please generate the report first."))
-
-        output = io.StringIO()
-        writer = csv.writer(output)
-
-        # Write headers with additional fields
-        headers = [
-            'Order Reference', 'Order Date', 'Customer', 'Contact', 'Branch', 'Employee',
-            'Category', 'Product', 'Product Code', 'Pricelist', 'Quantity',
-            'Unit Price', 'List Price', 'Discount Amount', 'Discount %',
-            'Subtotal (Excl Tax)', 'Subtotal (Incl Tax)', 'Tax Amount', 'Total'
+    def _get_export_stored_source(self):
+        # Paged and summary reports do not keep their lines
+        if self.generation_mode not in ('full', 'snapshot'):
+            return None
+        return 'pos.customer.report.line', [
+            'order_reference', 'order_date', 'customer_name', 'contact', 'branch_name', 'employee_name',
+            'category_name', 'product_name', 'product_code', 'pricelist_name', 'quantity', 'unit_price',
+            'list_price', 'discount', 'line_discount_percent', 'subtotal_excl_tax', 'subtotal_incl_tax',
+            'tax_amount', 'order_total',
         ]
-        writer.writerow(headers)
-
-        # Write data rows
-        for line in self.report_line_ids:
-            writer.writerow([
-                line.order_reference or '',
-                line.order_date.strftime('%Y-%m-%d %H:%M:%S') if line.order_date else '',
-                line.customer_name,
-                line.contact or '',
-                line.branch_name or '',
-                line.employee_name or '',
-                line.category_name or '',
-                line.product_name or '',
-                line.product_code or '',
-                line.pricelist_name or '',
-                line.quantity,
-                f"{line.unit_price:,.2f}",
-                f"{line.list_price:,.2f}",
-                f"{line.discount:,.2f}",
-                f"{line.line_discount_percent:,.2f}%",
-                f"{line.subtotal_excl_tax:,.2f}",
-                f"{line.subtotal_incl_tax:,.2f}",
-                f"{line.tax_amount:,.2f}",
-                f"{line.order_total:,.2f}",
-            ])
-
-        # Write summary
-        writer.writerow([])
-        writer.writerow(['REPORT SUMMARY', '', '', '', '', '', '', '', '', '', '', '', '', '', '', '', '', '', ''])
-        writer.writerow(['Total Orders', self.total_orders, '', '', '', '', '', '', '', '', '', '', '', '', '', '', '', '', ''])
-        writer.writerow(['Total Customers', self.total_customers, '', '', '', '', '', '', '', '', '', '', '', '', '', '', '', '', ''])
-        writer.writerow(['Total Quantity', self.total_quantity, '', '', '', '', '', '', '', '', '', '', '', '', '', '', '', '', ''])
-        writer.writerow(['Total Discount', f"{self.total_discount:,.2f}", '', '', '', '', '', '', '', '', '', '', '', '', '', '', '', '', ''])
-        writer.writerow(['Total Subtotal', f"{self.total_subtotal:,.2f}", '', '', '', '', '', '', '', '', '', '', '', '', '', '', '', '', ''])
-        writer.writerow(['Total Tax', f"{self.total_tax:,.2f}", '', '', '', '', '', '', '', '', '', '', '', '', '', '', '', '', ''])
-        writer.writerow(['Total Sales', f"{self.total_sales:,.2f}", '', '', '', '', '', '', '', '', '', '', '', '', '', '', '', '', ''])
-
-        # Prepare file for download
-        csv_data = output.getvalue().encode('utf-8')
-        b64_data = base64.b64encode(csv_data)
-
-        filename = f"customer_report_{self.start_date}_to_{self.end_date}.csv"
 
-        self.write({
-            'export_file': b64_data,
-            'export_filename': filename
-        })
+    def _get_export_query(self):
+        where_clause, params = self._build_where_clause()
+        query = f"""
+            SELECT
+                po.name,
+                po.date_order,
+                COALESCE(rp.name, 'Walk-in Customer'),
+                COALESCE(rp.mobile, rp.phone, ''),
+                po.config_id,
+                emp.name,
+                pt.categ_id,
+                pt.id,
+                pt.default_code,
+                po.pricelist_id,
+                COALESCE(pol.qty, 0),
+                COALESCE(pol.price_unit, 0),
+                COALESCE(pt.list_price, 0),
+                COALESCE((pt.list_price - pol.price_unit) * pol.qty, 0),
+                COALESCE(pol.discount, 0),
+                COALESCE(pol.price_subtotal, 0),
+                COALESCE(pol.price_subtotal_incl, 0),
+                COALESCE(pol.price_subtotal_incl - pol.price_subtotal, 0),
+                COALESCE(pol.price_subtotal_incl, 0)
+            FROM pos_order po
+            LEFT JOIN pos_order_line pol ON po.id = pol.order_id
+            LEFT JOIN product_product pp ON pol.product_id = pp.id
+            LEFT JOIN product_template pt ON pp.product_tmpl_id = pt.id
+            LEFT JOIN res_partner rp ON po.partner_id = rp.id
+            LEFT JOIN hr_employee emp ON po.employee_id = emp.id
+            WHERE {where_clause}
+            ORDER BY po.date_order DESC, po.id DESC, COALESCE(pol.id, 0) DESC
+        """
+        return query, tuple(params)
+
+    def _get_export_summary_rows(self):
+        padding = [''] * 17
+        return [
+            ['REPORT SUMMARY', ''] + padding,
+            ['Total Orders', self.total_orders] + padding,
+            ['Total Customers', self.total_customers] + padding,
+            ['Total Quantity', self.total_quantity] + padding,
+            ['Total Discount', self.total_discount] + padding,
+            ['Total Subtotal', self.total_subtotal] + padding,
+            ['Total Tax', self.total_tax] + padding,
+            ['Total Sales', self.total_sales] + padding,
+        ]
 
-        return {
-            'type': 'ir.actions.act_url',
-            'url': f'/web/content?model={self._name}&id={self.id}&field=export_file&filename={filename}&download=true',
-            'target': 'self',
-        }
+    def _get_export_filename(self, extension):
+        return f"customer_report_{self.start_date}_to_{self.end_date}.{extension}"
 
     def action_clear_filters(self):
         """Clear all filters and reset the form"""
@@ -296,6 +615,7 @@ class PosCustomerReport(models.Model):
 
         # Clear lines
         self.report_line_ids.unlink()
+        self._drop_snapshot()
 
         self.write({
             'start_date': fields.Date.context_today(self),
@@ -314,6 +634,9 @@ class PosCustomerReport(models.Model):
             'total_subtotal': 0,
             'total_tax': 0,
             'total_sales': 0,
+            'page_number': 0,
+            'page_cursors': False,
+            'has_next_page': False,
             'state': 'draft',
             'report_generated': False,
         })
@@ -348,13 +671,15 @@ class PosCustomerReport(models.Model):
 
 class PosCustomerReportLine(models.Model):
     _name = "pos.customer.report.line"
+    _inherit = "pos.report.line.mixin"
     _description = "POS Customer Report Line"
     _order = "order_date desc"
 
     report_id = fields.Many2one("pos.customer.report", string="Report", required=True, ondelete="cascade")
+    order_id = fields.Many2one("pos.order", string="Order", readonly=True, index=True)
     order_reference = fields.Char(string="Order Reference")
     order_date = fields.Datetime(string="Order Date")
-    customer_name = fields.Char(string="Customer")
+    customer_name = fields.Char(string="Customer", index=True)
     contact = fields.Char(string="Contact")
     branch_name = fields.Char(string="Branch")
     employee_name = fields.Char(string="Employee")
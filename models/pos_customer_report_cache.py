@@ -0,0 +1,101 @@
+import base64
+from datetime import timedelta
+from odoo import models, fields, api
+
+
+class PosCustomerReportCache(models.Model):
+    _name = "pos.customer.report.cache"
+    _description = "POS Customer Report Result Cache"
+    _order = "last_hit desc"
+
+    fingerprint = fields.Char(string="Filter Fingerprint", required=True, index=True, readonly=True)
+    date_from = fields.Datetime(string="Range Start (UTC)", required=True, readonly=True)
+    date_to = fields.Datetime(string="Range End (UTC, excluded)", required=True, readonly=True)
+    summary = fields.Json(readonly=True)
+    lines_snapshot = fields.Binary(readonly=True, attachment=True,
+                                   help="Compressed snapshot of the report lines (see tools/snapshot.py)")
+    has_lines = fields.Boolean(readonly=True)
+    line_count = fields.Integer(readonly=True)
+    hit_count = fields.Integer(readonly=True)
+    last_hit = fields.Datetime(readonly=True, default=fields.Datetime.now)
+
+    _sql_constraints = [
+        ('fingerprint_uniq', 'unique(fingerprint)', 'A cache entry already exists for these filters.'),
+    ]
+
+    @api.model
+    def _get_cache_param(self, key, default):
+        return int(self.env['ir.config_parameter'].sudo().get_param(f'myreport.customer_report_cache_{key}', default))
+
+    @api.model
+    def _lookup(self, fingerprint):
+        """Return the live cache entry for ``fingerprint`` and record the hit"""
+        entry = self.search([('fingerprint', '=', fingerprint)], limit=1)
+        if not entry:
+            return entry
+        ttl = self._get_cache_param('ttl', 12 * 3600)
+        if entry.create_date < fields.Datetime.now() - timedelta(seconds=ttl):
+            entry.unlink()
+            return self.browse()
+        self.env.cr.execute(
+            "UPDATE pos_customer_report_cache SET hit_count = hit_count + 1, last_hit = now() at time zone 'UTC' WHERE id = %s",
+            (entry.id,),
+        )
+        return entry
+
+    @api.model
+    def _max_lines(self):
+        return self._get_cache_param('max_lines', 50000)
+
+    @api.model
+    def _store(self, fingerprint, date_from, date_to, summary, snapshot=None, line_count=0):
+        """Cache a generated result, evicting the least recently used entries"""
+        self.search([('fingerprint', '=', fingerprint)]).unlink()
+        entry = self.create({
+            'fingerprint': fingerprint,
+            'date_from': date_from,
+            'date_to': date_to,
+            'summary': summary,
+            'lines_snapshot': base64.b64encode(snapshot) if snapshot is not None else False,
+            'has_lines': snapshot is not None,
+            'line_count': line_count,
+        })
+        self._evict()
+        return entry
+
+    def _get_lines_snapshot(self):
+        """Raw snapshot bytes of the cached lines"""
+        self.ensure_one()
+        return base64.b64decode(self.with_context(bin_size=False).lines_snapshot)
+
+    @api.model
+    def _evict(self):
+        size = self._get_cache_param('size', 200)
+        self.env.flush_all()
+        # Unlinked through the ORM so the line snapshots are removed with the entries
+        self.env.cr.execute("""
+            SELECT id FROM pos_customer_report_cache
+            ORDER BY last_hit DESC, id DESC
+            OFFSET %s
+        """, (size,))
+        self.browse([row[0] for row in self.env.cr.fetchall()]).unlink()
+
+    @api.model
+    def _invalidate_dates(self, dates):
+        """Drop the entries whose date range contains any of the given order dates"""
+        dates = [date for date in dates if date]
+        if not dates:
+            return
+        self.env.cr.execute("""
+            SELECT c.id FROM pos_customer_report_cache c
+            WHERE EXISTS (
+                SELECT 1 FROM unnest(%s::timestamp[]) AS d(date_order)
+                WHERE d.date_order >= c.date_from AND d.date_order < c.date_to
+            )
+        """, (dates,))
+        self.browse([row[0] for row in self.env.cr.fetchall()]).unlink()
+
+    @api.autovacuum
+    def _gc_expired_entries(self):
+        ttl = self._get_cache_param('ttl', 12 * 3600)
+        self.search([('create_date', '<', fields.Datetime.now() - timedelta(seconds=ttl))]).unlink()
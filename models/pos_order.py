@@ -0,0 +1,40 @@
+from odoo import models, api, tools
+from .pos_report_daily_fact import FACT_ORDER_STATES
+
+
+class PosOrder(models.Model):
+    _inherit = "pos.order"
+
+    # Writes to these fields can move an order in or out of the daily facts
+    _fact_trigger_fields = {'state', 'date_order', 'employee_id', 'session_id', 'config_id'}
+
+    def init(self):
+        # Report refreshes look up the orders changed since their last run
+        tools.create_index(self.env.cr, 'pos_order_write_date_index', self._table, ['write_date'])
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        orders = super().create(vals_list)
+        self.env['pos.customer.report.cache'].sudo()._invalidate_dates(orders.mapped('date_order'))
+        counted = orders.filtered(lambda order: order.state in FACT_ORDER_STATES)
+        if counted:
+            self.env['pos.report.daily.fact'].sudo()._apply_orders(counted)
+        return orders
+
+    def write(self, vals):
+        ReportCache = self.env['pos.customer.report.cache'].sudo()
+        ReportCache._invalidate_dates(self.mapped('date_order'))
+
+        Fact = self.env['pos.report.daily.fact'].sudo()
+        track_facts = bool(self._fact_trigger_fields.intersection(vals))
+        if track_facts:
+            # Take the orders out of the facts as they were, and add them back as they are
+            Fact._apply_orders(self.filtered(lambda order: order.state in FACT_ORDER_STATES), sign=-1)
+
+        res = super().write(vals)
+
+        if 'date_order' in vals:
+            ReportCache._invalidate_dates(self.mapped('date_order'))
+        if track_facts:
+            Fact._apply_orders(self.filtered(lambda order: order.state in FACT_ORDER_STATES))
+        return res
@@ -0,0 +1,93 @@
+from odoo import models, fields, api, tools
+
+# Lines updated per statement by the employee backfill
+BACKFILL_BATCH_SIZE = 50000
+
+
+class PosOrderLine(models.Model):
+    _inherit = "pos.order.line"
+
+    employee_id = fields.Many2one(
+        "hr.employee", string="Sold By", index=True, readonly=True,
+        help="Employee credited with the line, resolved from the barcode entered in the line note.",
+    )
+
+    def init(self):
+        # Report refreshes look up the lines changed since their last run
+        tools.create_index(self.env.cr, 'pos_order_line_write_date_index', self._table, ['write_date'])
+        # Employee creations and barcode changes look up the unresolved lines by note
+        tools.create_index(self.env.cr, 'pos_order_line_unresolved_note_index', self._table, ['note'],
+                           where='employee_id IS NULL AND note IS NOT NULL')
+
+    @api.model
+    def _resolve_note_employees(self, notes):
+        """Return a {barcode: employee id} mapping for the given line notes"""
+        barcodes = {note for note in notes if note}
+        if not barcodes:
+            return {}
+        employees = self.env['hr.employee'].sudo().with_context(active_test=False).search_read(
+            [('barcode', 'in', list(barcodes))], ['barcode'])
+        return {employee['barcode']: employee['id'] for employee in employees}
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        # Only lines with a note and no explicit employee need a lookup
+        employees = self._resolve_note_employees(
+            vals.get('note') for vals in vals_list if not vals.get('employee_id'))
+        for vals in vals_list:
+            if vals.get('note') in employees and not vals.get('employee_id'):
+                vals['employee_id'] = employees[vals['note']]
+        return super().create(vals_list)
+
+    def write(self, vals):
+        # A note that is not an employee barcode keeps the employee already credited
+        if vals.get('note') and 'employee_id' not in vals:
+            employee_id = self._resolve_note_employees([vals['note']]).get(vals['note'])
+            if employee_id:
+                vals = dict(vals, employee_id=employee_id)
+        return super().write(vals)
+
+    @api.model
+    def _backfill_employee_id(self, batch_size=BACKFILL_BATCH_SIZE):
+        """Resolve ``employee_id`` of the existing lines from their note, one id range at a time"""
+        cr = self.env.cr
+        self.flush_model(['note', 'employee_id'])
+        cr.execute("SELECT MIN(id), MAX(id) FROM pos_order_line")
+        min_id, max_id = cr.fetchone()
+        if min_id is None:
+            return 0
+        updated = 0
+        for start in range(min_id, max_id + 1, batch_size):
+            cr.execute("""
+                UPDATE pos_order_line pol
+                SET employee_id = he.id
+                FROM hr_employee he
+                WHERE pol.note = he.barcode
+                  AND pol.id >= %s AND pol.id < %s
+                  AND pol.employee_id IS DISTINCT FROM he.id
+            """, (start, start + batch_size))
+            updated += cr.rowcount
+        self.invalidate_model(['employee_id'])
+        return updated
+
+    @api.model
+    def _resolve_unassigned_lines(self, employees):
+        """Credit ``employees`` with the unresolved lines whose note holds their barcode.
+
+        Lines keep the employee resolved when they were created, so a barcode
+        change only picks up lines no employee could be found for so far.
+        """
+        employees = employees.filtered('barcode')
+        if not employees:
+            return
+        self.flush_model(['note', 'employee_id'])
+        self.env.cr.execute("""
+            UPDATE pos_order_line pol
+            SET employee_id = he.id
+            FROM hr_employee he
+            WHERE he.id IN %s
+              AND pol.note = he.barcode
+              AND pol.note IS NOT NULL
+              AND pol.employee_id IS NULL
+        """, (tuple(employees.ids),))
+        self.invalidate_model(['employee_id'])
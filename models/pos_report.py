@@ -1,13 +1,44 @@
 from odoo import models, fields, api, http
 from datetime import date, datetime
 import io
+import re
+import time
 import csv
-import json
 from odoo.http import request, content_disposition
+from .pos_report_run import report_run
+
+# Largest page the grid may request
+GRID_MAX_PAGE_SIZE = 500
+
+# Grid columns: name -> (label, SQL expression, kind). Sorting and filtering
+# only ever use these expressions, never client supplied SQL.
+GRID_COLUMNS = {
+    'order_reference': ("Order Ref", "po.name", 'char'),
+    'order_date': ("Order Date", "po.date_order::date", 'date'),
+    'customer_name': ("Customer", "rp.name", 'char'),
+    'pos_config_name': ("POS", "pc.name", 'char'),
+    'session_name': ("Session", "ps.name", 'char'),
+    'cashier_login': ("Cashier", "ru.login", 'char'),
+    'employee_name': ("Employee", "he.name", 'char'),
+    'pricelist_name': ("Pricelist", "pl.name->>'en_US'", 'char'),
+    'product_name': ("Product", "pt.name->>'en_US'", 'char'),
+    'quantity': ("Qty", "pol.qty", 'float'),
+    'original_price': ("Original Price", "pt.list_price", 'monetary'),
+    'price_unit': ("Unit Price", "pol.price_unit", 'monetary'),
+    'subtotal': ("Subtotal", "pol.price_subtotal", 'monetary'),
+    'tax_value': ("Tax", "(pol.price_subtotal_incl - pol.price_subtotal)", 'monetary'),
+    'discount': ("Discount (%)",
+                 "CASE WHEN pt.list_price > 0 THEN (pt.list_price - pol.price_unit) / pt.list_price * 100 ELSE 0 END",
+                 'percent'),
+    'discount_amount': ("Discount (Value)", "(GREATEST(pt.list_price - pol.price_unit, 0) * pol.qty)", 'monetary'),
+    'line_total_incl': ("Sale After Tax", "pol.price_subtotal_incl", 'monetary'),
+    'order_total': ("Order Total", "po.amount_total", 'monetary'),
+}
 
 
 class POSSalesReport(models.Model):
     _name = 'pos.sales.report'
+    _inherit = ['pos.report.date.range.mixin', 'pos.report.trace.mixin']
     _description = 'POS Sales Report'
 
     # ========= FILTER FIELDS =========
@@ -26,54 +57,88 @@ class POSSalesReport(models.Model):
         ('done', 'Done'),
         ('cancel', 'Cancelled')
     ], string="Order Status")
-    html_table = fields.Html("Report", sanitize=False)
-    report_data_json = fields.Json("Report Data")  # <-- store rows as JSON
+    report_generated = fields.Datetime("Generated On", readonly=True)
 
     # ========= MAIN ACTION =========
     def action_fetch_report(self):
+        """Apply the filters; the grid reads its pages from the database on demand"""
         self.ensure_one()
-        rows = self.fetch_report_data()
+        self.report_generated = fields.Datetime.now()
 
-        # convert dates to strings for JSON safety
-        def serialize(value):
-            if isinstance(value, (date, datetime)):
-                return value.isoformat()
-            return value
-
-        serialized_rows = [
-            {k: serialize(v) for k, v in row.items()} for row in rows
-        ]
+    # ========= DATA FETCHING =========
+    def _build_where_clause(self):
+        """Return the (where_clause, params) of the selected filters"""
+        where_clauses = ["TRUE"]
+        params = []
+        if self.start_date and self.end_date:
+            date_clause, date_params = self._get_date_range_clause()
+            where_clauses.append(date_clause)
+            params += date_params
+        elif self.start_date:
+            where_clauses.append("po.date_order >= %s")
+            params.append(self._get_date_range_bounds(self.start_date, self.start_date)[0])
+        elif self.end_date:
+            where_clauses.append("po.date_order < %s")
+            params.append(self._get_date_range_bounds(self.end_date, self.end_date)[1])
+        if self.branch_ids:
+            where_clauses.append("po.config_id = ANY(%s)")
+            params.append(self.branch_ids.ids)
+        if self.product_ids:
+            where_clauses.append("pol.product_id = ANY(%s)")
+            params.append(self.product_ids.ids)
+        if self.category_ids:
+            where_clauses.append("pt.categ_id = ANY(%s)")
+            params.append(self.category_ids.ids)
+        if self.user_ids:
+            where_clauses.append("po.user_id = ANY(%s)")
+            params.append(self.user_ids.ids)
+        if self.session_ids:
+            where_clauses.append("po.session_id = ANY(%s)")
+            params.append(self.session_ids.ids)
+        if self.pricelist_ids:
+            where_clauses.append("po.pricelist_id = ANY(%s)")
+            params.append(self.pricelist_ids.ids)
+        if self.state:
+            where_clauses.append("po.state = %s")
+            params.append(self.state)
+        return " AND ".join(where_clauses), params
 
-        # save html + json
-        self.html_table = self._build_html_table(rows)
-        self.report_data_json = serialized_rows
+    def _build_grid_filter_clause(self, filters):
+        """Translate the grid column filters into SQL conditions.
 
-    # ========= DATA FETCHING =========
-    def fetch_report_data(self):
-        self.ensure_one()
+        Text columns match by substring; numeric columns accept an optional
+        comparison operator (``>= 10``, ``<5``, ``=3``); date columns an ISO date.
+        """
+        where_clauses, params = [], []
+        for name, value in (filters or {}).items():
+            value = (value or '').strip()
+            if name not in GRID_COLUMNS or not value:
+                continue
+            _label, expression, kind = GRID_COLUMNS[name]
+            if kind == 'char':
+                where_clauses.append(f"{expression} ILIKE %s")
+                params.append(f"%{value}%")
+            elif kind == 'date':
+                try:
+                    params.append(fields.Date.to_date(value))
+                except ValueError:
+                    continue
+                where_clauses.append(f"{expression} = %s")
+            else:
+                match = re.fullmatch(r'(>=|<=|>|<|=)?\s*(-?\d+(?:\.\d+)?)', value)
+                if not match:
+                    continue
+                where_clauses.append(f"{expression} {match.group(1) or '='} %s")
+                params.append(float(match.group(2)))
+        return where_clauses, params
 
-        query = """
-            SELECT 
-                pol.id AS line_id,
-                po.id AS order_id,
-                po.name AS order_reference,
-                po.date_order::date AS order_date,
-                rp.name AS customer_name,
-                pc.name AS pos_config_name,
-                ps.name AS session_name,
-                ru.login AS cashier_login,
-                he.name AS employee_name,
-                pl.name ->> 'en_US' AS pricelist_name,
-                pt.name ->> 'en_US' AS product_name,
-                pt.type AS product_type,
-                pol.qty AS quantity,
-                pt.list_price AS original_price,
-                pol.price_unit AS price_unit,
-                pol.price_subtotal AS subtotal,
-                pol.price_subtotal_incl AS line_total_incl,
-                po.amount_total AS order_total
-            FROM 
-                pos_order_line pol
+    def _get_report_from_clause(self, filters=None):
+        """FROM/WHERE part shared by the line query and the totals query"""
+        where_clause, params = self._build_where_clause()
+        filter_clauses, filter_params = self._build_grid_filter_clause(filters)
+        where_clause = " AND ".join([where_clause] + filter_clauses)
+        query = f"""
+            FROM pos_order_line pol
             JOIN pos_order po ON pol.order_id = po.id
             LEFT JOIN res_partner rp ON po.partner_id = rp.id
             LEFT JOIN pos_session ps ON po.session_id = ps.id
@@ -82,157 +147,131 @@ class POSSalesReport(models.Model):
             LEFT JOIN product_pricelist pl ON po.pricelist_id = pl.id
             JOIN product_product pp ON pol.product_id = pp.id
             JOIN product_template pt ON pp.product_tmpl_id = pt.id
-            LEFT JOIN hr_employee he ON pol.note = he.barcode
-            WHERE TRUE
+            LEFT JOIN hr_employee he ON pol.employee_id = he.id
+            WHERE {where_clause}
         """
-        params = []
+        return query, params + filter_params
 
-        # ==== APPLY FILTERS ====
-        if self.start_date:
-            query += " AND po.date_order::date >= %s"
-            params.append(self.start_date)
-        if self.end_date:
-            query += " AND po.date_order::date <= %s"
-            params.append(self.end_date)
-        if self.branch_ids:
-            query += " AND po.config_id = ANY(%s)"
-            params.append([b.id for b in self.branch_ids])
-        if self.product_ids:
-            query += " AND pol.product_id = ANY(%s)"
-            params.append([p.id for p in self.product_ids])
-        if self.category_ids:
-            query += " AND pt.categ_id = ANY(%s)"
-            params.append([c.id for c in self.category_ids])
-        if self.user_ids:
-            query += " AND po.user_id = ANY(%s)"
-            params.append([u.id for u in self.user_ids])
-        if self.session_ids:
-            query += " AND po.session_id = ANY(%s)"
-            params.append([s.id for s in self.session_ids])
-        if self.pricelist_ids:
-            query += " AND po.pricelist_id = ANY(%s)"
-            params.append([pl.id for pl in self.pricelist_ids])
-        if self.state:
-            query += " AND po.state = %s"
-            params.append(self.state)
+    def _get_summary_values(self, filters=None):
+        """Compute the report totals in a single aggregate pass"""
+        from_clause, params = self._get_report_from_clause(filters)
+        query = f"""
+            SELECT
+                COUNT(*) AS line_count,
+                COALESCE(SUM(pol.qty), 0) AS total_qty,
+                COALESCE(SUM(pol.price_subtotal), 0) AS total_subtotal,
+                COALESCE(SUM(pol.price_subtotal_incl - pol.price_subtotal), 0) AS total_tax,
+                COALESCE(SUM(pol.price_subtotal_incl), 0) AS total_total_incl,
+                COALESCE(SUM(GREATEST(pt.list_price - pol.price_unit, 0) * pol.qty), 0) AS total_discount_amount
+            {from_clause}
+        """
+        return self._report_execute(query, params).dictfetchone()
+
+    def _get_grid_order(self, order):
+        """Return the (SQL expression, direction) the lines are sorted by, ``pol.id`` breaking ties"""
+        if order and order.get('column') in GRID_COLUMNS:
+            return GRID_COLUMNS[order['column']][1], "ASC" if order.get('asc') else "DESC"
+        return "po.date_order", "DESC"
 
-        # ==== ORDERING ====
-        query += " ORDER BY po.date_order DESC, po.id DESC, pol.id ASC"
+    def _get_keyset_clause(self, expression, direction, cursor):
+        """Condition selecting the lines after ``cursor``, the [value, line_id] of the last line read.
+
+        Mirrors ``ORDER BY expression direction NULLS LAST, pol.id direction``.
+        """
+        value, line_id = cursor
+        after = ">" if direction == "ASC" else "<"
+        if value is None:
+            return f"{expression} IS NULL AND pol.id {after} %s", [line_id]
+        clause = (f"({expression} {after} %s OR ({expression} = %s AND pol.id {after} %s)"
+                  f" OR {expression} IS NULL)")
+        return clause, [value, value, line_id]
+
+    def fetch_report_data(self, cursor=None, limit=None, order=None, filters=None):
+        """Return the report lines, optionally one sorted and filtered keyset page of them.
+
+        ``order`` is ``{'column': <grid column>, 'asc': bool}``; ``filters`` maps
+        grid columns to the text typed in their filter box. ``cursor`` is the
+        ``[sort value, line_id]`` of the last line of the previous page, so every
+        page costs the same to read.
+        """
+        self.ensure_one()
+        from_clause, params = self._get_report_from_clause(filters)
+        expression, direction = self._get_grid_order(order)
+        if cursor:
+            keyset_clause, keyset_params = self._get_keyset_clause(expression, direction, cursor)
+            from_clause += f" AND {keyset_clause}"
+            params += keyset_params
+        columns = ",\n                ".join(
+            f"{column_sql} AS {name}" for name, (_label, column_sql, _kind) in GRID_COLUMNS.items())
+        query = f"""
+            SELECT
+                pol.id AS line_id,
+                po.id AS order_id,
+                pt.type AS product_type,
+                {expression} AS sort_value,
+                {columns}
+            {from_clause}
+            ORDER BY {expression} {direction} NULLS LAST, pol.id {direction}
+        """
+        if limit:
+            query += " LIMIT %s"
+            params.append(limit)
 
-        self.env.cr.execute(query, params)
-        rows = self.env.cr.dictfetchall()
+        with self._report_phase('query'):
+            rows = self._report_execute(query, params).dictfetchall()
 
         # ==== ENRICH ROWS ====
+        enrich_started = time.perf_counter()
         for r in rows:
             qty = float(r['quantity'] or 0.0)
-            original = float(r['original_price'] or 0.0)  # pt.list_price
             unit_price = float(r['price_unit'] or 0.0)    # actual applied price
-
-            # Pricelist discount calculation
-            discount_value = (original - unit_price) * qty if original > unit_price else 0.0
-            discount_percent = ((original - unit_price) / original * 100.0) if original > 0 else 0.0
-
-            r['tax_value'] = (r['line_total_incl'] or 0) - (r['subtotal'] or 0)
-            r['discount_amount'] = discount_value
-            r['discount'] = discount_percent
             r['net_sale'] = r['subtotal'] or 0.0
             r['sale_after_tax'] = r['line_total_incl'] or 0.0
             r['product_display'] = f"{r['product_name']} ({qty:.2f} x {unit_price:.2f} = {r['subtotal']:.2f})"
+        self._report_phase_add('enrich', time.perf_counter() - enrich_started)
 
         return rows
 
-    # ========= HTML TABLE BUILDER =========
-    def _build_html_table(self, rows):
-        if not rows:
-            return "<p>No data found. Adjust filters and try again.</p>"
-
-        # Totals
-        total_qty = sum(r['quantity'] or 0 for r in rows)
-        total_subtotal = sum(r['subtotal'] or 0 for r in rows)
-        total_tax = sum(r['tax_value'] or 0 for r in rows)
-        total_total_incl = sum(r['line_total_incl'] or 0 for r in rows)
-        total_discount_amount = sum(r.get('discount_amount', 0) for r in rows)
-
-        totals_block = f"""
-            <h4>Summary Totals</h4>
-            <ul>
-                <li>Total Quantity: <b>{total_qty:.2f}</b></li>
-                <li>Total Subtotal (Before Tax): <b>{total_subtotal:.2f}</b></li>
-                <li>Total Tax: <b>{total_tax:.2f}</b></li>
-                <li>Total Discount: <b>{total_discount_amount:.2f}</b></li>
-                <li>Total Including Tax: <b>{total_total_incl:.2f}</b></li>
-            </ul>
-            <br/>
-        """
+    @report_run('grid_page')
+    def get_grid_page(self, cursor=None, limit=80, order=None, filters=None, with_totals=False):
+        """One keyset page of the report grid.
 
-        table = f"""
-            <table class='table table-sm table-bordered'>
-                <thead>
-                    <tr>
-                        <th>Order Ref</th>
-                        <th>Order Date</th>
-                        <th>Customer</th>
-                        <th>POS</th>
-                        <th>Session</th>
-                        <th>Cashier</th>
-                        <th>Employee</th>
-                        <th>Pricelist</th>
-                        <th>Product</th>
-                        <th>Qty</th>
-                        <th>Original Price</th>
-                        <th>Unit Price</th>
-                        <th>Subtotal</th>
-                        <th>Tax</th>
-                        <th>Discount (%)</th>
-                        <th>Discount (Value)</th>
-                        <th>Net Sale Before Tax</th>
-                        <th>Sale After Tax</th>
-                        <th>Order Total</th>
-                    </tr>
-                </thead>
-                <tbody>
-                <tr style="font-weight:bold; background:#f0f0f0;">
-                    <td colspan="9" style="text-align:right;">TOTALS:</td>
-                    <td>{total_qty:.2f}</td>
-                    <td></td>
-                    <td></td>
-                    <td>{total_subtotal:.2f}</td>
-                    <td>{total_tax:.2f}</td>
-                    <td></td>
-                    <td>{total_discount_amount:.2f}</td>
-                    <td>{total_subtotal:.2f}</td>
-                    <td>{total_total_incl:.2f}</td>
-                    <td></td>
-                </tr>
+        The totals of all the filtered lines are only aggregated ``with_totals``,
+        which the grid asks for when the filters or the sort change, not per page.
         """
+        self.ensure_one()
+        limit = max(1, min(int(limit or 80), GRID_MAX_PAGE_SIZE))
+        rows = self.fetch_report_data(cursor=cursor, limit=limit + 1, order=order, filters=filters)
+        has_next = len(rows) > limit
+        rows = rows[:limit]
 
-        # Render every order line separately
-        for r in rows:
-            table += f"""
-                <tr data-line-id="{r['line_id']}">
-                    <td><a href="/web#id={r['order_id']}&model=pos.order&view_type=form" target="_blank">{r['order_reference']}</a></td>
-                    <td>{r['order_date']}</td>
-                    <td>{r['customer_name'] or ''}</td>
-                    <td>{r['pos_config_name'] or ''}</td>
-                    <td>{r['session_name'] or ''}</td>
-                    <td>{r['cashier_login'] or ''}</td>
-                    <td>{r['employee_name'] or ''}</td>
-                    <td>{r['pricelist_name'] or ''}</td>
-                    <td>{r['product_display']}</td>
-                    <td>{r['quantity'] or 0:.2f}</td>
-                    <td>{r['original_price'] or 0:.2f}</td>
-                    <td>{r['price_unit'] or 0:.2f}</td>
-                    <td>{r['subtotal'] or 0:.2f}</td>
-                    <td>{r['tax_value'] or 0:.2f}</td>
-                    <td>{r['discount'] or 0:.2f}</td>
-                    <td>{r['discount_amount'] or 0:.2f}</td>
-                    <td>{r['net_sale'] or 0:.2f}</td>
-                    <td>{r['sale_after_tax'] or 0:.2f}</td>
-                    <td>{r['order_total'] or 0:.2f}</td>
-                </tr>
-            """
-        table += "</tbody></table>"
-        return totals_block + table
+        with self._report_phase('render'):
+            def serialize(value):
+                if isinstance(value, (date, datetime)):
+                    return value.isoformat()
+                return value
+
+            page = {
+                'columns': [
+                    {'name': name, 'label': label, 'kind': kind}
+                    for name, (label, _expression, kind) in GRID_COLUMNS.items()
+                ],
+                'rows': [{key: serialize(value) for key, value in row.items()} for row in rows],
+                'next_cursor': [serialize(rows[-1]['sort_value']), rows[-1]['line_id']] if has_next else False,
+            }
+
+        if with_totals:
+            with self._report_phase('query'):
+                totals = self._get_summary_values(filters)
+            page['total'] = totals['line_count']
+            page['totals'] = {
+                'quantity': totals['total_qty'],
+                'subtotal': totals['total_subtotal'],
+                'tax_value': totals['total_tax'],
+                'discount_amount': totals['total_discount_amount'],
+                'line_total_incl': totals['total_total_incl'],
+            }
+        return page
 
     # ========= CSV EXPORT =========
     def action_generate_csv(self):
@@ -246,10 +285,18 @@ class POSSalesReport(models.Model):
 
 class POSReportController(http.Controller):
 
+    @http.route('/pos_sales_report/<int:report_id>/grid', type='json', auth='user')
+    def grid_page(self, report_id, cursor=None, limit=80, order=None, filters=None, with_totals=False):
+        report = request.env['pos.sales.report'].browse(report_id)
+        report.check_access('read')
+        return report.get_grid_page(cursor=cursor, limit=limit, order=order, filters=filters,
+                                    with_totals=with_totals)
+
     @http.route('/pos_sales_report/download/<int:report_id>', type='http', auth='user')
     def download_csv(self, report_id, **kwargs):
-        report = request.env['pos.sales.report'].browse(report_id).sudo()
-        rows = report.fetch_report_data()
+        report = request.env['pos.sales.report'].browse(report_id)
+        report.check_access('read')
+        rows = report.sudo().fetch_report_data()
 
         output = io.StringIO()
         writer = csv.writer(output)
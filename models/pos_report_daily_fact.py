@@ -0,0 +1,249 @@
+import logging
+import pytz
+from datetime import datetime, time, timedelta
+from odoo import models, fields, api, tools, _
+
+_logger = logging.getLogger(__name__)
+
+# Order states counted as sales by the reports
+FACT_ORDER_STATES = ('paid', 'done', 'invoiced')
+
+
+class PosReportDailyFact(models.Model):
+    _name = "pos.report.daily.fact"
+    _description = "POS Daily Sales Fact"
+    _order = "day desc"
+    _log_access = False
+
+    day = fields.Date(string="Day", required=True, index=True, readonly=True)
+    employee_id = fields.Many2one("hr.employee", string="Employee", readonly=True)
+    config_id = fields.Many2one("pos.config", string="POS Branch", required=True, readonly=True)
+    categ_id = fields.Many2one("product.category", string="Product Category", readonly=True)
+    qty = fields.Float(string="Quantity", readonly=True)
+    subtotal_excl = fields.Float(string="Subtotal (Excl Tax)", readonly=True)
+    subtotal_incl = fields.Float(string="Subtotal (Incl Tax)", readonly=True)
+    order_count = fields.Integer(string="Orders", readonly=True,
+                                 help="Distinct orders with lines in this category. Orders spanning several "
+                                      "categories are counted once per category.")
+
+    def init(self):
+        tools.create_unique_index(
+            self.env.cr, 'pos_report_daily_fact_key_uniq', self._table,
+            ['day', 'COALESCE(employee_id, 0)', 'config_id', 'COALESCE(categ_id, 0)'],
+        )
+
+    @api.model
+    def _get_fact_tz(self):
+        """Timezone the fact days are cut in, the same whoever writes the orders"""
+        return self.env['ir.config_parameter'].sudo().get_param('myreport.fact_timezone') or 'UTC'
+
+    @api.model
+    def _init_fact_tz(self):
+        """Fix the fact timezone to the main company's, unless already set.
+
+        Changing it afterwards requires rebuilding the fact table.
+        """
+        Param = self.env['ir.config_parameter'].sudo()
+        if not Param.get_param('myreport.fact_timezone'):
+            company = self.env.ref('base.main_company', raise_if_not_found=False) or self.env.company
+            Param.set_param('myreport.fact_timezone', company.partner_id.tz or 'UTC')
+
+    @api.model
+    def _get_order_slices(self, orders):
+        """Return the (day, config_id) slices the given orders contribute to"""
+        tz = pytz.timezone(self._get_fact_tz())
+        return {
+            (pytz.utc.localize(order.date_order).astimezone(tz).date(), order.config_id.id)
+            for order in orders
+            if order.date_order and order.config_id
+        }
+
+    @api.model
+    def _day_bounds(self, date_from, date_to):
+        """Half-open UTC bounds covering the fact days [date_from, date_to]"""
+        tz = pytz.timezone(self._get_fact_tz())
+        lower = tz.localize(datetime.combine(date_from, time.min)).astimezone(pytz.utc).replace(tzinfo=None)
+        upper = tz.localize(datetime.combine(date_to + timedelta(days=1), time.min))
+        return lower, upper.astimezone(pytz.utc).replace(tzinfo=None)
+
+    @api.model
+    def _insert_facts(self, where_clause, params):
+        """Aggregate the matching paid order lines into fact rows"""
+        query = f"""
+            INSERT INTO pos_report_daily_fact
+                (day, employee_id, config_id, categ_id, qty, subtotal_excl, subtotal_incl, order_count)
+            SELECT
+                (po.date_order AT TIME ZONE 'UTC' AT TIME ZONE %s)::date,
+                po.employee_id,
+                po.config_id,
+                pt.categ_id,
+                SUM(pol.qty),
+                SUM(pol.price_subtotal),
+                SUM(pol.price_subtotal_incl),
+                COUNT(DISTINCT po.id)
+            FROM pos_order po
+            JOIN pos_order_line pol ON pol.order_id = po.id
+            JOIN product_product pp ON pol.product_id = pp.id
+            JOIN product_template pt ON pp.product_tmpl_id = pt.id
+            WHERE po.state IN %s
+                AND po.config_id IS NOT NULL
+                AND {where_clause}
+            GROUP BY 1, 2, 3, 4
+        """
+        self.env.cr.execute(query, (self._get_fact_tz(), FACT_ORDER_STATES, *params))
+        return self.env.cr.rowcount
+
+    @api.model
+    def _apply_orders(self, orders, sign=1):
+        """Add (``sign`` 1) or remove (-1) the contribution of ``orders`` to the fact rows.
+
+        Only the rows of the orders are aggregated and upserted, so the cost
+        does not depend on the day's volume. Orders outside the counted states
+        contribute nothing; rows left without orders are deleted.
+        """
+        if not orders:
+            return
+        orders.flush_recordset(['state', 'date_order', 'employee_id', 'config_id'])
+        self.env['pos.order.line'].flush_model(['order_id', 'product_id', 'qty', 'price_subtotal', 'price_subtotal_incl'])
+        self.env.cr.execute("""
+            INSERT INTO pos_report_daily_fact AS f
+                (day, employee_id, config_id, categ_id, qty, subtotal_excl, subtotal_incl, order_count)
+            SELECT
+                (po.date_order AT TIME ZONE 'UTC' AT TIME ZONE %(tz)s)::date,
+                po.employee_id,
+                po.config_id,
+                pt.categ_id,
+                %(sign)s * SUM(pol.qty),
+                %(sign)s * SUM(pol.price_subtotal),
+                %(sign)s * SUM(pol.price_subtotal_incl),
+                %(sign)s * COUNT(DISTINCT po.id)
+            FROM pos_order po
+            JOIN pos_order_line pol ON pol.order_id = po.id
+            JOIN product_product pp ON pol.product_id = pp.id
+            JOIN product_template pt ON pp.product_tmpl_id = pt.id
+            WHERE po.id IN %(order_ids)s
+                AND po.state IN %(states)s
+                AND po.config_id IS NOT NULL
+            GROUP BY 1, 2, 3, 4
+            ORDER BY 1, 2, 3, 4
+            ON CONFLICT (day, COALESCE(employee_id, 0), config_id, COALESCE(categ_id, 0)) DO UPDATE SET
+                qty = f.qty + EXCLUDED.qty,
+                subtotal_excl = f.subtotal_excl + EXCLUDED.subtotal_excl,
+                subtotal_incl = f.subtotal_incl + EXCLUDED.subtotal_incl,
+                order_count = f.order_count + EXCLUDED.order_count
+            RETURNING f.id, f.order_count
+        """, {
+            'tz': self._get_fact_tz(),
+            'sign': sign,
+            'order_ids': tuple(orders.ids),
+            'states': FACT_ORDER_STATES,
+        })
+        emptied = [fact_id for fact_id, order_count in self.env.cr.fetchall() if order_count <= 0]
+        if emptied:
+            self.env.cr.execute("DELETE FROM pos_report_daily_fact WHERE id IN %s", (tuple(emptied),))
+        self.invalidate_model()
+
+    @api.model
+    def _merge_employees(self, employee_ids):
+        """Move the rows of ``employee_ids`` into the rows without employee, before the employees are deleted"""
+        if not employee_ids:
+            return
+        self.env.cr.execute("""
+            WITH moved AS (
+                DELETE FROM pos_report_daily_fact WHERE employee_id IN %(employee_ids)s
+                RETURNING day, config_id, categ_id, qty, subtotal_excl, subtotal_incl, order_count
+            )
+            INSERT INTO pos_report_daily_fact AS f
+                (day, employee_id, config_id, categ_id, qty, subtotal_excl, subtotal_incl, order_count)
+            SELECT day, NULL, config_id, categ_id, SUM(qty), SUM(subtotal_excl), SUM(subtotal_incl), SUM(order_count)
+            FROM moved
+            GROUP BY day, config_id, categ_id
+            ON CONFLICT (day, COALESCE(employee_id, 0), config_id, COALESCE(categ_id, 0)) DO UPDATE SET
+                qty = f.qty + EXCLUDED.qty,
+                subtotal_excl = f.subtotal_excl + EXCLUDED.subtotal_excl,
+                subtotal_incl = f.subtotal_incl + EXCLUDED.subtotal_incl,
+                order_count = f.order_count + EXCLUDED.order_count
+        """, {'employee_ids': tuple(employee_ids)})
+        self.invalidate_model()
+
+    @api.model
+    def _refresh_slices(self, slices):
+        """Recompute the fact rows of the given (day, config_id) slices from the POS orders.
+
+        For repairs only; order changes are applied with ``_apply_orders``.
+        """
+        if not slices:
+            return
+        self.env.flush_all()
+        days = [day for day, _config_id in slices]
+        config_ids = [config_id for _day, config_id in slices]
+        lower, upper = self._day_bounds(min(days), max(days))
+
+        self.env.cr.execute("""
+            DELETE FROM pos_report_daily_fact f
+            USING unnest(%s::date[], %s::int[]) AS s(day, config_id)
+            WHERE f.day = s.day AND f.config_id = s.config_id
+        """, (days, config_ids))
+        self._insert_facts(
+            """po.date_order >= %s AND po.date_order < %s
+                AND ((po.date_order AT TIME ZONE 'UTC' AT TIME ZONE %s)::date, po.config_id) IN (
+                    SELECT * FROM unnest(%s::date[], %s::int[]))""",
+            [lower, upper, self._get_fact_tz(), days, config_ids],
+        )
+        self.invalidate_model()
+
+    @api.model
+    def _backfill(self, date_from=None, date_to=None, batch_days=31, commit=False):
+        """Rebuild the fact table for [date_from, date_to] (all history by default).
+
+        Works in windows of ``batch_days`` days; with ``commit`` each window is
+        committed on its own so a long backfill can be resumed.
+        """
+        self.env.flush_all()
+        tz = self._get_fact_tz()
+        if not date_from or not date_to:
+            self.env.cr.execute("""
+                SELECT MIN((date_order AT TIME ZONE 'UTC' AT TIME ZONE %s)::date),
+                       MAX((date_order AT TIME ZONE 'UTC' AT TIME ZONE %s)::date)
+                FROM pos_order
+            """, (tz, tz))
+            first_day, last_day = self.env.cr.fetchone()
+            date_from = date_from or first_day
+            date_to = date_to or last_day
+        if not date_from or not date_to:
+            return 0
+
+        total = 0
+        window_start = fields.Date.to_date(date_from)
+        date_to = fields.Date.to_date(date_to)
+        while window_start <= date_to:
+            window_end = min(window_start + timedelta(days=batch_days - 1), date_to)
+            lower, upper = self._day_bounds(window_start, window_end)
+            self.env.cr.execute(
+                "DELETE FROM pos_report_daily_fact WHERE day >= %s AND day <= %s",
+                (window_start, window_end),
+            )
+            rows = self._insert_facts("po.date_order >= %s AND po.date_order < %s", [lower, upper])
+            total += rows
+            _logger.info("POS daily facts rebuilt for %s..%s: %s rows", window_start, window_end, rows)
+            if commit:
+                self.env.cr.commit()
+            window_start = window_end + timedelta(days=1)
+
+        self.invalidate_model()
+        return total
+
+    @api.model
+    def action_backfill(self):
+        """Rebuild the whole fact table (server action entry point)"""
+        rows = self._backfill(commit=True)
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('POS Daily Facts'),
+                'message': _('%s fact rows rebuilt.', rows),
+                'type': 'success',
+                'sticky': False,
+            }
+        }
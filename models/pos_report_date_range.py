@@ -0,0 +1,60 @@
+import pytz
+from datetime import datetime, time, timedelta
+from odoo import models
+
+
+class PosReportDateRangeMixin(models.AbstractModel):
+    _name = "pos.report.date.range.mixin"
+    _description = "POS Report Date Range"
+
+    def _get_report_tz(self):
+        """Timezone used to split report days: the user's, else the branch company's"""
+        tz = self.env.context.get('tz') or self.env.user.tz
+        if not tz and 'branch_ids' in self._fields:
+            tz = self.branch_ids[:1].company_id.partner_id.tz
+        return tz or self.env.company.partner_id.tz or 'UTC'
+
+    def _get_date_range_bounds(self, start_date, end_date):
+        """Convert report bounds into half-open naive UTC timestamps [lower, upper).
+
+        Date values cover whole days in the report timezone. Datetime values are
+        already UTC and are kept inclusive by moving the upper bound one second on.
+        """
+        tz = pytz.timezone(self._get_report_tz())
+
+        def day_start(value):
+            return tz.localize(datetime.combine(value, time.min)).astimezone(pytz.utc).replace(tzinfo=None)
+
+        if isinstance(start_date, datetime):
+            lower = start_date
+        else:
+            lower = day_start(start_date)
+
+        if isinstance(end_date, datetime):
+            upper = end_date + timedelta(seconds=1)
+        else:
+            upper = day_start(end_date + timedelta(days=1))
+
+        return lower, upper
+
+    def _get_date_range_clause(self, column="po.date_order", start_date=None, end_date=None):
+        """Return an index-friendly (clause, params) filter on ``column``.
+
+        The column is compared as-is (no ``::date`` cast) so PostgreSQL can use a
+        range scan on its index.
+        """
+        start_date = start_date or self.start_date
+        end_date = end_date or self.end_date
+        lower, upper = self._get_date_range_bounds(start_date, end_date)
+        return f"{column} >= %s AND {column} < %s", [lower, upper]
+
+    def _get_ranges_clause(self, column, ranges, inclusive=False):
+        """Return a (clause, params) filter on ``column`` matching any of ``ranges``.
+
+        Ranges are half-open ``(lower, upper)`` pairs, closed when ``inclusive``.
+        Each one stays a plain comparison so PostgreSQL can combine index range
+        scans and read all of them in a single pass.
+        """
+        operator = '<=' if inclusive else '<'
+        clauses = [f"({column} >= %s AND {column} {operator} %s)" for _range in ranges]
+        return f"({' OR '.join(clauses)})", [value for bounds in ranges for value in bounds]
@@ -0,0 +1,138 @@
+from odoo import models, api, tools
+
+# Models whose names the reports resolve through the dimension cache
+DIMENSION_MODELS = ('product.template', 'product.category', 'product.pricelist', 'pos.config')
+
+
+def create_cache_version(cr, sequence):
+    cr.execute(f"CREATE SEQUENCE IF NOT EXISTS {sequence}")
+
+
+def get_cache_version(cr, sequence):
+    """Return the value of the cache version ``sequence``, read once per transaction.
+
+    ormcaches keyed on it are invalidated in every worker by bumping the
+    sequence, without clearing the other caches of the registry.
+    """
+    key = ('pos_report_cache_version', sequence)
+    if key not in cr.cache:
+        cr.execute(f"SELECT last_value FROM {sequence}")
+        cr.cache[key] = cr.fetchone()[0]
+
+        def forget():
+            cr.cache.pop(key, None)
+        cr.postcommit.add(forget)
+        cr.postrollback.add(forget)
+    return cr.cache[key]
+
+
+def bump_cache_version(cr, sequence):
+    cr.execute(f"SELECT nextval('{sequence}')")
+    cr.cache[('pos_report_cache_version', sequence)] = cr.fetchone()[0]
+
+
+class PosReportDimensionMixin(models.AbstractModel):
+    _name = "pos.report.dimension.mixin"
+    _description = "POS Report Dimension Names"
+
+    @api.model
+    def _get_dimension_version(self, model_name):
+        return get_cache_version(self.env.cr, self.env[model_name]._get_dimension_sequence())
+
+    @api.model
+    @tools.ormcache('model_name', 'record_id', 'lang', 'self._get_dimension_version(model_name)')
+    def _get_dimension_name(self, model_name, record_id, lang):
+        """Return the name of ``record_id`` in ``lang``.
+
+        Cached in the registry LRU per (model, id, lang) so report queries only
+        select ids; renaming a record of the model drops its cached names.
+        Names already read by ``_read_dimension_names`` are passed through the
+        context to seed the cache without querying again.
+        """
+        prefetched = self.env.context.get('pos_report_dimension_names')
+        if prefetched is not None and record_id in prefetched:
+            return prefetched[record_id]
+        record = self.env[model_name].sudo().with_context(lang=lang, active_test=False).browse(record_id)
+        return record.name if record.exists() else False
+
+    def _dimension_name(self, model_name, record_id):
+        """Return the name of ``record_id`` in the user's language, False for no record"""
+        if not record_id:
+            return False
+        return self._get_dimension_name(model_name, record_id, self.env.lang or 'en_US')
+
+    def _translated_sql(self, column):
+        """SQL selecting the translated jsonb ``column`` in the user's language, English as fallback"""
+        lang = self.env.cr.mogrify("%s", [self.env.lang or 'en_US']).decode()
+        return f"COALESCE({column}->>{lang}, {column}->>'en_US')"
+
+    def _read_dimension_names(self, model_name, record_ids):
+        """Return {id: name} of ``record_ids`` in the user's language, read in one go.
+
+        The names are also put in the dimension cache, so later single lookups
+        of these ids do not query either.
+        """
+        lang = self.env.lang or 'en_US'
+        record_ids = list(record_ids)
+        records = self.env[model_name].sudo().with_context(lang=lang, active_test=False).browse(record_ids)
+        names = dict.fromkeys(record_ids, False)
+        names.update((values['id'], values['name']) for values in records.exists().read(['name']))
+        seeded = self.with_context(pos_report_dimension_names=names)
+        for record_id in record_ids:
+            seeded._get_dimension_name(model_name, record_id, lang)
+        return names
+
+    def _prefetch_dimensions(self, rows, columns):
+        """Cache the names of the dimension ids in ``rows`` with one read per model.
+
+        ``columns`` maps a row key to the model of the ids it holds.
+        """
+        for key, model_name in columns.items():
+            record_ids = {row[key] for row in rows if row[key]}
+            if record_ids:
+                self._read_dimension_names(model_name, record_ids)
+
+
+class PosReportDimensionSource(models.AbstractModel):
+    _name = "pos.report.dimension.source"
+    _description = "POS Report Dimension Source"
+
+    def init(self):
+        super().init()
+        create_cache_version(self.env.cr, self._get_dimension_sequence())
+
+    def _get_dimension_sequence(self):
+        """Sequence versioning the cached names of this model"""
+        return f"pos_report_name_version_{self._table}"
+
+    def write(self, vals):
+        res = super().write(vals)
+        if 'name' in vals:
+            bump_cache_version(self.env.cr, self._get_dimension_sequence())
+        return res
+
+    def update_field_translations(self, field_name, translations, *args, **kwargs):
+        res = super().update_field_translations(field_name, translations, *args, **kwargs)
+        if field_name == 'name':
+            bump_cache_version(self.env.cr, self._get_dimension_sequence())
+        return res
+
+
+class ProductTemplate(models.Model):
+    _name = "product.template"
+    _inherit = ["product.template", "pos.report.dimension.source"]
+
+
+class ProductCategory(models.Model):
+    _name = "product.category"
+    _inherit = ["product.category", "pos.report.dimension.source"]
+
+
+class ProductPricelist(models.Model):
+    _name = "product.pricelist"
+    _inherit = ["product.pricelist", "pos.report.dimension.source"]
+
+
+class PosConfig(models.Model):
+    _name = "pos.config"
+    _inherit = ["pos.config", "pos.report.dimension.source"]
@@ -0,0 +1,280 @@
+import io
+import csv
+import time
+import tempfile
+from odoo import models, fields, _
+from odoo.exceptions import UserError
+from odoo.tools import split_every
+
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
+# Rows per worksheet in the XLSX format, header included
+XLSX_MAX_ROWS = 1048576
+XLSX_NUMBER_FORMATS = {
+    'float': '#,##0.00',
+    'monetary': '#,##0.00',
+    'percent': '0.00"%"',
+    'datetime': 'yyyy-mm-dd hh:mm:ss',
+}
+
+
+class PosReportExportMixin(models.AbstractModel):
+    """Streaming CSV/XLSX export of a report.
+
+    Reports define ``_get_export_columns`` and either ``_get_export_query`` or
+    ``_get_export_stored_source``; ``_get_export_filename`` and
+    ``_get_export_summary_rows`` are optional.
+    """
+    _name = "pos.report.export.mixin"
+    _inherit = ["pos.report.trace.mixin", "pos.report.dimension.mixin"]
+    _description = "POS Report Streaming Export"
+
+    # Rows pulled from the server-side cursor per round trip
+    _export_batch_size = 2000
+    # Flush the CSV buffer to the client once it reaches this size (bytes)
+    _export_chunk_size = 64 * 1024
+    # URL slug of the report's export route in controllers.py
+    _export_route = None
+
+    def _get_export_columns(self):
+        """Return the export columns as (label, kind) pairs.
+
+        ``kind`` is one of ``char``, ``float``, ``monetary``, ``percent`` or ``datetime``
+        and drives the cell formatting. A ``char`` column may add a third item, the
+        model whose record id the query selects; the id is exported as the record
+        name from the dimension cache. No columns by default.
+        """
+        return []
+
+    def _get_export_query(self):
+        """Return (query, params) selecting one row per export line, in column order.
+
+        ``None``, the default, exports no data rows.
+        """
+        return None
+
+    def _get_export_stored_source(self):
+        """Return (line model, line fields in column order) when the export reads the stored result.
+
+        Reports whose result is frozen in their lines or snapshot export it as
+        shown instead of querying the orders again. ``None`` runs the export query.
+        """
+        return None
+
+    def _get_export_summary_rows(self):
+        """Return the summary rows written after the data rows, with raw values"""
+        return []
+
+    def _get_export_filename(self, extension):
+        return f"{self._name.replace('.', '_')}_{self.id}.{extension}"
+
+    def _check_export_ready(self):
+        if not self.report_generated:
+            raise UserError(_("No data to export. Please generate the report first."))
+
+    def _check_xlsx_available(self):
+        if xlsxwriter is None:
+            raise UserError(_("The xlsxwriter Python library is required to export to Excel."))
+
+    def _iter_export_rows(self):
+        """Yield export rows from a server-side named cursor, one batch at a time"""
+        self.ensure_one()
+        source = self._get_export_stored_source()
+        if source:
+            yield from self._iter_stored_export_rows(*source)
+            return
+        export_query = self._get_export_query()
+        if not export_query:
+            return
+        query, params = export_query
+        rows = self._report_iter_rows(query, params, batch_size=self._export_batch_size)
+        dimensions = [(index, column[2]) for index, column in enumerate(self._get_export_columns()) if len(column) > 2]
+        if not dimensions:
+            yield from rows
+            return
+        # Names resolved during this export, per model; each batch reads the missing ones at once
+        names = {model_name: {} for _index, model_name in dimensions}
+        for batch in split_every(self._export_batch_size, rows, list):
+            for index, model_name in dimensions:
+                missing = {row[index] for row in batch if row[index]} - names[model_name].keys()
+                if missing:
+                    names[model_name].update(self._read_dimension_names(model_name, missing))
+            for row in batch:
+                row = list(row)
+                for index, model_name in dimensions:
+                    row[index] = names[model_name].get(row[index], False)
+                yield row
+
+    def _iter_stored_export_rows(self, model_name, field_names):
+        """Yield export rows from the report snapshot when it has one, else from its stored lines"""
+        if 'snapshot_id' in self._fields and self.snapshot_id:
+            kinds = [column[1] for column in self._get_export_columns()]
+            with self._open_snapshot() as reader:
+                for line in reader:
+                    yield [
+                        fields.Datetime.to_datetime(line.get(name)) if kind == 'datetime' else line.get(name)
+                        for name, kind in zip(field_names, kinds)
+                    ]
+            return
+        Line = self.env[model_name]
+        query = f"""
+            SELECT {', '.join(field_names)}
+            FROM {Line._table}
+            WHERE report_id = %s
+            ORDER BY {Line._order}, id
+        """
+        yield from self._report_iter_rows(query, (self.id,), batch_size=self._export_batch_size)
+
+    def _format_csv_value(self, value, kind):
+        if value is None or value is False:
+            return 0 if kind in ('float', 'monetary') else ''
+        if kind == 'monetary':
+            return f"{value:,.2f}"
+        if kind == 'percent':
+            return f"{value:,.2f}%"
+        if kind == 'datetime':
+            return value.strftime('%Y-%m-%d %H:%M:%S')
+        return value
+
+    def _format_csv_summary_value(self, value):
+        return f"{value:,.2f}" if isinstance(value, float) else value
+
+    def _iter_csv_chunks(self):
+        """Yield the CSV file as encoded chunks while the rows are being fetched"""
+        self.ensure_one()
+        with self._report_run('export_csv') as trace:
+            started = time.perf_counter()
+            query_before = trace.phases['query']
+            # Time spent suspended while the client consumes a chunk
+            waiting = 0.0
+
+            columns = self._get_export_columns()
+            kinds = [column[1] for column in columns]
+
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow([column[0] for column in columns])
+
+            for row in self._iter_export_rows():
+                writer.writerow([self._format_csv_value(value, kind) for value, kind in zip(row, kinds)])
+                if buffer.tell() >= self._export_chunk_size:
+                    paused = time.perf_counter()
+                    yield buffer.getvalue().encode('utf-8')
+                    waiting += time.perf_counter() - paused
+                    buffer.seek(0)
+                    buffer.truncate()
+
+            summary_rows = self._get_export_summary_rows()
+            if summary_rows:
+                writer.writerow([])
+                for summary_row in summary_rows:
+                    writer.writerow([self._format_csv_summary_value(value) for value in summary_row])
+
+            trace.add_phase('render', time.perf_counter() - started - waiting - (trace.phases['query'] - query_before))
+            yield buffer.getvalue().encode('utf-8')
+            buffer.close()
+
+    def _add_xlsx_sheet(self, workbook, columns, header_format):
+        index = len(workbook.worksheets()) + 1
+        worksheet = workbook.add_worksheet(_("Report") if index == 1 else _("Report (%s)", index))
+        # Column setup must happen before any row is written in constant memory mode
+        for col, (label, kind, *_dimension) in enumerate(columns):
+            worksheet.set_column(col, col, 20 if kind == 'datetime' else max(12, min(len(label) + 2, 40)))
+        worksheet.write_row(0, 0, [column[0] for column in columns], header_format)
+        worksheet.freeze_panes(1, 0)
+        return worksheet
+
+    def _write_xlsx_cell(self, worksheet, row, col, value, kind, cell_format):
+        if kind == 'char':
+            if value is not None and value is not False:
+                worksheet.write_string(row, col, str(value))
+        elif kind == 'datetime':
+            if value:
+                worksheet.write_datetime(row, col, value, cell_format)
+        else:
+            worksheet.write_number(row, col, value or 0, cell_format)
+
+    def _iter_xlsx_chunks(self):
+        """Yield the XLSX workbook as chunks.
+
+        The workbook is written in xlsxwriter's constant memory mode: each row
+        goes straight to a temporary file as it is read from the server-side
+        cursor, so only the current row is held in memory. Rows beyond the
+        XLSX sheet limit continue on a new worksheet.
+        """
+        self.ensure_one()
+        self._check_xlsx_available()
+        with tempfile.TemporaryFile() as output:
+            with self._report_run('export_xlsx') as trace:
+                started = time.perf_counter()
+                query_before = trace.phases['query']
+
+                columns = self._get_export_columns()
+                kinds = [column[1] for column in columns]
+
+                workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+                header_format = workbook.add_format({'bold': True, 'bg_color': '#D9E1F2', 'border': 1})
+                bold_format = workbook.add_format({'bold': True})
+                formats = {kind: workbook.add_format({'num_format': num_format})
+                           for kind, num_format in XLSX_NUMBER_FORMATS.items()}
+                cell_formats = [formats.get(kind) for kind in kinds]
+
+                worksheet = self._add_xlsx_sheet(workbook, columns, header_format)
+                row_index = 1
+                for row in self._iter_export_rows():
+                    if row_index == XLSX_MAX_ROWS:
+                        worksheet = self._add_xlsx_sheet(workbook, columns, header_format)
+                        row_index = 1
+                    for col, value in enumerate(row):
+                        self._write_xlsx_cell(worksheet, row_index, col, value, kinds[col], cell_formats[col])
+                    row_index += 1
+
+                summary_rows = self._get_export_summary_rows()
+                if summary_rows:
+                    if row_index + len(summary_rows) + 1 > XLSX_MAX_ROWS:
+                        worksheet = self._add_xlsx_sheet(workbook, columns, header_format)
+                        row_index = 1
+                    row_index += 1
+                    for summary_row in summary_rows:
+                        for col, value in enumerate(summary_row):
+                            if isinstance(value, float):
+                                worksheet.write_number(row_index, col, value, formats['float'])
+                            elif isinstance(value, int):
+                                worksheet.write_number(row_index, col, value)
+                            elif value:
+                                worksheet.write_string(row_index, col, str(value), bold_format if col == 0 else None)
+                        row_index += 1
+
+                workbook.close()
+                trace.add_phase('render', time.perf_counter() - started - (trace.phases['query'] - query_before))
+
+            output.seek(0)
+            while True:
+                chunk = output.read(self._export_chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    def action_export_csv(self):
+        """Stream the report to CSV through the export route"""
+        self.ensure_one()
+        self._check_export_ready()
+        return {
+            'type': 'ir.actions.act_url',
+            'url': f'/pos_report/{self._export_route}/{self.id}/csv',
+            'target': 'self',
+        }
+
+    def action_export_xlsx(self):
+        """Stream the report to XLSX through the export route"""
+        self.ensure_one()
+        self._check_export_ready()
+        self._check_xlsx_available()
+        return {
+            'type': 'ir.actions.act_url',
+            'url': f'/pos_report/{self._export_route}/{self.id}/xlsx',
+            'target': 'self',
+        }
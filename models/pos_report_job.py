@@ -0,0 +1,168 @@
+import logging
+import traceback
+from datetime import timedelta
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+from odoo.modules.registry import Registry
+
+_logger = logging.getLogger(__name__)
+
+
+class PosReportJobMixin(models.AbstractModel):
+    _name = "pos.report.job.mixin"
+    _description = "POS Report Background Generation"
+
+    # XML id (within this module) of the cron processing this model's queue
+    _job_cron_xmlid = None
+    # Reports picked up per cron run
+    _job_batch_size = 5
+
+    job_state = fields.Selection([
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ], string="Job Status", readonly=True, copy=False)
+    job_message = fields.Char(string="Job Message", readonly=True, copy=False)
+    job_phase = fields.Char(string="Current Phase", compute="_compute_job_progress")
+    job_rows = fields.Integer(string="Rows Processed", compute="_compute_job_progress")
+    job_error = fields.Text(string="Job Error", readonly=True, copy=False)
+    job_user_id = fields.Many2one("res.users", string="Requested By", readonly=True, copy=False)
+
+    def action_queue_report(self):
+        """Queue the report to be generated by the background worker"""
+        self.ensure_one()
+        if self.job_state in ('queued', 'running'):
+            raise UserError(_("This report is already being generated."))
+        self.env['pos.report.job.progress'].sudo().search([
+            ('res_model', '=', self._name), ('res_id', '=', self.id),
+        ]).unlink()
+        self.write({
+            'job_state': 'queued',
+            'job_message': _('Waiting for a worker'),
+            'job_error': False,
+            'job_user_id': self.env.uid,
+        })
+        self.env.ref(f'{self._module}.{self._job_cron_xmlid}')._trigger()
+        return self._reload_action()
+
+    def _compute_job_progress(self):
+        progress = {
+            line.res_id: line
+            for line in self.env['pos.report.job.progress'].sudo().search([
+                ('res_model', '=', self._name), ('res_id', 'in', self.ids),
+            ])
+        }
+        for report in self:
+            line = progress.get(report.id)
+            running = report.job_state == 'running' and line
+            report.job_phase = line.phase if running else report.job_message
+            report.job_rows = line.rows if line else 0
+
+    def _reload_action(self):
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': self._name,
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'current',
+            'views': [(False, 'form')],
+        }
+
+    def _job_notify(self, message, notification_type='info', env=None):
+        env = env or self.env
+        partner = self.job_user_id.partner_id
+        if partner:
+            env['bus.bus']._sendone(partner, 'simple_notification', {
+                'title': self.display_name,
+                'message': message,
+                'type': notification_type,
+                'sticky': False,
+            })
+
+    def _job_progress(self, phase, rows=None):
+        """Publish the current phase from inside a background generation.
+
+        Committed through a separate cursor so the form shows it before the job
+        commits. It goes to pos.report.job.progress, never to the report row:
+        the job transaction writes that row later and would otherwise fail to
+        serialize against this update.
+        """
+        if not self.env.context.get('pos_report_job'):
+            return
+        with Registry(self.env.cr.dbname).cursor() as cr:
+            cr.execute("""
+                INSERT INTO pos_report_job_progress (res_model, res_id, phase, rows, updated_at)
+                VALUES (%s, %s, %s, COALESCE(%s, 0), now() at time zone 'UTC')
+                ON CONFLICT (res_model, res_id) DO UPDATE
+                SET phase = EXCLUDED.phase,
+                    rows = COALESCE(%s, pos_report_job_progress.rows),
+                    updated_at = EXCLUDED.updated_at
+            """, (self._name, self.id, phase, rows, rows))
+            self._job_notify(phase, env=self.env(cr=cr))
+
+    @api.model
+    def _cron_process_report_queue(self):
+        """Generate the queued reports, one transaction per report"""
+        for _i in range(self._job_batch_size):
+            self.env.cr.execute(f"""
+                SELECT id FROM {self._table}
+                WHERE job_state = 'queued'
+                ORDER BY write_date, id
+                LIMIT 1
+                FOR UPDATE SKIP LOCKED
+            """)
+            row = self.env.cr.fetchone()
+            if not row:
+                break
+            report = self.browse(row[0])
+            report.write({'job_state': 'running', 'job_message': _('Starting')})
+            self.env.cr.commit()
+            report._run_report_job()
+
+    def _run_report_job(self):
+        self.ensure_one()
+        user = self.job_user_id or self.env.user
+        try:
+            result = self.with_user(user).with_context(pos_report_job=True).action_generate_report()
+            phase = _('Finished')
+            if result and result.get('tag') == 'display_notification':
+                phase = result['params']['message']
+            self.write({'job_state': 'done', 'job_message': phase})
+            self._job_notify(phase, 'success')
+            self.env.cr.commit()
+        except Exception as e:
+            self.env.cr.rollback()
+            _logger.exception("Background generation of %s failed", self)
+            self.write({
+                'job_state': 'failed',
+                'job_message': _('Failed'),
+                'job_error': ''.join(traceback.format_exception_only(type(e), e)),
+            })
+            self._job_notify(_('Report generation failed.'), 'danger')
+            self.env.cr.commit()
+
+
+class PosReportJobProgress(models.Model):
+    """Progress of the running background generations, one row per report.
+
+    Only written by the side cursor of ``_job_progress``, so the job
+    transaction never touches a row updated after its snapshot was taken.
+    """
+    _name = "pos.report.job.progress"
+    _description = "POS Report Background Generation Progress"
+    _log_access = False
+
+    res_model = fields.Char(string="Report Model", required=True, readonly=True)
+    res_id = fields.Integer(string="Report ID", required=True, readonly=True)
+    phase = fields.Char(string="Phase", readonly=True)
+    rows = fields.Integer(string="Rows Processed", readonly=True)
+    updated_at = fields.Datetime(string="Updated", readonly=True)
+
+    _sql_constraints = [
+        ('report_uniq', 'unique(res_model, res_id)', 'A report has only one progress row.'),
+    ]
+
+    @api.autovacuum
+    def _gc_old_progress(self):
+        self.search([('updated_at', '<', fields.Datetime.now() - timedelta(days=7))]).unlink()
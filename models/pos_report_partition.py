@@ -0,0 +1,80 @@
+import os
+import heapq
+import itertools
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from odoo import models
+from odoo.modules.registry import Registry
+
+
+class PosReportPartitionMixin(models.AbstractModel):
+    _name = "pos.report.partition.mixin"
+    _inherit = "pos.report.trace.mixin"
+    _description = "POS Report Partitioned Generation"
+
+    def _get_partition_workers(self):
+        """Size of the thread pool running the partitions, 1 disables partitioning"""
+        default = min(4, os.cpu_count() or 1)
+        return max(1, int(self.env['ir.config_parameter'].sudo().get_param('myreport.partition_workers', default)))
+
+    def _get_report_partitions(self):
+        """Return the ids of the branches to split the report by, in branch name order.
+
+        Without a branch filter a last ``None`` partition holds the orders
+        without branch. Returns an empty list when the report should run as a
+        single query: only one partition is involved or partitioning is
+        disabled (``myreport.partition_workers``).
+        """
+        # Test cursors share one transaction, partitions need their own
+        if self._get_partition_workers() < 2 or self.env.registry.in_test_mode():
+            return []
+        domain = [('id', 'in', self.branch_ids.ids)] if self.branch_ids else []
+        partitions = self.env['pos.config'].sudo().with_context(active_test=False).search(domain, order='name, id').ids
+        if not self.branch_ids:
+            partitions.append(None)
+        return partitions if len(partitions) > 1 else []
+
+    def _get_partition_clause(self, partition):
+        """Return the (clause, params) restricting the report query to ``partition``"""
+        if partition is None:
+            return " AND po.config_id IS NULL", ()
+        return " AND po.config_id = %s", (partition,)
+
+    def _get_partition_query(self, where_clause, params, partition):
+        """Return the (query, params) of the report lines of ``partition``, from ``_get_lines_query``"""
+        clause, partition_params = self._get_partition_clause(partition)
+        return self._get_lines_query(where_clause + clause), tuple(params) + partition_params
+
+    def _fetch_partition(self, dbname, snapshot, query, params):
+        with Registry(dbname).cursor() as cr:
+            # Read the exact data the requesting transaction sees
+            cr.execute("SET TRANSACTION SNAPSHOT %s", (snapshot,))
+            report = self.with_env(self.env(cr=cr))
+            return report._report_execute(query, params, cr=cr).dictfetchall()
+
+    def _fetch_partitioned(self, partitions, build_query, key=None, reverse=False):
+        """Run one query per partition concurrently and merge the results.
+
+        ``build_query(partition)`` returns the (query, params) of a partition; each
+        runs on its own cursor sharing the snapshot of the current transaction.
+        Partial results already sorted by ``key`` are merged with a heap, without
+        ``key`` they are concatenated in partition order.
+        """
+        self.env.flush_all()
+        self.env.cr.execute("SELECT pg_export_snapshot()")
+        snapshot = self.env.cr.fetchone()[0]
+        dbname = self.env.cr.dbname
+
+        workers = min(self._get_partition_workers(), len(partitions))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='pos_report') as executor:
+            # Each task runs in a copy of the current context so its queries are traced on this run
+            futures = [
+                executor.submit(contextvars.copy_context().run, self._fetch_partition, dbname, snapshot,
+                                *build_query(partition))
+                for partition in partitions
+            ]
+            partials = [future.result() for future in futures]
+
+        if key is None:
+            return list(itertools.chain.from_iterable(partials))
+        return list(heapq.merge(*partials, key=key, reverse=reverse))
@@ -0,0 +1,141 @@
+import json
+import hashlib
+import logging
+from datetime import timedelta
+from odoo import models, fields, api
+
+
+_logger = logging.getLogger(__name__)
+
+
+class PosReportPrecomputeMixin(models.AbstractModel):
+    """Nightly generation of the standard reports of the previous day.
+
+    A cron generates yesterday's report of every target (branch or company)
+    off-peak and flags it ``precomputed``. Reports requested with the same
+    fingerprint then reuse its result instead of querying the POS orders, as
+    long as no order of the period changed since it was generated.
+
+    Reports implement ``_get_precompute_targets`` and
+    ``_get_precompute_fingerprint``; the defaults precompute nothing.
+    """
+    _name = "pos.report.precompute.mixin"
+    _inherit = "pos.report.retention.mixin"
+    _description = "POS Report Nightly Precomputation"
+
+    # Orders written shortly before the precomputation may have been committed after it
+    _precompute_overlap = timedelta(minutes=5)
+    # Report fields copied from the precomputed report along with its lines
+    _precompute_copy_fields = ()
+
+    precomputed = fields.Boolean(string="Precomputed", readonly=True, copy=False,
+                                 help="Generated overnight; matching reports reuse its result.")
+    precompute_fingerprint = fields.Char(readonly=True, copy=False, index=True)
+
+    @api.model
+    def _get_retention_clause(self):
+        # Precomputed reports are replaced by the next night's run
+        return f"{super()._get_retention_clause()} AND precomputed IS NOT TRUE"
+
+    @api.model
+    def _hash_filters(self, filters):
+        return hashlib.sha256(json.dumps(filters, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _get_precompute_fingerprint(self):
+        """Canonical hash of everything that determines the report result, False when not reusable"""
+        return False
+
+    @api.model
+    def _get_precompute_targets(self, configs):
+        """Return [(company, vals)] of the reports to precompute for the given branches.
+
+        ``vals`` are evaluated in the timezone and language of ``company``, so
+        ``fields.Date.context_today`` is the branch's local today. No targets by default.
+        """
+        return []
+
+    @api.model
+    def _get_precompute_env(self, company):
+        """Report model in the company, timezone and language the nightly reports are made in"""
+        partner = company.partner_id
+        return self.with_company(company).with_context(tz=partner.tz or 'UTC', lang=partner.lang or 'en_US')
+
+    @api.model
+    def _cron_precompute_reports(self):
+        """Generate yesterday's reports of every branch, one transaction per report.
+
+        Yesterday is taken in each company's timezone, while the cron runs at a
+        single UTC time: a company whose local midnight has not passed yet gets
+        the day before yesterday. Schedule the cron after midnight in the
+        westernmost company timezone.
+        """
+        self.sudo().search([('precomputed', '=', True)]).unlink()
+        self.env.cr.commit()
+
+        configs = self.env['pos.config'].sudo().search([])
+        done = failed = 0
+        for company, vals in self._get_precompute_targets(configs):
+            try:
+                report = self._get_precompute_env(company).create(dict(vals, precomputed=True))
+                report.action_generate_report()
+                report.precompute_fingerprint = report._get_precompute_fingerprint()
+                self.env.cr.commit()
+                done += 1
+            except Exception:
+                self.env.cr.rollback()
+                failed += 1
+                _logger.exception("Could not precompute %s %s", self._name, vals)
+        _logger.info("Precomputed %s %s reports (%s failed)", done, self._name, failed)
+        return {'done': done, 'failed': failed}
+
+    def _has_changed_orders(self, since):
+        """Whether an order of the report period was created or modified since ``since``"""
+        self.env.flush_all()
+        lower, upper = self._get_date_range_bounds(self.start_date, self.end_date)
+        query = """
+            SELECT 1 FROM pos_order po
+            WHERE po.date_order >= %(lower)s AND po.date_order < %(upper)s
+                AND (po.write_date >= %(since)s
+                     OR EXISTS (SELECT 1 FROM pos_order_line pol WHERE pol.order_id = po.id AND pol.write_date >= %(since)s))
+            LIMIT 1
+        """
+        return bool(self._report_execute(query, {'lower': lower, 'upper': upper, 'since': since}).fetchone())
+
+    def _find_precomputed(self):
+        """Return the up-to-date precomputed report with the same result as this one, if any"""
+        self.ensure_one()
+        fingerprint = self._get_precompute_fingerprint()
+        if self.precomputed or not fingerprint:
+            return self.browse()
+        source = self.sudo().search([
+            ('precomputed', '=', True),
+            ('precompute_fingerprint', '=', fingerprint),
+            ('report_generated', '!=', False),
+        ], order='report_generated desc', limit=1)
+        if not source or self._has_changed_orders(source.report_generated - self._precompute_overlap):
+            return self.browse()
+        return source
+
+    def _load_precomputed(self, source):
+        """Fill the report with the lines and totals of the precomputed report ``source``"""
+        self.ensure_one()
+        self.env.flush_all()
+        with self._report_phase('persist'):
+            for model_name in self._retention_line_models:
+                Line = self.env[model_name]
+                columns = ', '.join(
+                    f'"{name}"' for name, field in Line._fields.items()
+                    if field.store and field.column_type and name not in ('id', 'report_id', *models.LOG_ACCESS_COLUMNS)
+                )
+                self._report_execute(f"""
+                    INSERT INTO {Line._table} (report_id, {columns}, create_uid, create_date, write_uid, write_date)
+                    SELECT %(report_id)s, {columns}, %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+                    FROM {Line._table}
+                    WHERE report_id = %(source_id)s
+                    ORDER BY id
+                """, {'report_id': self.id, 'source_id': source.id, 'uid': self.env.uid})
+            self.env.invalidate_all()
+            # Kept as generated at the precomputation, so a refresh picks up later orders
+            self.write(dict({name: source[name] for name in self._precompute_copy_fields},
+                            report_generated=source.report_generated))
+        return self._reload_action()
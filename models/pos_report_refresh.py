@@ -0,0 +1,113 @@
+from datetime import timedelta
+from odoo import models, fields
+from .pos_report_run import report_run
+
+
+class PosReportRefreshMixin(models.AbstractModel):
+    """Incremental refresh of a generated report.
+
+    Reports set ``_refresh_line_model`` and implement ``_refresh_orders``;
+    without a line model every refresh regenerates the report.
+    """
+    _name = "pos.report.refresh.mixin"
+    _inherit = "pos.report.trace.mixin"
+    _description = "POS Report Incremental Refresh"
+
+    # Orders written shortly before the last run may have been committed after it
+    _refresh_overlap = timedelta(minutes=5)
+    # Model of the report lines; they must have ``report_id`` and ``order_id``
+    _refresh_line_model = None
+    # {report total field: line field} adjusted by difference on refresh
+    _refresh_total_fields = {}
+
+    def _can_refresh(self):
+        """Whether the stored lines can be patched instead of regenerated"""
+        self.ensure_one()
+        if not self._refresh_line_model:
+            return False
+        if self.state != 'generated' or not self.report_generated or self.job_state in ('queued', 'running'):
+            return False
+        # Lines of deleted orders, or stored before lines kept their order, need a full run
+        Line = self.env[self._refresh_line_model]
+        Line.flush_model(['report_id', 'order_id'])
+        self.env.cr.execute(f"SELECT 1 FROM {Line._table} WHERE order_id IS NULL AND report_id = %s LIMIT 1",
+                            (self.id,))
+        return not self.env.cr.fetchone()
+
+    def _get_changed_order_ids(self, since):
+        """Ids of the report's orders created or modified since ``since``, directly or through their lines.
+
+        Only orders within the report period and branches are looked up, plus
+        the orders already in the report, in case they were moved out of it.
+        """
+        self.env.flush_all()
+        lower, upper = self._get_date_range_bounds(self.start_date, self.end_date)
+        params = {'since': since, 'lower': lower, 'upper': upper, 'report_id': self.id}
+        scope = "po.date_order >= %(lower)s AND po.date_order < %(upper)s"
+        if 'branch_ids' in self._fields and self.branch_ids:
+            scope += " AND po.config_id IN %(config_ids)s"
+            params['config_ids'] = tuple(self.branch_ids.ids)
+        query = f"""
+            SELECT po.id FROM pos_order po
+            WHERE {scope} AND po.write_date >= %(since)s
+            UNION
+            SELECT pol.order_id FROM pos_order_line pol
+            JOIN pos_order po ON pol.order_id = po.id
+            WHERE {scope} AND pol.write_date >= %(since)s
+            UNION
+            SELECT line.order_id FROM {self.env[self._refresh_line_model]._table} line
+            JOIN pos_order po ON line.order_id = po.id
+            WHERE line.report_id = %(report_id)s AND po.write_date >= %(since)s
+        """
+        return [row[0] for row in self._report_execute(query, params).fetchall()]
+
+    def _get_refresh_lines(self, order_ids):
+        return self.env[self._refresh_line_model].search([('report_id', '=', self.id), ('order_id', 'in', order_ids)])
+
+    def _get_present_values(self, field_name, values):
+        """Return the subset of ``values`` found in ``field_name`` of the report lines"""
+        values = tuple(value for value in values if value)
+        if not values:
+            return set()
+        Line = self.env[self._refresh_line_model]
+        Line.flush_model([field_name])
+        self.env.cr.execute(
+            f"SELECT DISTINCT {field_name} FROM {Line._table} WHERE report_id = %s AND {field_name} IN %s",
+            (self.id, values),
+        )
+        return {row[0] for row in self.env.cr.fetchall()}
+
+    def _get_delta_totals(self, old_lines, new_vals):
+        """Stored totals adjusted by the difference between the replaced and the new lines"""
+        return {
+            total_field: self[total_field]
+            + sum(vals[line_field] for vals in new_vals)
+            - sum(old_lines.mapped(line_field))
+            for total_field, line_field in self._refresh_total_fields.items()
+        }
+
+    def _refresh_orders(self, order_ids):
+        """Replace the lines of ``order_ids`` and adjust the totals.
+
+        The default generates the whole report again.
+        """
+        self.action_generate_report()
+
+    @report_run('refresh')
+    def action_refresh_report(self):
+        """Bring a generated report up to date with the orders changed since it was generated.
+
+        Only the lines of those orders are read again and replaced; the totals are
+        adjusted by difference. Reports that cannot be patched are regenerated.
+        """
+        self.ensure_one()
+        if not self._can_refresh():
+            return self.action_generate_report()
+
+        refreshed_at = fields.Datetime.now()
+        with self._report_phase('query'):
+            order_ids = self._get_changed_order_ids(self.report_generated - self._refresh_overlap)
+        if order_ids:
+            self._refresh_orders(order_ids)
+        self.write({'report_generated': refreshed_at})
+        return self._reload_action()
@@ -0,0 +1,89 @@
+import logging
+from datetime import timedelta
+from odoo import models, fields, api, tools
+
+_logger = logging.getLogger(__name__)
+
+
+class PosReportRetentionMixin(models.AbstractModel):
+    _name = "pos.report.retention.mixin"
+    _description = "POS Report Retention"
+
+    # Models holding the report's lines (through report_id), measured on purge
+    _retention_line_models = ()
+    # Reports deleted per transaction by the purge cron
+    _purge_batch_size = 100
+
+    pinned = fields.Boolean(string="Pinned", copy=False,
+                            help="Pinned reports are kept by the retention policy.")
+
+    @api.model
+    def _get_retention_param(self, key, default):
+        return int(self.env['ir.config_parameter'].sudo().get_param(f'myreport.report_retention_{key}', default))
+
+    @api.model
+    def _get_retention_clause(self):
+        """SQL condition on the report rows the retention policy may delete"""
+        return "pinned IS NOT TRUE"
+
+    @api.model
+    def _get_expired_report_ids(self, limit):
+        """Ids of unpinned reports older than the retention period or beyond the per-user limit.
+
+        ``myreport.report_retention_days`` (default 90) and
+        ``myreport.report_retention_max_per_user`` (default 20) set the policy,
+        0 disables the corresponding rule. Reports being generated are skipped.
+        """
+        days = self._get_retention_param('days', 90)
+        max_per_user = self._get_retention_param('max_per_user', 20)
+        if not days and not max_per_user:
+            return []
+        cutoff = fields.Datetime.now() - timedelta(days=days)
+        self.env.cr.execute(f"""
+            SELECT id FROM (
+                SELECT id, create_date, job_state,
+                       ROW_NUMBER() OVER (PARTITION BY create_uid ORDER BY create_date DESC, id DESC) as user_rank
+                FROM {self._table}
+                WHERE {self._get_retention_clause()}
+            ) report
+            WHERE (job_state IS NULL OR job_state NOT IN ('queued', 'running'))
+              AND ((%(days)s > 0 AND create_date < %(cutoff)s)
+                   OR (%(max_per_user)s > 0 AND user_rank > %(max_per_user)s))
+            ORDER BY id
+            LIMIT %(limit)s
+        """, {'days': days, 'cutoff': cutoff, 'max_per_user': max_per_user, 'limit': limit})
+        return [row[0] for row in self.env.cr.fetchall()]
+
+    @api.model
+    def _get_report_storage_size(self, report_ids):
+        """Bytes held by the given reports: their rows, their lines and their attachments"""
+        report_ids = tuple(report_ids)
+        size = 0
+        for table, column in [(self._table, 'id')] + [
+                (self.env[model]._table, 'report_id') for model in self._retention_line_models]:
+            self.env.cr.execute(f"SELECT COALESCE(SUM(pg_column_size(t.*)), 0) FROM {table} t WHERE {column} IN %s",
+                                (report_ids,))
+            size += self.env.cr.fetchone()[0]
+        self.env.cr.execute("""
+            SELECT COALESCE(SUM(file_size), 0) FROM ir_attachment
+            WHERE res_model = %s AND res_id IN %s
+        """, (self._name, report_ids))
+        return size + self.env.cr.fetchone()[0]
+
+    @api.model
+    def _cron_purge_expired_reports(self):
+        """Delete the expired reports in batches, one short transaction per batch"""
+        purged = reclaimed = 0
+        while True:
+            report_ids = self._get_expired_report_ids(self._purge_batch_size)
+            if not report_ids:
+                break
+            self.env.flush_all()
+            reclaimed += self._get_report_storage_size(report_ids)
+            # Lines go with the reports through ON DELETE CASCADE
+            self.sudo().browse(report_ids).unlink()
+            purged += len(report_ids)
+            self.env.cr.commit()
+        if purged:
+            _logger.info("Purged %s %s records, reclaimed about %s", purged, self._name, tools.human_size(reclaimed))
+        return {'purged': purged, 'reclaimed_bytes': reclaimed}
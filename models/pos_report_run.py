@@ -0,0 +1,241 @@
+import re
+import time
+import uuid
+import hashlib
+import logging
+import functools
+from datetime import timedelta
+from contextlib import contextmanager
+from contextvars import ContextVar
+from odoo import models, fields, api, SUPERUSER_ID
+from odoo.modules.registry import Registry
+
+_logger = logging.getLogger(__name__)
+
+# Trace of the report run in progress in this thread, if any
+_current_run = ContextVar('pos_report_run', default=None)
+
+REPORT_PHASES = ('query', 'enrich', 'persist', 'render')
+
+
+class _RunTrace:
+    """In-memory collector for one report run, flushed to pos.report.run at the end"""
+
+    def __init__(self, report, action, explain):
+        self.res_model = report._name
+        self.res_id = report.id
+        self.name = report.display_name
+        self.action = action
+        self.explain = explain
+        self.started = time.perf_counter()
+        self.started_at = fields.Datetime.now()
+        self.phases = dict.fromkeys(REPORT_PHASES, 0.0)
+        self.queries = []
+
+    def add_phase(self, phase, elapsed):
+        self.phases[phase] += elapsed
+
+
+def report_run(action):
+    """Decorator logging the decorated report method as one pos.report.run"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self._report_run(action):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class PosReportTraceMixin(models.AbstractModel):
+    _name = "pos.report.trace.mixin"
+    _description = "POS Report SQL Instrumentation"
+
+    def _report_explain_enabled(self):
+        return self.env.context.get('pos_report_explain') or self.env['ir.config_parameter'].sudo().get_param(
+            'myreport.sql_explain') in ('1', 'True', 'true')
+
+    @contextmanager
+    def _report_run(self, action):
+        """Trace everything executed inside the block as one run of ``action``"""
+        if _current_run.get() is not None:
+            # Nested call, the outer run owns the trace
+            yield _current_run.get()
+            return
+
+        self.ensure_one()
+        trace = _RunTrace(self, action, self._report_explain_enabled())
+        token = _current_run.set(trace)
+        state = 'failed'
+        try:
+            yield trace
+            state = 'done'
+        finally:
+            _current_run.reset(token)
+            self._save_report_run(trace, state)
+
+    @contextmanager
+    def _report_phase(self, phase):
+        """Account the time spent inside the block to ``phase`` of the current run"""
+        trace = _current_run.get()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            if trace is not None:
+                trace.add_phase(phase, time.perf_counter() - started)
+
+    def _report_phase_add(self, phase, elapsed):
+        trace = _current_run.get()
+        if trace is not None:
+            trace.add_phase(phase, elapsed)
+
+    def _report_execute(self, query, params=None, cr=None):
+        """Execute a report statement, recording it on the current run.
+
+        Records the statement fingerprint, duration and row count, plus the
+        ``EXPLAIN (ANALYZE, BUFFERS)`` plan of SELECTs when enabled. Returns the
+        cursor so the caller can fetch from it.
+        """
+        cr = cr if cr is not None else self.env.cr
+        trace = _current_run.get()
+        if trace is None:
+            cr.execute(query, params)
+            return cr
+
+        statement = re.sub(r'\s+', ' ', query).strip()
+        explain = None
+        if trace.explain and re.match(r'SELECT\b', statement, re.IGNORECASE):
+            # Run before the statement itself so the caller's result set is kept
+            explain = self._report_explain(cr, query, params)
+
+        started = time.perf_counter()
+        cr.execute(query, params)
+        elapsed = time.perf_counter() - started
+
+        trace.queries.append({
+            'fingerprint': hashlib.sha1(statement.encode()).hexdigest()[:16],
+            'statement': statement[:2000],
+            'duration_ms': elapsed * 1000,
+            'rows': cr.rowcount,
+            'explain': explain,
+        })
+        return cr
+
+    def _report_explain(self, cr, query, params):
+        """Return the ``EXPLAIN (ANALYZE, BUFFERS)`` plan of ``query`` in the transaction of ``cr``.
+
+        ANALYZE executes the statement, so it runs in a savepoint rolled back
+        right after. A plain cursor of the same connection is used, as ``cr``
+        may be a named cursor that can only execute once.
+        """
+        connection = getattr(cr, '_cnx', None) or cr.connection
+        with connection.cursor() as explain_cr:
+            explain_cr.execute("SAVEPOINT pos_report_explain")
+            try:
+                explain_cr.execute(f"EXPLAIN (ANALYZE, BUFFERS) {query}", params)
+                return '\n'.join(row[0] for row in explain_cr.fetchall())
+            finally:
+                explain_cr.execute("ROLLBACK TO SAVEPOINT pos_report_explain")
+                explain_cr.execute("RELEASE SAVEPOINT pos_report_explain")
+
+    def _report_iter_rows(self, query, params=None, batch_size=2000, as_dict=False):
+        """Yield the rows of a report query from a server-side named cursor.
+
+        Rows are pulled ``batch_size`` at a time so arbitrarily large results
+        never sit in memory; ``as_dict`` yields dicts keyed by column name.
+        """
+        self.env.flush_all()
+        cursor_name = f"pos_report_{uuid.uuid4().hex}"
+        with self.env.cr._cnx.cursor(name=cursor_name) as cursor:
+            cursor.itersize = batch_size
+            with self._report_phase('query'):
+                self._report_execute(query, params, cr=cursor)
+            names = None
+            while True:
+                started = time.perf_counter()
+                rows = cursor.fetchmany(batch_size)
+                self._report_phase_add('query', time.perf_counter() - started)
+                if not rows:
+                    break
+                if not as_dict:
+                    yield from rows
+                    continue
+                names = names or [column[0] for column in cursor.description]
+                for row in rows:
+                    yield dict(zip(names, row))
+
+    def _save_report_run(self, trace, state):
+        """Write the run log through its own cursor so failed runs are kept too"""
+        total = time.perf_counter() - trace.started
+        vals = {
+            'name': trace.name,
+            'res_model': trace.res_model,
+            'res_id': trace.res_id,
+            'action': trace.action,
+            'state': state,
+            'user_id': self.env.uid,
+            'started_at': trace.started_at,
+            'duration_ms': total * 1000,
+            'query_count': len(trace.queries),
+            'rows_fetched': sum(max(query['rows'], 0) for query in trace.queries),
+            **{f'{phase}_ms': elapsed * 1000 for phase, elapsed in trace.phases.items()},
+            'query_ids': [(0, 0, dict(query, sequence=index)) for index, query in enumerate(trace.queries)],
+        }
+        try:
+            with Registry(self.env.cr.dbname).cursor() as cr:
+                self.env(cr=cr, user=SUPERUSER_ID)['pos.report.run'].create(vals)
+        except Exception:
+            _logger.exception("Could not save the report run log of %s", trace.name)
+
+
+class PosReportRun(models.Model):
+    _name = "pos.report.run"
+    _description = "POS Report Run Log"
+    _order = "started_at desc, id desc"
+
+    name = fields.Char(string="Report", readonly=True)
+    res_model = fields.Char(string="Report Model", readonly=True, index=True)
+    res_id = fields.Integer(string="Report ID", readonly=True)
+    action = fields.Char(string="Action", readonly=True)
+    state = fields.Selection([('done', 'Done'), ('failed', 'Failed')], string="Status", readonly=True)
+    user_id = fields.Many2one("res.users", string="User", readonly=True)
+    started_at = fields.Datetime(string="Started", readonly=True)
+    duration_ms = fields.Float(string="Total (ms)", readonly=True)
+    query_ms = fields.Float(string="Query (ms)", readonly=True)
+    enrich_ms = fields.Float(string="Enrich (ms)", readonly=True)
+    persist_ms = fields.Float(string="Persist (ms)", readonly=True)
+    render_ms = fields.Float(string="Render (ms)", readonly=True)
+    query_count = fields.Integer(string="Queries", readonly=True)
+    rows_fetched = fields.Integer(string="Rows", readonly=True)
+    query_ids = fields.One2many("pos.report.run.query", "run_id", string="Queries", readonly=True)
+
+    def action_open_report(self):
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': self.res_model,
+            'res_id': self.res_id,
+            'view_mode': 'form',
+            'target': 'current',
+            'views': [(False, 'form')],
+        }
+
+    @api.autovacuum
+    def _gc_old_runs(self):
+        days = int(self.env['ir.config_parameter'].sudo().get_param('myreport.report_run_retention_days', 30))
+        self.search([('started_at', '<', fields.Datetime.now() - timedelta(days=days))]).unlink()
+
+
+class PosReportRunQuery(models.Model):
+    _name = "pos.report.run.query"
+    _description = "POS Report Run Query"
+    _order = "run_id, sequence"
+
+    run_id = fields.Many2one("pos.report.run", string="Run", required=True, ondelete="cascade")
+    sequence = fields.Integer(readonly=True)
+    fingerprint = fields.Char(string="Fingerprint", readonly=True, index=True)
+    statement = fields.Text(string="Statement", readonly=True)
+    duration_ms = fields.Float(string="Duration (ms)", readonly=True)
+    rows = fields.Integer(string="Rows", readonly=True)
+    explain = fields.Text(string="Plan", readonly=True)
@@ -0,0 +1,78 @@
+import io
+import tempfile
+from odoo import models, fields
+from ..tools.snapshot import SnapshotReader, SnapshotWriter
+
+
+class PosReportSnapshotMixin(models.AbstractModel):
+    _name = "pos.report.snapshot.mixin"
+    _inherit = "pos.report.trace.mixin"
+    _description = "POS Report Compressed Snapshot"
+
+    # Columns stored in the snapshot, in order
+    _snapshot_columns = ()
+    # Rows per compressed page
+    _snapshot_page_size = 1000
+
+    snapshot_id = fields.Many2one("ir.attachment", string="Snapshot", readonly=True, copy=False)
+    snapshot_rows = fields.Integer(string="Snapshot Rows", readonly=True, copy=False)
+    snapshot_size = fields.Integer(string="Snapshot Size (bytes)", related="snapshot_id.file_size")
+
+    def _write_snapshot(self, rows):
+        """Store ``rows`` as the snapshot of the report, replacing the previous one.
+
+        ``rows`` may be any iterable (dicts or sequences in column order); pages
+        are compressed as they fill up so only the compressed file is buffered.
+        """
+        self.ensure_one()
+        with self._report_phase('persist'):
+            self._drop_snapshot()
+        with tempfile.TemporaryFile() as tmp:
+            writer = SnapshotWriter(tmp, self._snapshot_columns, self._snapshot_page_size)
+            writer.extend(rows)
+            writer.close()
+            tmp.seek(0)
+            with self._report_phase('persist'):
+                self._attach_snapshot(tmp.read(), writer.row_count)
+        return writer.row_count
+
+    def _attach_snapshot(self, data, row_count):
+        """Store already encoded snapshot ``data`` as the snapshot of the report"""
+        attachment = self.env['ir.attachment'].sudo().create({
+            'name': f"{self._table}_{self.id}.snapshot",
+            'raw': data,
+            'res_model': self._name,
+            'res_id': self.id,
+            'mimetype': 'application/octet-stream',
+        })
+        self.write({'snapshot_id': attachment.id, 'snapshot_rows': row_count})
+
+    def _get_snapshot_data(self):
+        return self.snapshot_id.sudo().raw
+
+    def _open_snapshot(self):
+        """Open the snapshot for reading, straight from the filestore when possible"""
+        attachment = self.snapshot_id.sudo()
+        if attachment.store_fname:
+            return SnapshotReader(open(attachment._full_path(attachment.store_fname), 'rb'))
+        return SnapshotReader(io.BytesIO(attachment.raw))
+
+    def _read_snapshot_rows(self, start, count):
+        """Return ``count`` snapshot rows from row ``start``"""
+        self.ensure_one()
+        if not self.snapshot_id:
+            return []
+        with self._open_snapshot() as reader:
+            return reader.read_rows(start, count)
+
+    def _drop_snapshot(self):
+        attachments = self.snapshot_id
+        if attachments:
+            self.write({'snapshot_id': False, 'snapshot_rows': 0})
+            attachments.sudo().unlink()
+
+    def unlink(self):
+        attachments = self.snapshot_id
+        res = super().unlink()
+        attachments.sudo().unlink()
+        return res
@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 from odoo import models, fields, api
+from ..tools.commission_engine import compute_commissions
+from .pos_report_run import report_run
 import base64
 import csv
 import io
@@ -33,7 +35,8 @@ class PosSalesReportLine(models.TransientModel):
 
         # Build category filter
         category_filter = ""
-        params = [wizard.start_date, wizard.end_date, self.employee_id.id]
+        date_clause, params = wizard._get_date_range_clause()
+        params.append(self.employee_id.id)
         if wizard.category_ids:
             category_filter = "AND pt.categ_id IN %s"
             params.append(tuple(wizard.category_ids.ids))
@@ -55,16 +58,15 @@ class PosSalesReportLine(models.TransientModel):
             JOIN product_product pp ON pol.product_id = pp.id
             JOIN product_template pt ON pp.product_tmpl_id = pt.id
             LEFT JOIN product_category pcateg ON pt.categ_id = pcateg.id
-            LEFT JOIN hr_employee he ON pol.note = he.barcode
-            WHERE po.date_order::date BETWEEN %s AND %s
-              AND he.id = %s
+            WHERE {date_clause}
+              AND pol.employee_id = %s
               AND po.state NOT IN ('cancel')
               {category_filter}
             ORDER BY po.date_order, po.name
         """
 
-        self.env.cr.execute(query, tuple(params))
-        rows = self.env.cr.dictfetchall()
+        with wizard._report_run('employee_details'):
+            rows = wizard._report_execute(query, tuple(params)).dictfetchall()
 
         for r in rows:
             self.env['pos.sales.report.detail'].create({
@@ -112,6 +114,7 @@ class PosSalesReportDetail(models.TransientModel):
 # --------------------------------------------------------
 class PosSalesReportWizard(models.TransientModel):
     _name = 'pos.sales.report.wizard'
+    _inherit = ['pos.report.date.range.mixin', 'pos.report.trace.mixin']
     _description = 'POS Sales Report Wizard'
 
     start_date = fields.Date("Start Date", required=True)
@@ -143,10 +146,11 @@ class PosSalesReportWizard(models.TransientModel):
             wizard.total_sales_all = sum(line.total_sales for line in wizard.line_ids)
 
     # --- Fetch Summary ---
+    @report_run('generate')
     def action_fetch_details(self):
         self.ensure_one()
         category_filter = ""
-        params = [self.start_date, self.end_date]
+        date_clause, params = self._get_date_range_clause()
 
         if self.category_ids:
             category_filter = "AND pt.categ_id IN %s"
@@ -165,35 +169,42 @@ class PosSalesReportWizard(models.TransientModel):
             JOIN pos_order po ON pol.order_id = po.id
             JOIN product_product pp ON pol.product_id = pp.id
             JOIN product_template pt ON pp.product_tmpl_id = pt.id
-            LEFT JOIN hr_employee he ON pol.note = he.barcode
-            WHERE po.date_order::date BETWEEN %s AND %s
+            LEFT JOIN hr_employee he ON pol.employee_id = he.id
+            WHERE {date_clause}
               AND po.state NOT IN ('cancel')
               {category_filter}
             GROUP BY he.id, he.name, he.barcode, he.individual_sale_target, he.individual_commission_rate
             ORDER BY he.name
         """
 
-        self.env.cr.execute(query, tuple(params))
-        employee_rows = self.env.cr.dictfetchall()
-        self.line_ids.unlink()
-        self.detail_line_ids.unlink()
-
-        for emp in employee_rows:
-            total_sales = emp.get('total_sales', 0) or 0
-            target = emp.get('target_commission', 0) or 0
-            rate = emp.get('commission_rate', 0) or 0
-            earned = total_sales * rate / 100 if total_sales >= target else 0
-
-            self.env['pos.sales.report.line'].create({
+        with self._report_phase('query'):
+            employee_rows = self._report_execute(query, tuple(params)).dictfetchall()
+        with self._report_phase('persist'):
+            self.line_ids.unlink()
+            self.detail_line_ids.unlink()
+
+        # Sales here are attributed per employee only, so category rates do not apply
+        with self._report_phase('enrich'):
+            rules = self.env['pos.commission.rule']._get_engine_rules()
+            earned, _achievement = compute_commissions(
+                [emp.get('total_sales') or 0 for emp in employee_rows],
+                [emp.get('target_commission') or 0 for emp in employee_rows],
+                [emp.get('commission_rate') or 0 for emp in employee_rows],
+                tiers=rules['tiers'],
+                cap=rules['cap'],
+            )
+
+        with self._report_phase('persist'):
+            self.env['pos.sales.report.line'].create([{
                 'wizard_id': self.id,
                 'employee_id': emp['employee_id'],
                 'employee_name': emp['employee_name'],
                 'employee_barcode': emp['employee_barcode'],
-                'target_commission': target,
-                'commission_rate': rate,
-                'total_sales': total_sales,
-                'earned_commission': earned,
-            })
+                'target_commission': emp.get('target_commission') or 0,
+                'commission_rate': emp.get('commission_rate') or 0,
+                'total_sales': emp.get('total_sales') or 0,
+                'earned_commission': earned_commission,
+            } for emp, earned_commission in zip(employee_rows, earned)])
 
         return {
             'type': 'ir.actions.act_window',
@@ -1,16 +1,48 @@
-import io
-import csv
-import base64
-from datetime import date, datetime
+from collections import defaultdict
+from datetime import timedelta
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError
+from .pos_report_run import report_run
 
 
 class PosStaffPerformanceReport(models.Model):
     _name = "pos.staff.performance.report"
+    _inherit = [
+        "pos.report.date.range.mixin", "pos.report.export.mixin", "pos.report.job.mixin", "pos.report.trace.mixin",
+        "pos.report.snapshot.mixin", "pos.report.partition.mixin", "pos.report.refresh.mixin",
+        "pos.report.precompute.mixin",
+    ]
     _description = "POS Staff Performance Report"
     _order = "create_date desc"
     _rec_name = "name"
+    _export_route = "staff"
+    _job_cron_xmlid = "ir_cron_pos_staff_performance_report_queue"
+    _retention_line_models = (
+        "pos.staff.performance.report.line", "pos.staff.performance.report.summary",
+        "pos.staff.performance.report.payment", "pos.staff.performance.report.order.payment",
+    )
+    _refresh_line_model = "pos.staff.performance.report.line"
+    # Row keys holding dimension ids, and their models
+    _line_dimensions = {
+        'config_id': 'pos.config',
+        'product_tmpl_id': 'product.template',
+        'categ_id': 'product.category',
+    }
+    _refresh_total_fields = {
+        'total_quantity': 'quantity',
+        'total_sales': 'line_total',
+        'total_commission': 'earned_commission',
+    }
+    _precompute_copy_fields = (
+        'state', 'total_employees', 'total_orders', 'total_quantity', 'total_sales', 'total_commission',
+    )
+    _snapshot_columns = (
+        'order_id', 'employee_id', 'employee_name', 'employee_batch_no', 'job_position', 'department_name', 'work_email', 'work_phone',
+        'employee_national_id', 'order_name', 'pos_reference', 'order_total', 'order_date', 'session_name',
+        'branch_name', 'payment_method', 'payment_amount', 'customer_name', 'customer_phone', 'customer_mobile',
+        'customer_email', 'product_name', 'product_category', 'product_type', 'product_internal_code',
+        'quantity', 'unit_price', 'line_total', 'employee_total_sale', 'commission_rate', 'earned_commission',
+    )
 
     # ==== Basic Fields ====
     name = fields.Char(string="Report Name", compute="_compute_name", store=True)
@@ -34,8 +66,27 @@ class PosStaffPerformanceReport(models.Model):
     total_commission = fields.Float(string="Total Commission", readonly=True)
 
     # ==== Report Lines ====
+    generation_mode = fields.Selection([
+        ('detail', 'Transaction Lines'),
+        ('employee', 'Per Employee'),
+        ('snapshot', 'Compressed Snapshot'),
+    ], string="Lines Mode", default='detail', required=True,
+        help="Per Employee stores one total row per employee and branch; the transactions of a row are "
+             "read page by page when it is opened. Compressed Snapshot freezes the transactions in a "
+             "compressed attachment and shows them one page at a time.")
+    page_size = fields.Integer(string="Lines per Page", default=80)
+    page_number = fields.Integer(string="Page", readonly=True)
+    has_next_page = fields.Boolean(readonly=True)
+    summary_line_ids = fields.One2many("pos.staff.performance.report.summary", "report_id",
+                                       string="Employee Summary Lines", readonly=True)
     report_line_ids = fields.One2many("pos.staff.performance.report.line", "report_id", string="Report Lines",
                                       readonly=True)
+    include_payment_breakdown = fields.Boolean(string="Payment Breakdown",
+                                               help="Also compute payment totals per branch, employee and method.")
+    payment_line_ids = fields.One2many("pos.staff.performance.report.payment", "report_id",
+                                       string="Payment Breakdown Lines", readonly=True)
+    order_payment_ids = fields.One2many("pos.staff.performance.report.order.payment", "report_id",
+                                        string="Payments per Order", readonly=True)
 
     # ==== Export Fields ====
     export_file = fields.Binary(readonly=True)
@@ -57,11 +108,8 @@ class PosStaffPerformanceReport(models.Model):
 
     def _build_where_clause(self):
         """Build WHERE clause for the SQL query"""
-        where_clauses = [
-            "po.date_order >= %s",
-            "po.date_order <= %s",
-        ]
-        params = [self.start_date, self.end_date]
+        date_clause, params = self._get_date_range_clause()
+        where_clauses = [date_clause]
 
         if self.branch_ids:
             where_clauses.append("po.config_id IN %s")
@@ -69,27 +117,251 @@ class PosStaffPerformanceReport(models.Model):
         if self.employee_ids:
             where_clauses.append("po.employee_id IN %s")
             params.append(tuple(self.employee_ids.ids))
+        else:
+            # Only employees the user may see; orders without employee are kept
+            accessible_ids = [emp[0] for emp in self.env['hr.employee']._get_pos_report_employees(include_archived=True)]
+            where_clauses.append("(po.employee_id IS NULL OR po.employee_id = ANY(%s))")
+            params.append(accessible_ids)
 
         return " AND ".join(where_clauses), params
 
-    def action_generate_report(self):
-        """Generate the complete report with detailed transaction data"""
-        self.ensure_one()
+    def _get_report_from_clause(self, where_clause):
+        """FROM/WHERE part shared by the report query and the export query"""
+        return f"""
+            FROM pos_order po
+            LEFT JOIN pos_order_line pol ON po.id = pol.order_id
+            LEFT JOIN hr_employee he ON po.employee_id = he.id
+            LEFT JOIN hr_job dj ON he.job_id = dj.id
+            LEFT JOIN hr_department dep ON he.department_id = dep.id
+            LEFT JOIN pos_config pc ON po.config_id = pc.id
+            LEFT JOIN pos_session ps ON po.session_id = ps.id
+            LEFT JOIN LATERAL (
+                -- One row per order: "Cash: 20.00, Card: 35.50" and the total paid
+                SELECT
+                    string_agg(method.name || ': ' || to_char(method.amount, 'FM999999999990.00'), ', '
+                               ORDER BY method.name) as payment_method,
+                    SUM(method.amount) as payment_amount
+                FROM (
+                    SELECT {self._translated_sql('ppm.name')} as name, SUM(ppay.amount) as amount
+                    FROM pos_payment ppay
+                    JOIN pos_payment_method ppm ON ppay.payment_method_id = ppm.id
+                    WHERE ppay.pos_order_id = po.id
+                    GROUP BY ppm.id, ppm.name
+                ) method
+            ) pay ON TRUE
+            LEFT JOIN res_partner rp ON po.partner_id = rp.id
+            LEFT JOIN product_product pp ON pol.product_id = pp.id
+            LEFT JOIN product_template pt ON pp.product_tmpl_id = pt.id
+            WHERE {where_clause}
+        """
 
-        # Clear previous lines
-        self.report_line_ids.unlink()
+    def _get_order_payments(self, extra_clause="", extra_params=()):
+        """Payment totals per order and payment method, with the order's branch and employee names"""
+        where_clause, params = self._build_where_clause()
+        query = f"""
+            SELECT
+                po.id as order_id,
+                pc.name as branch_name,
+                he.name as employee_name,
+                {self._translated_sql('ppm.name')} as payment_method,
+                SUM(ppay.amount) as amount
+            FROM pos_order po
+            JOIN pos_payment ppay ON ppay.pos_order_id = po.id
+            JOIN pos_payment_method ppm ON ppay.payment_method_id = ppm.id
+            LEFT JOIN hr_employee he ON po.employee_id = he.id
+            LEFT JOIN pos_config pc ON po.config_id = pc.id
+            WHERE {where_clause}{extra_clause}
+            GROUP BY 1, 2, 3, 4
+        """
+        return [{
+            'report_id': self.id,
+            'order_id': row['order_id'],
+            'branch_name': row['branch_name'],
+            'employee_name': row['employee_name'],
+            'payment_method': row['payment_method'],
+            'amount': row['amount'] or 0,
+        } for row in self._report_execute(query, tuple(params) + tuple(extra_params)).dictfetchall()]
 
+    @api.model
+    def _payment_key(self, payment):
+        return payment['branch_name'] or False, payment['employee_name'] or False, payment['payment_method']
+
+    def _get_payment_breakdown_lines(self, order_payments=None):
+        """Payment totals per branch, employee and payment method, from ``_get_order_payments`` rows"""
+        if order_payments is None:
+            order_payments = self._get_order_payments()
+        totals = defaultdict(lambda: [0, 0.0])
+        for payment in order_payments:
+            total = totals[self._payment_key(payment)]
+            total[0] += 1
+            total[1] += payment['amount']
+        return [(0, 0, {
+            'branch_name': branch_name,
+            'employee_name': employee_name,
+            'payment_method': payment_method,
+            'order_count': order_count,
+            'amount': amount,
+        }) for (branch_name, employee_name, payment_method), (order_count, amount) in totals.items()]
+
+    def _get_payment_delta_commands(self, order_ids, new_payments):
+        """Commands adjusting the payment breakdown by the old and new payments of ``order_ids``"""
+        old_payments = self.env['pos.staff.performance.report.order.payment'].search([
+            ('report_id', '=', self.id), ('order_id', 'in', order_ids)])
+        deltas = defaultdict(lambda: [0, 0.0])
+        for payment in old_payments:
+            delta = deltas[self._payment_key(payment)]
+            delta[0] -= 1
+            delta[1] -= payment.amount
+        for payment in new_payments:
+            delta = deltas[self._payment_key(payment)]
+            delta[0] += 1
+            delta[1] += payment['amount']
+
+        lines = {self._payment_key(line): line for line in self.payment_line_ids}
+        commands = []
+        for key, (order_count, amount) in deltas.items():
+            if not order_count and not amount:
+                continue
+            line = lines.get(key)
+            if not line:
+                branch_name, employee_name, payment_method = key
+                commands.append((0, 0, {
+                    'branch_name': branch_name,
+                    'employee_name': employee_name,
+                    'payment_method': payment_method,
+                    'order_count': order_count,
+                    'amount': amount,
+                }))
+            elif line.order_count + order_count <= 0:
+                commands.append((2, line.id))
+            else:
+                commands.append((1, line.id, {
+                    'order_count': line.order_count + order_count,
+                    'amount': line.amount + amount,
+                }))
+        old_payments.unlink()
+        return commands
+
+    def _get_employee_summary_query(self):
+        """Return (query, params) aggregating the report per employee and branch"""
         where_clause, params = self._build_where_clause()
+        query = f"""
+            SELECT
+                po.employee_id,
+                he.name as employee_name,
+                po.config_id,
+                pc.name as branch_name,
+                COUNT(DISTINCT po.id) as order_count,
+                COALESCE(SUM(pol.qty), 0) as quantity,
+                COALESCE(SUM(pol.qty * pol.price_unit), 0) as sales,
+                COALESCE(SUM(pol.qty * pol.price_unit * he.individual_commission_rate / 100), 0) as commission
+            FROM pos_order po
+            LEFT JOIN pos_order_line pol ON po.id = pol.order_id
+            LEFT JOIN hr_employee he ON po.employee_id = he.id
+            LEFT JOIN pos_config pc ON po.config_id = pc.id
+            WHERE {where_clause}
+            GROUP BY po.employee_id, he.name, po.config_id, pc.name
+            ORDER BY pc.name, he.name
+        """
+        return query, tuple(params)
+
+    def _generate_employee_summary(self):
+        """Store one aggregate row per employee and branch, without transaction lines"""
+        self._job_progress(_("Aggregating per employee"))
+        with self._report_phase('query'):
+            results = self._report_execute(*self._get_employee_summary_query()).dictfetchall()
+            payment_lines = self._get_payment_breakdown_lines() if results and self.include_payment_breakdown else []
+
+        if not results:
+            return self._no_data_notification()
+
+        with self._report_phase('enrich'):
+            summary_lines = [(0, 0, {
+                'employee_id': row['employee_id'],
+                'employee_name': row['employee_name'],
+                'config_id': row['config_id'],
+                'branch_name': row['branch_name'],
+                'order_count': row['order_count'],
+                'quantity': row['quantity'],
+                'sales': row['sales'],
+                'commission': row['commission'],
+                'average_basket': row['sales'] / row['order_count'] if row['order_count'] else 0,
+            }) for row in results]
+
+        self._job_progress(_("Saving employee totals"), rows=len(results))
+        with self._report_phase('persist'):
+            self.write({
+                'summary_line_ids': summary_lines,
+                'payment_line_ids': payment_lines,
+                'total_employees': len({row['employee_id'] for row in results if row['employee_id']}),
+                'total_orders': sum(row['order_count'] for row in results),
+                'total_quantity': sum(row['quantity'] for row in results),
+                'total_sales': sum(row['sales'] for row in results),
+                'total_commission': sum(row['commission'] for row in results),
+                'state': 'generated',
+                'report_generated': fields.Datetime.now(),
+            })
+        return self._reload_action()
+
+    def get_employee_line_page(self, employee_id, config_id, cursor=None, limit=80):
+        """Return one keyset page of the transactions of an employee in a branch.
+
+        ``cursor`` is the ``[date_order, order_id, line_id]`` key of the last row of the
+        previous page (None for the first page).
+        """
+        self.ensure_one()
+        where_clause, params = self._build_where_clause()
+        for column, value in (('po.employee_id', employee_id), ('po.config_id', config_id)):
+            if value:
+                where_clause += f" AND {column} = %s"
+                params.append(value)
+            else:
+                where_clause += f" AND {column} IS NULL"
+        if cursor:
+            where_clause += " AND (po.date_order, po.id, COALESCE(pol.id, 0)) > (%s::timestamp, %s, %s)"
+            params += list(cursor)
 
-        # Detailed query to get transaction-level data matching your original fields
         query = f"""
+            SELECT
+                po.id as order_id,
+                pol.id as line_id,
+                po.name as order_name,
+                po.pos_reference,
+                po.date_order as order_date,
+                ps.name as session_name,
+                rp.name as customer_name,
+                pay.payment_method,
+                pt.id as product_tmpl_id,
+                pt.categ_id,
+                pol.qty as quantity,
+                pol.price_unit as unit_price,
+                (pol.qty * pol.price_unit) as line_total,
+                (pol.qty * pol.price_unit * he.individual_commission_rate / 100) as earned_commission
+            {self._get_report_from_clause(where_clause)}
+            ORDER BY po.date_order, po.id, COALESCE(pol.id, 0)
+            LIMIT %s
+        """
+        params.append(limit + 1)
+        rows = self._report_execute(query, tuple(params)).dictfetchall()
+
+        has_next = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = False
+        if has_next:
+            last = rows[-1]
+            next_cursor = [fields.Datetime.to_string(last['order_date']), last['order_id'], last['line_id'] or 0]
+        return {'rows': rows, 'next_cursor': next_cursor}
+
+    def _get_lines_query(self, where_clause):
+        """Transaction-level SELECT, one row per order line"""
+        return f"""
             SELECT 
                 -- Employee Details
                 he.id as employee_id,
                 he.name as employee_name,
                 he.barcode as employee_batch_no,
-                dj.name->>'en_US' as job_position,
-                dep.name->>'en_US' as department_name,
+                {self._translated_sql('dj.name')} as job_position,
+                {self._translated_sql('dep.name')} as department_name,
                 he.work_email,
                 he.work_phone,
                 he.identification_id as employee_national_id,
@@ -103,11 +375,11 @@ class PosStaffPerformanceReport(models.Model):
 
                 -- Session and Branch Details
                 ps.name as session_name,
-                pc.name as pos_branch,
+                po.config_id,
 
-                -- Payment Details
-                ppm.name->>'en_US' as payment_method,
-                ppay.amount as payment_amount,
+                -- Payment Details (aggregated per order)
+                pay.payment_method,
+                pay.payment_amount,
 
                 -- Customer Details
                 po.partner_id,
@@ -118,8 +390,8 @@ class PosStaffPerformanceReport(models.Model):
 
                 -- Product Line Details
                 pol.id as line_id,
-                pt.name->>'en_US' as product_name,
-                pcateg.name as product_category,
+                pt.id as product_tmpl_id,
+                pt.categ_id,
                 pt.type as product_type,
                 pt.default_code as product_internal_code,
                 pol.qty as quantity,
@@ -134,109 +406,228 @@ class PosStaffPerformanceReport(models.Model):
                 he.individual_sale_target as sales_target,
                 (pol.qty * pol.price_unit * he.individual_commission_rate / 100) as earned_commission
 
-            FROM pos_order po
-            LEFT JOIN pos_order_line pol ON po.id = pol.order_id
-            LEFT JOIN hr_employee he ON po.employee_id = he.id
-            LEFT JOIN hr_job dj ON he.job_id = dj.id
-            LEFT JOIN hr_department dep ON he.department_id = dep.id
-            LEFT JOIN pos_config pc ON po.config_id = pc.id
-            LEFT JOIN pos_session ps ON po.session_id = ps.id
-            LEFT JOIN pos_payment ppay ON ppay.pos_order_id = po.id
-            LEFT JOIN pos_payment_method ppm ON ppay.payment_method_id = ppm.id
-            LEFT JOIN res_partner rp ON po.partner_id = rp.id
-            LEFT JOIN product_product pp ON pol.product_id = pp.id
-            LEFT JOIN product_template pt ON pp.product_tmpl_id = pt.id
-            LEFT JOIN product_category pcateg ON pt.categ_id = pcateg.id
-            WHERE {where_clause}
-            ORDER BY pc.name, he.name, po.date_order, pol.id
+            {self._get_report_from_clause(where_clause)}
+            ORDER BY pc.name, po.config_id, he.name, po.date_order, pol.id
         """
 
-        self.env.cr.execute(query, tuple(params))
-        results = self.env.cr.dictfetchall()
+    def _prepare_line_vals(self, row):
+        """Convert a transaction query row into pos.staff.performance.report.line values"""
+        return {
+            'report_id': self.id,
+            'order_id': row['order_id'],
+            'employee_id': row['employee_id'],
+            # Employee Details
+            'employee_name': row['employee_name'],
+            'employee_batch_no': row['employee_batch_no'],
+            'job_position': row['job_position'],
+            'department_name': row['department_name'],
+            'work_email': row['work_email'],
+            'work_phone': row['work_phone'],
+            'employee_national_id': row['employee_national_id'],
 
-        if not results:
-            return {
-                'type': 'ir.actions.client',
-                'tag': 'display_notification',
-                'params': {
-                    'title': _('No Data Found'),
-                    'message': _('No performance data found for the selected period and filters.'),
-                    'type': 'warning',
-                    'sticky': True,
-                }
-            }
+            # Order Details
+            'order_name': row['order_name'],
+            'pos_reference': row['pos_reference'],
+            'order_total': row['order_total'] or 0,
+            'order_date': row['order_date'],
 
-        # Calculate totals
-        unique_employees = set(row['employee_id'] for row in results if row['employee_id'])
-        unique_orders = set(row['order_id'] for row in results if row['order_id'])
-
-        total_employees = len(unique_employees)
-        total_orders = len(unique_orders)
-        total_quantity = sum(row['quantity'] or 0 for row in results)
-        total_sales = sum(row['line_total'] or 0 for row in results)
-        total_commission = sum(row['earned_commission'] or 0 for row in results)
-
-        # Create detailed report lines
-        report_lines = []
-        for row in results:
-            line_vals = {
-                'report_id': self.id,
-                # Employee Details
-                'employee_name': row['employee_name'],
-                'employee_batch_no': row['employee_batch_no'],
-                'job_position': row['job_position'],
-                'department_name': row['department_name'],
-                'work_email': row['work_email'],
-                'work_phone': row['work_phone'],
-                'employee_national_id': row['employee_national_id'],
-
-                # Order Details
-                'order_name': row['order_name'],
-                'pos_reference': row['pos_reference'],
-                'order_total': row['order_total'] or 0,
-                'order_date': row['order_date'],
+            # Session and Branch Details
+            'session_name': row['session_name'],
+            'branch_name': self._dimension_name('pos.config', row['config_id']),
 
-                # Session and Branch Details
-                'session_name': row['session_name'],
-                'branch_name': row['pos_branch'],
+            # Payment Details
+            'payment_method': row['payment_method'],
+            'payment_amount': row['payment_amount'] or 0,
 
-                # Payment Details
-                'payment_method': row['payment_method'],
-                'payment_amount': row['payment_amount'] or 0,
+            # Customer Details
+            'customer_name': row['customer_name'] or 'Walk-in Customer',
+            'customer_phone': row['customer_phone'],
+            'customer_mobile': row['customer_mobile'],
+            'customer_email': row['customer_email'],
 
-                # Customer Details
-                'customer_name': row['customer_name'] or 'Walk-in Customer',
-                'customer_phone': row['customer_phone'],
-                'customer_mobile': row['customer_mobile'],
-                'customer_email': row['customer_email'],
-
-                # Product Details
-                'product_name': row['product_name'],
-                'product_category': row['product_category'],
-                'product_type': row['product_type'],
-                'product_internal_code': row['product_internal_code'],
-                'quantity': row['quantity'] or 0,
-                'unit_price': row['unit_price'] or 0,
-                'line_total': row['line_total'] or 0,
+            # Product Details
+            'product_name': self._dimension_name('product.template', row['product_tmpl_id']),
+            'product_category': self._dimension_name('product.category', row['categ_id']),
+            'product_type': row['product_type'],
+            'product_internal_code': row['product_internal_code'],
+            'quantity': row['quantity'] or 0,
+            'unit_price': row['unit_price'] or 0,
+            'line_total': row['line_total'] or 0,
 
-                # Performance Metrics
-                'employee_total_sale': row['employee_total_sale'] or 0,
-                'commission_rate': row['commission_rate'] or 0,
-                'earned_commission': row['earned_commission'] or 0,
+            # Performance Metrics
+            'employee_total_sale': row['employee_total_sale'] or 0,
+            'commission_rate': row['commission_rate'] or 0,
+            'earned_commission': row['earned_commission'] or 0,
+        }
+
+    def _generate_snapshot_report(self, query, params):
+        """Stream the transactions into a compressed snapshot and show its first page"""
+        totals = {'employees': set(), 'orders': set(), 'quantity': 0.0, 'sales': 0.0, 'commission': 0.0}
+
+        def snapshot_rows():
+            for row in self._report_iter_rows(query, tuple(params), as_dict=True):
+                if row['employee_id']:
+                    totals['employees'].add(row['employee_id'])
+                if row['order_id']:
+                    totals['orders'].add(row['order_id'])
+                totals['quantity'] += row['quantity'] or 0
+                totals['sales'] += row['line_total'] or 0
+                totals['commission'] += row['earned_commission'] or 0
+                yield self._prepare_line_vals(row)
+
+        self._job_progress(_("Writing snapshot"))
+        row_count = self._write_snapshot(snapshot_rows())
+        if not row_count:
+            self._drop_snapshot()
+            return self._no_data_notification()
+
+        with self._report_phase('query'):
+            payment_lines = self._get_payment_breakdown_lines() if self.include_payment_breakdown else []
+
+        self._job_progress(_("Saving report totals"), rows=row_count)
+        with self._report_phase('persist'):
+            self.write({
+                'payment_line_ids': payment_lines,
+                'total_employees': len(totals['employees']),
+                'total_orders': len(totals['orders']),
+                'total_quantity': totals['quantity'],
+                'total_sales': totals['sales'],
+                'total_commission': totals['commission'],
+                'state': 'generated',
+                'report_generated': fields.Datetime.now(),
+            })
+        self._load_snapshot_page(1)
+        return self._reload_action()
+
+    def _load_snapshot_page(self, page_number):
+        """Replace the displayed lines with the given page (1-based) of the snapshot"""
+        self.ensure_one()
+        page_size = self.page_size or 80
+        with self._report_phase('query'):
+            rows = self._read_snapshot_rows((page_number - 1) * page_size, page_size)
+        with self._report_phase('persist'):
+            self.write({
+                'report_line_ids': [(5, 0, 0)] + [(0, 0, dict(row, report_id=self.id)) for row in rows],
+                'page_number': page_number,
+                'has_next_page': page_number * page_size < self.snapshot_rows,
+            })
+
+    @report_run('page')
+    def action_next_page(self):
+        """Show the next page of the snapshot lines"""
+        self.ensure_one()
+        if self.generation_mode != 'snapshot' or not self.has_next_page:
+            return False
+        self._load_snapshot_page(self.page_number + 1)
+        return self._reload_action()
+
+    @report_run('page')
+    def action_previous_page(self):
+        """Show the previous page of the snapshot lines"""
+        self.ensure_one()
+        if self.generation_mode != 'snapshot' or self.page_number <= 1:
+            return False
+        self._load_snapshot_page(self.page_number - 1)
+        return self._reload_action()
+
+    def _no_data_notification(self):
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('No Data Found'),
+                'message': _('No performance data found for the selected period and filters.'),
+                'type': 'warning',
+                'sticky': True,
             }
-            report_lines.append((0, 0, line_vals))
+        }
+
+    @report_run('generate')
+    def action_generate_report(self):
+        """Generate the complete report with detailed transaction data"""
+        self.ensure_one()
+
+        # Clear previous lines
+        with self._report_phase('persist'):
+            self.report_line_ids.unlink()
+            self.summary_line_ids.unlink()
+            self.payment_line_ids.unlink()
+            self.order_payment_ids.unlink()
+            self._drop_snapshot()
+
+        precomputed = self._find_precomputed()
+        if precomputed:
+            return self._load_precomputed(precomputed)
+
+        if self.generation_mode == 'employee':
+            return self._generate_employee_summary()
+
+        where_clause, params = self._build_where_clause()
+
+        # Detailed query to get transaction-level data matching your original fields
+        query = self._get_lines_query(where_clause)
+
+        if self.generation_mode == 'snapshot':
+            return self._generate_snapshot_report(query, params)
+
+        self._job_progress(_("Fetching transactions"))
+        partitions = self._get_report_partitions()
+        with self._report_phase('query'):
+            if partitions:
+                # Rows are ordered by branch name and id first, the order of the partitions
+                rank = {partition: index for index, partition in enumerate(partitions)}
+                results = self._fetch_partitioned(
+                    partitions,
+                    lambda partition: self._get_partition_query(where_clause, params, partition),
+                    key=lambda row: rank[row['config_id']],
+                )
+            else:
+                results = self._report_execute(query, tuple(params)).dictfetchall()
+            # Kept per order, so a refresh can adjust the breakdown by difference
+            order_payments = self._get_order_payments() if results and self.include_payment_breakdown else []
+            payment_lines = self._get_payment_breakdown_lines(order_payments)
 
+        if not results:
+            return self._no_data_notification()
+
+        with self._report_phase('enrich'):
+            if partitions:
+                # The per-employee window only spans one branch in a partition
+                employee_sales = defaultdict(float)
+                for row in results:
+                    employee_sales[row['employee_id']] += row['line_total'] or 0
+                for row in results:
+                    row['employee_total_sale'] = employee_sales[row['employee_id']]
+
+            # Calculate totals
+            unique_employees = set(row['employee_id'] for row in results if row['employee_id'])
+            unique_orders = set(row['order_id'] for row in results if row['order_id'])
+
+            total_employees = len(unique_employees)
+            total_orders = len(unique_orders)
+            total_quantity = sum(row['quantity'] or 0 for row in results)
+            total_sales = sum(row['line_total'] or 0 for row in results)
+            total_commission = sum(row['earned_commission'] or 0 for row in results)
+
+            # Create detailed report lines
+            self._prefetch_dimensions(results, self._line_dimensions)
+            line_vals = [self._prepare_line_vals(row) for row in results]
+
+        self._job_progress(_("Saving report lines"), rows=len(results))
         # Update report with new data
-        self.write({
-            'report_line_ids': report_lines,
-            'total_employees': total_employees,
-            'total_orders': total_orders,
-            'total_quantity': total_quantity,
-            'total_sales': total_sales,
-            'total_commission': total_commission,
-            'state': 'generated',
-            'report_generated': fields.Datetime.now(),
-        })
+        with self._report_phase('persist'):
+            self.env['pos.staff.performance.report.line']._bulk_create(line_vals)
+            self.env['pos.staff.performance.report.order.payment']._bulk_create(order_payments)
+            self.write({
+                'payment_line_ids': payment_lines,
+                'total_employees': total_employees,
+                'total_orders': total_orders,
+                'total_quantity': total_quantity,
+                'total_sales': total_sales,
+                'total_commission': total_commission,
+                'state': 'generated',
+                'report_generated': fields.Datetime.now(),
+            })
 
         # Return action to reload the current view
         return {
@@ -248,115 +639,166 @@ class PosStaffPerformanceReport(models.Model):
             'views': [(False, 'form')],
         }
 
-    def action_export_csv(self):
-        """Export detailed report to CSV"""
-        self.ensure_one()
-
-        if not self.report_line_ids:
-            raise UserError(_("No data to export. Please generate the report first."))
-
-        output = io.StringIO()
-        writer = csv.writer(output)
+    def _get_precompute_fingerprint(self):
+        return self._hash_filters({
+            'start_date': str(self.start_date),
+            'end_date': str(self.end_date),
+            'lang': self.env.lang or 'en_US',
+            'branch_ids': sorted(self.branch_ids.ids),
+            'employee_ids': sorted(self.employee_ids.ids),
+            # Lines hold the employees the user may see, with their commission rates
+            'employees': self.env['hr.employee']._get_pos_report_employees(include_archived=True),
+            'generation_mode': self.generation_mode,
+            'include_payment_breakdown': self.include_payment_breakdown,
+        })
 
-        # Write headers for detailed report with all fields
-        headers = [
+    @api.model
+    def _get_precompute_targets(self, configs):
+        """Yesterday's transactions of each branch, from local midnight to midnight"""
+        targets = []
+        for config in configs:
+            report_model = self._get_precompute_env(config.company_id)
+            day = fields.Date.context_today(report_model) - timedelta(days=1)
+            lower, upper = report_model._get_date_range_bounds(day, day)
+            targets.append((config.company_id, {
+                'start_date': lower,
+                'end_date': upper - timedelta(seconds=1),
+                'branch_ids': [(6, 0, config.ids)],
+            }))
+        return targets
+
+    def _can_refresh(self):
+        # Employee and snapshot reports do not keep all the transaction lines
+        if self.generation_mode != 'detail' or not super()._can_refresh():
+            return False
+        # Breakdowns stored before the payments were kept per order need a full run
+        return not (self.include_payment_breakdown and self.payment_line_ids and not self.order_payment_ids)
+
+    def _refresh_orders(self, order_ids):
+        """Replace the transactions of the given orders and adjust the totals by difference"""
+        where_clause, params = self._build_where_clause()
+        query = self._get_lines_query(where_clause + " AND po.id IN %s")
+        with self._report_phase('query'):
+            rows = self._report_execute(query, tuple(params) + (tuple(order_ids),)).dictfetchall()
+            new_payments = (self._get_order_payments(" AND po.id IN %s", (tuple(order_ids),))
+                            if self.include_payment_breakdown else [])
+        with self._report_phase('enrich'):
+            self._prefetch_dimensions(rows, self._line_dimensions)
+            line_vals = [self._prepare_line_vals(row) for row in rows]
+
+        with self._report_phase('persist'):
+            old_lines = self._get_refresh_lines(order_ids)
+            totals = self._get_delta_totals(old_lines, line_vals)
+            order_delta = len({vals['order_id'] for vals in line_vals}) - len(old_lines.order_id)
+
+            employee_ids = {vals['employee_id'] for vals in line_vals} | set(old_lines.employee_id.ids)
+            without_employee = None in employee_ids or any(not line.employee_id for line in old_lines)
+            employee_ids.discard(None)
+            employees_before = self._get_present_values('employee_id', employee_ids)
+
+            old_lines.unlink()
+            self.env['pos.staff.performance.report.line']._bulk_create(line_vals)
+            self._update_employee_total_sale(employee_ids, without_employee)
+
+            employees_after = self._get_present_values('employee_id', employee_ids)
+            vals = {
+                **totals,
+                'total_orders': self.total_orders + order_delta,
+                'total_employees': self.total_employees + len(employees_after) - len(employees_before),
+            }
+            if self.include_payment_breakdown:
+                vals['payment_line_ids'] = self._get_payment_delta_commands(order_ids, new_payments)
+                self.env['pos.staff.performance.report.order.payment']._bulk_create(new_payments)
+            self.write(vals)
+
+    def _update_employee_total_sale(self, employee_ids, without_employee=False):
+        """Recompute the per-employee sales total of the lines of the given employees"""
+        Line = self.env['pos.staff.performance.report.line']
+        Line.flush_model()
+        if employee_ids:
+            self.env.cr.execute("""
+                UPDATE pos_staff_performance_report_line line
+                SET employee_total_sale = totals.amount
+                FROM (
+                    SELECT employee_id, COALESCE(SUM(line_total), 0) as amount
+                    FROM pos_staff_performance_report_line
+                    WHERE report_id = %s AND employee_id IN %s
+                    GROUP BY employee_id
+                ) totals
+                WHERE line.report_id = %s AND line.employee_id = totals.employee_id
+            """, (self.id, tuple(employee_ids), self.id))
+        if without_employee:
+            self.env.cr.execute("""
+                UPDATE pos_staff_performance_report_line
+                SET employee_total_sale = (
+                    SELECT COALESCE(SUM(line_total), 0) FROM pos_staff_performance_report_line
+                    WHERE report_id = %s AND employee_id IS NULL
+                )
+                WHERE report_id = %s AND employee_id IS NULL
+            """, (self.id, self.id))
+        Line.invalidate_model(['employee_total_sale'])
+
+    def _get_export_columns(self):
+        if self.generation_mode == 'employee':
+            return [
+                ('Branch Name', 'char'), ('Employee Name', 'char'), ('Orders', 'float'), ('Quantity', 'float'),
+                ('Sales', 'monetary'), ('Commission', 'monetary'), ('Average Basket', 'monetary'),
+            ]
+        return [
             # Employee Details
-            'Employee Name', 'Employee Batch No', 'Job Position', 'Department',
-            'Work Email', 'Work Phone', 'National ID',
+            ('Employee Name', 'char'), ('Employee Batch No', 'char'), ('Job Position', 'char'),
+            ('Department', 'char'), ('Work Email', 'char'), ('Work Phone', 'char'), ('National ID', 'char'),
 
             # Order Details
-            'Order Name', 'POS Reference', 'Order Total', 'Order Date',
+            ('Order Name', 'char'), ('POS Reference', 'char'), ('Order Total', 'monetary'),
+            ('Order Date', 'datetime'),
 
             # Session and Branch
-            'Session Name', 'Branch Name',
+            ('Session Name', 'char'), ('Branch Name', 'char', 'pos.config'),
 
             # Payment Details
-            'Payment Method', 'Payment Amount',
+            ('Payment Method', 'char'), ('Payment Amount', 'monetary'),
 
             # Customer Details
-            'Customer Name', 'Customer Phone', 'Customer Mobile', 'Customer Email',
+            ('Customer Name', 'char'), ('Customer Phone', 'char'), ('Customer Mobile', 'char'),
+            ('Customer Email', 'char'),
 
             # Product Details
-            'Product Name', 'Product Category', 'Product Type', 'Product Internal Code',
-            'Quantity', 'Unit Price', 'Line Total', 'UOM Name',
+            ('Product Name', 'char', 'product.template'), ('Product Category', 'char', 'product.category'),
+            ('Product Type', 'char'),
+            ('Product Internal Code', 'char'), ('Quantity', 'float'), ('Unit Price', 'monetary'),
+            ('Line Total', 'monetary'),
 
             # Performance Metrics
-            'Employee Total Sale', 'Commission Rate %', 'Earned Commission'
+            ('Employee Total Sale', 'monetary'), ('Commission Rate %', 'monetary'),
+            ('Earned Commission', 'monetary'),
         ]
-        writer.writerow(headers)
-
-        # Write data rows
-        for line in self.report_line_ids:
-            writer.writerow([
-                # Employee Details
-                line.employee_name or '',
-                line.employee_batch_no or '',
-                line.job_position or '',
-                line.department_name or '',
-                line.work_email or '',
-                line.work_phone or '',
-                line.employee_national_id or '',
-
-                # Order Details
-                line.order_name or '',
-                line.pos_reference or '',
-                f"{line.order_total:,.2f}",
-                line.order_date or '',
-
-                # Session and Branch
-                line.session_name or '',
-                line.branch_name or '',
-
-                # Payment Details
-                line.payment_method or '',
-                f"{line.payment_amount:,.2f}",
-
-                # Customer Details
-                line.customer_name or '',
-                line.customer_phone or '',
-                line.customer_mobile or '',
-                line.customer_email or '',
-
-                # Product Details
-                line.product_name or '',
-                line.product_category or '',
-                line.product_type or '',
-                line.product_internal_code or '',
-                line.quantity,
-                f"{line.unit_price:,.2f}",
-                f"{line.line_total:,.2f}",
-
-                # Performance Metrics
-                f"{line.employee_total_sale:,.2f}",
-                f"{line.commission_rate:,.2f}",
-                f"{line.earned_commission:,.2f}",
-            ])
-
-        # Write summary
-        writer.writerow([])
-        writer.writerow(['REPORT SUMMARY'])
-        writer.writerow(['Total Employees', self.total_employees])
-        writer.writerow(['Total Orders', self.total_orders])
-        writer.writerow(['Total Quantity', self.total_quantity])
-        writer.writerow(['Total Sales', f"{self.total_sales:,.2f}"])
-        writer.writerow(['Total Commission', f"{self.total_commission:,.2f}"])
-
-        # Prepare file for download
-        csv_data = output.getvalue().encode('utf-8')
-        b64_data = base64.b64encode(csv_data)
-
-        filename = f"detailed_staff_performance_{self.start_date.date()}_to_{self.end_date.date()}.csv"
 
-        self.write({
-            'export_file': b64_data,
-            'export_filename': filename
-        })
+    def _get_export_stored_source(self):
+        if self.generation_mode == 'employee':
+            return 'pos.staff.performance.report.summary', [
+                'branch_name', 'employee_name', 'order_count', 'quantity', 'sales', 'commission', 'average_basket',
+            ]
+        return 'pos.staff.performance.report.line', [
+            'employee_name', 'employee_batch_no', 'job_position', 'department_name', 'work_email', 'work_phone',
+            'employee_national_id', 'order_name', 'pos_reference', 'order_total', 'order_date', 'session_name',
+            'branch_name', 'payment_method', 'payment_amount', 'customer_name', 'customer_phone', 'customer_mobile',
+            'customer_email', 'product_name', 'product_category', 'product_type', 'product_internal_code',
+            'quantity', 'unit_price', 'line_total', 'employee_total_sale', 'commission_rate', 'earned_commission',
+        ]
 
-        return {
-            'type': 'ir.actions.act_url',
-            'url': f'/web/content?model={self._name}&id={self.id}&field=export_file&filename={filename}&download=true',
-            'target': 'self',
-        }
+    def _get_export_summary_rows(self):
+        return [
+            ['REPORT SUMMARY'],
+            ['Total Employees', self.total_employees],
+            ['Total Orders', self.total_orders],
+            ['Total Quantity', self.total_quantity],
+            ['Total Sales', self.total_sales],
+            ['Total Commission', self.total_commission],
+        ]
+
+    def _get_export_filename(self, extension):
+        return f"detailed_staff_performance_{self.start_date.date()}_to_{self.end_date.date()}.{extension}"
 
     def action_clear_filters(self):
         """Clear all filters and reset the form"""
@@ -364,6 +806,10 @@ class PosStaffPerformanceReport(models.Model):
 
         # Clear lines
         self.report_line_ids.unlink()
+        self.summary_line_ids.unlink()
+        self.payment_line_ids.unlink()
+        self.order_payment_ids.unlink()
+        self._drop_snapshot()
 
         self.write({
             'start_date': fields.Datetime.now(),
@@ -409,10 +855,13 @@ class PosStaffPerformanceReport(models.Model):
 
 class PosStaffPerformanceReportLine(models.Model):
     _name = "pos.staff.performance.report.line"
+    _inherit = "pos.report.line.mixin"
     _description = "POS Staff Performance Report Line"
     _order = "branch_name, employee_name, order_date"
 
     report_id = fields.Many2one("pos.staff.performance.report", string="Report", required=True, ondelete="cascade")
+    order_id = fields.Many2one("pos.order", string="Order", readonly=True, index=True)
+    employee_id = fields.Many2one("hr.employee", string="Employee", readonly=True, index=True)
 
     # Employee Details
     employee_name = fields.Char(string="Employee Name")
@@ -434,8 +883,8 @@ class PosStaffPerformanceReportLine(models.Model):
     branch_name = fields.Char(string="Branch")
 
     # Payment Details
-    payment_method = fields.Char(string="Payment Method")
-    payment_amount = fields.Float(string="Payment Amount")
+    payment_method = fields.Char(string="Payment Methods")
+    payment_amount = fields.Float(string="Order Paid Amount")
 
     # Customer Details
     customer_name = fields.Char(string="Customer Name")
@@ -455,4 +904,151 @@ class PosStaffPerformanceReportLine(models.Model):
     # Performance Metrics
     employee_total_sale = fields.Float(string="Employee Total Sale")
     commission_rate = fields.Float(string="Commission Rate %")
-    earned_commission = fields.Float(string="Earned Commission")
\ No newline at end of file
+    earned_commission = fields.Float(string="Earned Commission")
+
+
+class PosStaffPerformanceReportPayment(models.Model):
+    _name = "pos.staff.performance.report.payment"
+    _description = "POS Staff Performance Report Payment Breakdown"
+    _order = "branch_name, employee_name, payment_method"
+
+    report_id = fields.Many2one("pos.staff.performance.report", string="Report", required=True, ondelete="cascade")
+    branch_name = fields.Char(string="Branch")
+    employee_name = fields.Char(string="Employee Name")
+    payment_method = fields.Char(string="Payment Method")
+    order_count = fields.Integer(string="Orders")
+    amount = fields.Float(string="Amount")
+
+
+class PosStaffPerformanceReportOrderPayment(models.Model):
+    _name = "pos.staff.performance.report.order.payment"
+    _inherit = "pos.report.line.mixin"
+    _description = "POS Staff Performance Report Payments per Order"
+
+    report_id = fields.Many2one("pos.staff.performance.report", string="Report", required=True,
+                                ondelete="cascade", index=True)
+    order_id = fields.Many2one("pos.order", string="Order", index=True)
+    branch_name = fields.Char(string="Branch")
+    employee_name = fields.Char(string="Employee Name")
+    payment_method = fields.Char(string="Payment Method")
+    amount = fields.Float(string="Amount")
+
+
+class PosStaffPerformanceReportSummary(models.Model):
+    _name = "pos.staff.performance.report.summary"
+    _description = "POS Staff Performance Report Employee Summary"
+    _order = "branch_name, employee_name"
+
+    report_id = fields.Many2one("pos.staff.performance.report", string="Report", required=True, ondelete="cascade")
+    employee_id = fields.Many2one("hr.employee", string="Employee")
+    employee_name = fields.Char(string="Employee Name")
+    config_id = fields.Many2one("pos.config", string="POS Branch")
+    branch_name = fields.Char(string="Branch")
+    order_count = fields.Integer(string="Orders")
+    quantity = fields.Float(string="Quantity")
+    sales = fields.Float(string="Sales")
+    commission = fields.Float(string="Commission")
+    average_basket = fields.Float(string="Average Basket")
+
+    def action_view_transactions(self):
+        """Open the transactions of this employee and branch, one page at a time"""
+        self.ensure_one()
+        drilldown = self.env["pos.staff.performance.drilldown"].create({'summary_line_id': self.id})
+        drilldown._load_page(1)
+        return drilldown._reload_action()
+
+
+class PosStaffPerformanceDrilldown(models.TransientModel):
+    _name = "pos.staff.performance.drilldown"
+    _description = "POS Staff Performance Transactions"
+
+    summary_line_id = fields.Many2one("pos.staff.performance.report.summary", required=True, ondelete="cascade")
+    report_id = fields.Many2one(related="summary_line_id.report_id")
+    employee_name = fields.Char(related="summary_line_id.employee_name")
+    branch_name = fields.Char(related="summary_line_id.branch_name")
+    page_size = fields.Integer(string="Lines per Page", default=80)
+    page_number = fields.Integer(string="Page", readonly=True)
+    page_cursors = fields.Json(readonly=True)
+    has_next_page = fields.Boolean(readonly=True)
+    line_ids = fields.One2many("pos.staff.performance.drilldown.line", "drilldown_id", string="Transactions",
+                               readonly=True)
+
+    def _load_page(self, page_number):
+        """Replace the displayed transactions with the given page (1-based)"""
+        self.ensure_one()
+        cursors = list(self.page_cursors or [None])
+        summary = self.summary_line_id
+        with self.report_id._report_run('drilldown'):
+            page = self.report_id.get_employee_line_page(
+                summary.employee_id.id, summary.config_id.id, cursor=cursors[page_number - 1],
+                limit=self.page_size or 80)
+
+        next_cursor = page['next_cursor']
+        del cursors[page_number:]
+        if next_cursor:
+            cursors.append(next_cursor)
+
+        report = self.report_id
+        self.write({
+            'line_ids': [(5, 0, 0)] + [(0, 0, {
+                'order_name': row['order_name'],
+                'pos_reference': row['pos_reference'],
+                'order_date': row['order_date'],
+                'session_name': row['session_name'],
+                'customer_name': row['customer_name'] or 'Walk-in Customer',
+                'payment_method': row['payment_method'],
+                'product_name': report._dimension_name('product.template', row['product_tmpl_id']),
+                'product_category': report._dimension_name('product.category', row['categ_id']),
+                'quantity': row['quantity'] or 0,
+                'unit_price': row['unit_price'] or 0,
+                'line_total': row['line_total'] or 0,
+                'earned_commission': row['earned_commission'] or 0,
+            }) for row in page['rows']],
+            'page_number': page_number,
+            'page_cursors': cursors,
+            'has_next_page': bool(next_cursor),
+        })
+
+    def _reload_action(self):
+        return {
+            'type': 'ir.actions.act_window',
+            'name': _('Transactions of %s', self.employee_name or _('Unassigned')),
+            'res_model': self._name,
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'new',
+            'views': [(False, 'form')],
+        }
+
+    def action_next_page(self):
+        self.ensure_one()
+        if not self.has_next_page:
+            return False
+        self._load_page(self.page_number + 1)
+        return self._reload_action()
+
+    def action_previous_page(self):
+        self.ensure_one()
+        if self.page_number <= 1:
+            return False
+        self._load_page(self.page_number - 1)
+        return self._reload_action()
+
+
+class PosStaffPerformanceDrilldownLine(models.TransientModel):
+    _name = "pos.staff.performance.drilldown.line"
+    _description = "POS Staff Performance Transaction Line"
+
+    drilldown_id = fields.Many2one("pos.staff.performance.drilldown", required=True, ondelete="cascade")
+    order_name = fields.Char(string="Order Name")
+    pos_reference = fields.Char(string="POS Reference")
+    order_date = fields.Datetime(string="Order Date")
+    session_name = fields.Char(string="Session")
+    customer_name = fields.Char(string="Customer Name")
+    payment_method = fields.Char(string="Payment Methods")
+    product_name = fields.Char(string="Product Name")
+    product_category = fields.Char(string="Product Category")
+    quantity = fields.Float(string="Quantity")
+    unit_price = fields.Float(string="Unit Price")
+    line_total = fields.Float(string="Line Total")
+    earned_commission = fields.Float(string="Earned Commission")
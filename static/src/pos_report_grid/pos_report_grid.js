@@ -0,0 +1,126 @@
+/** @odoo-module **/
+
+import { Component, onWillStart, onWillUpdateProps, useState } from "@odoo/owl";
+import { formatFloat } from "@web/core/l10n/numbers";
+import { rpc } from "@web/core/network/rpc";
+import { registry } from "@web/core/registry";
+import { useDebounced } from "@web/core/utils/timing";
+import { standardWidgetProps } from "@web/views/widgets/standard_widget_props";
+
+/**
+ * Server-paged grid of the POS sales report lines.
+ *
+ * Only the visible page is ever loaded: sorting, column filters and totals
+ * are all computed by /pos_sales_report/<id>/grid. Pages are read by keyset,
+ * from the cursor of the previous page; the totals are only requested again
+ * when the filters or the sort change.
+ */
+export class PosReportGrid extends Component {
+    static template = "myreport.PosReportGrid";
+    static props = { ...standardWidgetProps };
+
+    setup() {
+        this.state = useState({
+            columns: [],
+            rows: [],
+            total: 0,
+            totals: {},
+            // Cursor of each page read so far, the current page's last
+            cursors: [null],
+            nextCursor: false,
+            limit: 80,
+            order: null,
+            filters: {},
+            loading: false,
+        });
+        this.debouncedReload = useDebounced(() => this.reload(), 400);
+
+        onWillStart(() => this.reload());
+        onWillUpdateProps((nextProps) => {
+            const generated = nextProps.record.data.report_generated;
+            if (generated !== this.props.record.data.report_generated) {
+                return this.reload(nextProps);
+            }
+        });
+    }
+
+    get pageNumber() {
+        return this.state.cursors.length;
+    }
+
+    /** Back to the first page, with the totals of the new selection */
+    reload(props = this.props) {
+        this.state.cursors = [null];
+        return this.load(props, true);
+    }
+
+    async load(props = this.props, withTotals = false) {
+        const reportId = props.record.resId;
+        if (!reportId) {
+            return;
+        }
+        this.state.loading = true;
+        try {
+            const page = await rpc(`/pos_sales_report/${reportId}/grid`, {
+                cursor: this.state.cursors.at(-1),
+                limit: this.state.limit,
+                order: this.state.order,
+                filters: this.state.filters,
+                with_totals: withTotals,
+            });
+            Object.assign(this.state, {
+                columns: page.columns,
+                rows: page.rows,
+                nextCursor: page.next_cursor,
+            });
+            if (withTotals) {
+                Object.assign(this.state, { total: page.total, totals: page.totals });
+            }
+        } finally {
+            this.state.loading = false;
+        }
+    }
+
+    onSort(column) {
+        const order = this.state.order;
+        this.state.order = {
+            column: column.name,
+            asc: order && order.column === column.name ? !order.asc : true,
+        };
+        return this.reload();
+    }
+
+    onFilterInput(column, ev) {
+        this.state.filters[column.name] = ev.target.value;
+        this.debouncedReload();
+    }
+
+    onNextPage() {
+        this.state.cursors.push(this.state.nextCursor);
+        return this.load();
+    }
+
+    onPreviousPage() {
+        this.state.cursors.pop();
+        return this.load();
+    }
+
+    isNumeric(column) {
+        return !["char", "date"].includes(column.kind);
+    }
+
+    formatCell(column, value) {
+        if (value === null || value === undefined || value === false) {
+            return "";
+        }
+        if (column.kind === "percent") {
+            return `${formatFloat(value, { digits: [16, 2] })}%`;
+        }
+        if (this.isNumeric(column)) {
+            return formatFloat(value, { digits: [16, 2] });
+        }
+        return value;
+    }
+}
+
+registry.category("view_widgets").add("pos_report_grid", { component: PosReportGrid });
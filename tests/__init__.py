@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+
+from . import test_commission_engine
+from . import test_pos_customer_report
+from . import test_pos_report_daily_fact
+from . import test_snapshot
+from . import test_staff_performance_report
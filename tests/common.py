@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+from odoo import Command, fields
+from odoo.addons.point_of_sale.tests.common import TestPointOfSaleCommon
+
+
+class TestPosReportCommon(TestPointOfSaleCommon):
+    """Open session and order helpers shared by the report tests"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.pos_config.open_ui()
+        cls.session = cls.pos_config.current_session_id
+        cls.now = fields.Datetime.now()
+
+    def _create_order(self, lines=((2.0, 450.0),), partner=None, employee=None, date_order=None):
+        """Draft order with one line per ``(qty, price)`` of ``lines``, without taxes"""
+        amount = sum(qty * price for qty, price in lines)
+        return self.PosOrder.create({
+            'company_id': self.env.company.id,
+            'session_id': self.session.id,
+            'partner_id': (partner or self.partner1).id,
+            'employee_id': employee.id if employee else False,
+            'date_order': date_order or self.now,
+            'lines': [Command.create({
+                'name': f"OL/{index:04d}",
+                'product_id': self.product3.id,
+                'price_unit': price,
+                'qty': qty,
+                'tax_ids': False,
+                'price_subtotal': qty * price,
+                'price_subtotal_incl': qty * price,
+            }) for index, (qty, price) in enumerate(lines, 1)],
+            'amount_total': amount,
+            'amount_tax': 0.0,
+            'amount_paid': 0.0,
+            'amount_return': 0.0,
+        })
+
+    def _pay(self, order):
+        context = {'active_ids': order.ids, 'active_id': order.id}
+        payment = self.PosMakePayment.with_context(**context).create({
+            'amount': order.amount_total,
+            'payment_method_id': self.cash_payment_method.id,
+        })
+        payment.with_context(**context).check()
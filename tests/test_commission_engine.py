@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+from unittest.mock import patch
+
+from odoo.tests import TransactionCase, tagged
+from odoo.addons.myreport.tools import commission_engine
+from odoo.addons.myreport.tools.commission_engine import compute_commissions
+
+
+@tagged('post_install', '-at_install')
+class TestCommissionEngine(TransactionCase):
+    """The NumPy and pure Python paths must give the same, hand-checked results"""
+
+    SALES = [1000.0, 500.0, 3000.0, 0.0]
+    TARGETS = [800.0, 600.0, 0.0, 0.0]
+    RATES = [5.0, 5.0, 2.0, 5.0]
+
+    def _compute_both(self, *args, **kwargs):
+        """Return the results of the NumPy path (None without NumPy) and of the Python path"""
+        with patch.object(commission_engine, 'numpy', None):
+            python_result = compute_commissions(*args, **kwargs)
+        numpy_result = compute_commissions(*args, **kwargs) if commission_engine.numpy is not None else None
+        return numpy_result, python_result
+
+    def assertCommissions(self, expected, *args, **kwargs):
+        numpy_result, python_result = self._compute_both(*args, **kwargs)
+        for result in (python_result, numpy_result):
+            if result is None:
+                continue
+            earned, achievement = result
+            self.assertEqual(len(earned), len(expected[0]))
+            for value, expected_value in zip(earned, expected[0]):
+                self.assertAlmostEqual(value, expected_value)
+            for value, expected_value in zip(achievement, expected[1]):
+                self.assertAlmostEqual(value, expected_value)
+
+    def test_flat_rate(self):
+        self.assertCommissions(
+            ([50.0, 0.0, 60.0, 0.0], [125.0, 500 / 6, 0.0, 0.0]),
+            self.SALES, self.TARGETS, self.RATES,
+        )
+
+    def test_category_rates(self):
+        # Category sales earn their own rate and are taken out of the flat rate base
+        self.assertCommissions(
+            ([20.0 + 40.0, 0.0, 50.0 + 10.0 + 30.0, 0.0], [125.0, 500 / 6, 0.0, 0.0]),
+            self.SALES, self.TARGETS, self.RATES,
+            category_sales=[[200.0, 0.0], [0.0, 0.0], [500.0, 1000.0], [0.0, 0.0]],
+            category_rates=[10.0, 1.0],
+        )
+
+    def test_tiers_and_cap(self):
+        # Given out of order: brackets are sorted by their lower bound
+        tiers = [(2000.0, 20.0), (1000.0, 10.0)]
+        self.assertCommissions(
+            ([50.0, 0.0, 20.0 + 100.0 + 200.0, 0.0], [125.0, 500 / 6, 0.0, 0.0]),
+            self.SALES, self.TARGETS, self.RATES, tiers=tiers,
+        )
+        self.assertCommissions(
+            ([50.0, 0.0, 250.0, 0.0], [125.0, 500 / 6, 0.0, 0.0]),
+            self.SALES, self.TARGETS, self.RATES, tiers=tiers, cap=250.0,
+        )
+
+    def test_numpy_matches_python(self):
+        if commission_engine.numpy is None:
+            self.skipTest("NumPy is not installed")
+        kwargs = {
+            'category_sales': [[150.0, 25.0], [0.0, 80.0], [1200.0, 0.0], [0.0, 0.0]],
+            'category_rates': [7.5, 3.0],
+            'tiers': [(500.0, 6.0), (1500.0, 8.0)],
+            'cap': 120.0,
+        }
+        numpy_result, python_result = self._compute_both(self.SALES, self.TARGETS, self.RATES, **kwargs)
+        for numpy_values, python_values in zip(numpy_result, python_result):
+            for numpy_value, python_value in zip(numpy_values, python_values):
+                self.assertAlmostEqual(numpy_value, python_value)
+
+    def test_no_employees(self):
+        for result in self._compute_both([], [], []):
+            if result is not None:
+                self.assertEqual([list(values) for values in result], [[], []])
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tests import tagged
+from odoo.addons.myreport.tests.common import TestPosReportCommon
+
+
+@tagged('post_install', '-at_install')
+class TestPosCustomerReport(TestPosReportCommon):
+
+    def _create_report(self, **vals):
+        today = fields.Date.context_today(self.env['pos.customer.report'])
+        return self.env['pos.customer.report'].create({
+            'start_date': today - timedelta(days=1),
+            'end_date': today + timedelta(days=1),
+            'branch_ids': [(6, 0, self.pos_config.ids)],
+            **vals,
+        })
+
+    def _get_live_rows(self, report):
+        self.env.flush_all()
+        where_clause, params = report._build_where_clause()
+        return report._report_execute(report._get_lines_query(where_clause), tuple(params)).dictfetchall()
+
+    def _create_paging_orders(self):
+        # Orders sharing a date are ordered by id, an order without lines still gets a row
+        self._create_order([(1.0, 10.0), (2.0, 20.0), (3.0, 30.0)])
+        self._create_order([(4.0, 40.0)])
+        self.PosOrder.create({
+            'company_id': self.env.company.id,
+            'session_id': self.session.id,
+            'partner_id': self.partner1.id,
+            'date_order': self.now - timedelta(hours=1),
+            'amount_total': 0.0,
+            'amount_tax': 0.0,
+            'amount_paid': 0.0,
+            'amount_return': 0.0,
+        })
+        self._create_order([(5.0, 50.0), (6.0, 60.0)], date_order=self.now - timedelta(hours=2))
+
+    def test_line_pages(self):
+        self._create_paging_orders()
+        report = self._create_report()
+        expected = [(row['order_id'], row['line_id']) for row in self._get_live_rows(report)]
+        self.assertEqual(len(expected), 7)
+
+        for limit in (1, 2, 3, 6, 7, 8):
+            keys, cursor, page_count = [], None, 0
+            while True:
+                page = report.get_line_page(cursor=cursor, limit=limit)
+                page_count += 1
+                self.assertLessEqual(len(page['rows']), limit)
+                keys += [(row['order_id'], row['line_id']) for row in page['rows']]
+                cursor = page['next_cursor']
+                if not cursor:
+                    break
+            self.assertEqual(keys, expected, f"pages of {limit} lines")
+            self.assertEqual(page_count, max(1, -(-len(expected) // limit)),
+                             f"a full last page of {limit} lines has no next page")
+
+    def test_paged_navigation(self):
+        self._create_paging_orders()
+        report = self._create_report(generation_mode='paged', page_size=3)
+        rows = self._get_live_rows(report)
+
+        def page_lines():
+            return sorted((line.order_id.id, line.quantity) for line in report.report_line_ids)
+
+        def expected_lines(page_number):
+            page_rows = rows[(page_number - 1) * 3:page_number * 3]
+            return sorted((row['order_id'], row['quantity'] or 0) for row in page_rows)
+
+        report.action_generate_report()
+        self.assertEqual((report.page_number, report.has_next_page), (1, True))
+        self.assertEqual(page_lines(), expected_lines(1))
+
+        report.action_next_page()
+        report.action_next_page()
+        self.assertEqual((report.page_number, report.has_next_page), (3, False))
+        self.assertEqual(page_lines(), expected_lines(3))
+        self.assertFalse(report.action_next_page())
+
+        report.action_previous_page()
+        self.assertEqual((report.page_number, report.has_next_page), (2, True))
+        self.assertEqual(page_lines(), expected_lines(2))
+
+    def test_refresh_orders(self):
+        customer = self.env['res.partner'].create({'name': 'Refreshed Customer'})
+        changed = self._create_order([(1.0, 100.0), (2.0, 50.0)])
+        moved = self._create_order([(3.0, 20.0)])
+        kept = self._create_order([(1.0, 10.0)], partner=customer)
+        self._create_order([(5.0, 5.0)])
+
+        report = self._create_report()
+        report.action_generate_report()
+        self.assertEqual((report.total_orders, report.total_customers), (4, 2))
+
+        changed.lines[0].write({'qty': 4.0, 'price_subtotal': 400.0, 'price_subtotal_incl': 400.0})
+        moved.write({'date_order': self.now - timedelta(days=30)})
+        kept.write({'partner_id': self.partner1.id})
+        added = self._create_order([(2.0, 75.0)], partner=customer)
+
+        # Only the lines of the given orders are replaced, the untouched order keeps its line
+        self.assertTrue(report._can_refresh())
+        self.env.flush_all()
+        report._refresh_orders((changed | moved | kept | added).ids)
+
+        summary = report._get_summary_values()
+        for field_name, value in summary.items():
+            self.assertAlmostEqual(report[field_name], value, msg=field_name)
+        self.assertEqual((report.total_orders, report.total_customers), (4, 2))
+
+        rows = self._get_live_rows(report)
+        self.assertEqual(
+            sorted((line.order_id.id, line.quantity, line.order_total) for line in report.report_line_ids),
+            sorted((row['order_id'], row['quantity'], row['order_total']) for row in rows),
+        )
+        self.assertNotIn(moved, report.report_line_ids.order_id)
+        self.assertIn(added, report.report_line_ids.order_id)
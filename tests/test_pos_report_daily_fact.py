@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+from odoo import Command
+from odoo.tests import tagged
+from odoo.addons.point_of_sale.tests.common import TestPointOfSaleCommon
+from odoo.addons.myreport.models.pos_report_daily_fact import FACT_ORDER_STATES
+
+
+@tagged('post_install', '-at_install')
+class TestPosReportDailyFact(TestPointOfSaleCommon):
+    """The incrementally maintained facts must match the live aggregate of the orders"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.Fact = cls.env['pos.report.daily.fact']
+        cls.Fact._init_fact_tz()
+        cls.Fact._backfill()
+        cls.pos_config.open_ui()
+        cls.session = cls.pos_config.current_session_id
+
+    def _create_order(self, qty=2.0, price=450.0, employee=None):
+        subtotal = qty * price
+        return self.PosOrder.create({
+            'employee_id': employee.id if employee else False,
+            'company_id': self.env.company.id,
+            'session_id': self.session.id,
+            'partner_id': self.partner1.id,
+            'lines': [Command.create({
+                'name': "OL/0001",
+                'product_id': self.product3.id,
+                'price_unit': price,
+                'qty': qty,
+                'tax_ids': False,
+                'price_subtotal': subtotal,
+                'price_subtotal_incl': subtotal,
+            })],
+            'amount_total': subtotal,
+            'amount_tax': 0.0,
+            'amount_paid': 0.0,
+            'amount_return': 0.0,
+        })
+
+    def _pay(self, order):
+        context = {'active_ids': order.ids, 'active_id': order.id}
+        payment = self.PosMakePayment.with_context(**context).create({
+            'amount': order.amount_total,
+            'payment_method_id': self.cash_payment_method.id,
+        })
+        payment.with_context(**context).check()
+
+    def _get_facts(self):
+        self.env.flush_all()
+        self.env.cr.execute("""
+            SELECT day, employee_id, config_id, categ_id, qty, subtotal_excl, subtotal_incl, order_count
+            FROM pos_report_daily_fact
+            ORDER BY 1, 2, 3, 4
+        """)
+        return self.env.cr.fetchall()
+
+    def _get_live_facts(self):
+        self.env.flush_all()
+        self.env.cr.execute("""
+            SELECT
+                (po.date_order AT TIME ZONE 'UTC' AT TIME ZONE %s)::date,
+                po.employee_id,
+                po.config_id,
+                pt.categ_id,
+                SUM(pol.qty),
+                SUM(pol.price_subtotal),
+                SUM(pol.price_subtotal_incl),
+                COUNT(DISTINCT po.id)
+            FROM pos_order po
+            JOIN pos_order_line pol ON pol.order_id = po.id
+            JOIN product_product pp ON pol.product_id = pp.id
+            JOIN product_template pt ON pp.product_tmpl_id = pt.id
+            WHERE po.state IN %s AND po.config_id IS NOT NULL
+            GROUP BY 1, 2, 3, 4
+            ORDER BY 1, 2, 3, 4
+        """, (self.Fact._get_fact_tz(), FACT_ORDER_STATES))
+        return self.env.cr.fetchall()
+
+    def assertFactsMatchLive(self):
+        self.assertEqual(self._get_facts(), self._get_live_facts())
+
+    def test_create_pay_cancel(self):
+        facts_before = self._get_facts()
+
+        order = self._create_order()
+        self.assertEqual(self._get_facts(), facts_before, "Draft orders are not sales")
+        self.assertFactsMatchLive()
+
+        self._pay(order)
+        self.assertNotEqual(self._get_facts(), facts_before)
+        self.assertFactsMatchLive()
+
+        second = self._create_order(qty=1.0, price=100.0)
+        self._pay(second)
+        self.assertFactsMatchLive()
+
+        second.write({'state': 'cancel'})
+        self.assertFactsMatchLive()
+
+        draft = self._create_order(qty=3.0)
+        draft.action_pos_order_cancel()
+        self.assertFactsMatchLive()
+
+    def test_fact_tz_ignores_writer_company(self):
+        tz = self.Fact._get_fact_tz()
+        self.env.company.partner_id.tz = 'Pacific/Auckland' if tz != 'Pacific/Auckland' else 'America/Lima'
+        self.assertEqual(self.Fact._get_fact_tz(), tz)
+
+    def test_redate_order(self):
+        order = self._create_order()
+        self._pay(order)
+        order.write({'date_order': order.date_order.replace(year=order.date_order.year - 1)})
+        self.assertFactsMatchLive()
+
+    def test_unlink_employee_merges_rows(self):
+        employee = self.env['hr.employee'].create({'name': 'Leaving Cashier'})
+        self._pay(self._create_order())
+        self._pay(self._create_order(qty=1.0, employee=employee))
+        employee.unlink()
+        self.assertFactsMatchLive()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+from datetime import date, datetime
+
+from odoo.tests import TransactionCase, tagged
+from odoo.addons.myreport.tools.snapshot import SnapshotReader, build_snapshot
+
+
+@tagged('post_install', '-at_install')
+class TestReportSnapshot(TransactionCase):
+    """Rows written to a snapshot must read back the same, whole or by range"""
+
+    COLUMNS = ('order_id', 'order_date', 'day', 'customer_name', 'quantity', 'note')
+
+    def _make_rows(self, count):
+        return [{
+            'order_id': index,
+            'order_date': datetime(2024, 1, 1 + index % 28, 10, 30, 15),
+            'day': date(2024, 2, 1 + index % 28),
+            'customer_name': f"Customer {index}",
+            'quantity': index * 1.5,
+            'note': None if index % 2 else "é ✓",
+        } for index in range(count)]
+
+    def _expected(self, rows):
+        # Dates come back in the format Odoo writes them to date and datetime fields
+        return [dict(
+            row,
+            order_date=row['order_date'].strftime('%Y-%m-%d %H:%M:%S'),
+            day=row['day'].isoformat(),
+        ) for row in rows]
+
+    def test_round_trip(self):
+        rows = self._make_rows(10)
+        with SnapshotReader.from_bytes(build_snapshot(self.COLUMNS, rows, page_size=3)) as reader:
+            self.assertEqual(reader.columns, list(self.COLUMNS))
+            self.assertEqual(reader.row_count, 10)
+            self.assertEqual(reader.page_count, 4)
+            self.assertEqual(list(reader), self._expected(rows))
+
+    def test_sequence_rows(self):
+        rows = self._make_rows(4)
+        sequences = [[row[column] for column in self.COLUMNS] for row in rows]
+        with SnapshotReader.from_bytes(build_snapshot(self.COLUMNS, sequences, page_size=3)) as reader:
+            self.assertEqual(list(reader), self._expected(rows))
+
+    def test_read_rows(self):
+        rows = self._make_rows(10)
+        expected = self._expected(rows)
+        with SnapshotReader.from_bytes(build_snapshot(self.COLUMNS, rows, page_size=3)) as reader:
+            # Within a page, across pages, on page boundaries and past the end
+            for start, count in [(0, 2), (2, 5), (3, 3), (6, 4), (9, 5), (10, 1), (0, 0), (0, 20)]:
+                self.assertEqual(reader.read_rows(start, count), expected[start:start + count],
+                                 f"rows {start} to {start + count}")
+            self.assertEqual(reader.read_page(3), expected[9:])
+
+    def test_empty(self):
+        with SnapshotReader.from_bytes(build_snapshot(self.COLUMNS, [])) as reader:
+            self.assertEqual(reader.row_count, 0)
+            self.assertEqual(reader.page_count, 0)
+            self.assertEqual(list(reader), [])
+            self.assertEqual(reader.read_rows(0, 10), [])
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            SnapshotReader.from_bytes(b'not a snapshot at all')
+        with self.assertRaises(TypeError):
+            build_snapshot(('value',), [{'value': object()}])
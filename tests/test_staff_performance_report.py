@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+from datetime import timedelta
+
+from odoo.tests import tagged
+from odoo.addons.myreport.tests.common import TestPosReportCommon
+
+
+@tagged('post_install', '-at_install')
+class TestStaffPerformanceReport(TestPosReportCommon):
+
+    def _create_report(self):
+        return self.env['pos.staff.performance.report'].create({
+            'start_date': self.now - timedelta(days=1),
+            'end_date': self.now + timedelta(days=1),
+            'branch_ids': [(6, 0, self.pos_config.ids)],
+            'include_payment_breakdown': True,
+        })
+
+    def _get_result(self, report):
+        """Totals, lines and payment breakdown of ``report``, comparable between reports"""
+        return {
+            'totals': [report[name] for name in (
+                'total_employees', 'total_orders', 'total_quantity', 'total_sales', 'total_commission')],
+            'lines': sorted(
+                (line.order_id.id, line.employee_id.id, line.quantity, line.line_total, line.employee_total_sale)
+                for line in report.report_line_ids
+            ),
+            'payments': sorted(
+                (line.branch_name or '', line.employee_name or '', line.payment_method, line.order_count, line.amount)
+                for line in report.payment_line_ids
+            ),
+        }
+
+    def test_refresh_orders(self):
+        cashier = self.env['hr.employee'].create({'name': 'Refresh Cashier'})
+        newcomer = self.env['hr.employee'].create({'name': 'Refresh Newcomer'})
+        changed = self._create_order([(1.0, 100.0), (2.0, 50.0)], employee=cashier)
+        moved = self._create_order([(3.0, 20.0)])
+        paid_later = self._create_order([(1.0, 30.0)], employee=cashier)
+        for order in (changed, moved, self._create_order([(2.0, 10.0)], employee=cashier)):
+            self._pay(order)
+
+        report = self._create_report()
+        report.action_generate_report()
+        self.assertTrue(report.payment_line_ids)
+
+        changed.lines[0].write({'qty': 3.0})
+        moved.write({'date_order': self.now - timedelta(days=30)})
+        self._pay(paid_later)
+        added = self._create_order([(4.0, 25.0)], employee=newcomer)
+        self._pay(added)
+
+        # The untouched order keeps its line and payments, the breakdown is adjusted by difference
+        self.assertTrue(report._can_refresh())
+        self.env.flush_all()
+        report._refresh_orders((changed | moved | paid_later | added).ids)
+
+        expected = self._create_report()
+        expected.action_generate_report()
+        result, expected_result = self._get_result(report), self._get_result(expected)
+        self.assertEqual(result['lines'], expected_result['lines'])
+        self.assertEqual(result['payments'], expected_result['payments'])
+        for value, expected_value in zip(result['totals'], expected_result['totals']):
+            self.assertAlmostEqual(value, expected_value)
+        self.assertEqual(report.total_employees, 2)
+        self.assertEqual(
+            sorted(report.order_payment_ids.mapped('order_id').ids),
+            sorted(expected.order_payment_ids.mapped('order_id').ids),
+        )
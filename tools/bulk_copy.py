@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""Bulk loading of rows with PostgreSQL ``COPY ... FROM STDIN``.
+
+Rows are encoded to the COPY text format lazily while PostgreSQL reads them,
+so an iterator of any size is loaded without building the whole payload.
+"""
+from datetime import date, datetime
+
+_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def copy_value(value):
+    """Encode one value in the COPY text format"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S.%f')
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (int, float)):
+        return repr(value)
+    return str(value).translate(_ESCAPES)
+
+
+class CopyStream:
+    """File-like object serving ``rows`` as COPY text to ``cursor.copy_expert``"""
+
+    def __init__(self, rows):
+        self._lines = ('\t'.join(map(copy_value, row)) + '\n' for row in rows)
+        self._buffer = b''
+        self.row_count = 0
+
+    def read(self, size=-1):
+        chunks = [self._buffer]
+        length = len(self._buffer)
+        while size < 0 or length < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            data = line.encode('utf-8')
+            chunks.append(data)
+            length += len(data)
+            self.row_count += 1
+        buffer = b''.join(chunks)
+        if size < 0:
+            self._buffer = b''
+            return buffer
+        self._buffer = buffer[size:]
+        return buffer[:size]
+
+
+def copy_rows(cr, table, columns, rows):
+    """Load ``rows`` (sequences in ``columns`` order) into ``table``, return the row count"""
+    stream = CopyStream(rows)
+    column_list = ', '.join(f'"{column}"' for column in columns)
+    cr.copy_expert(f'COPY "{table}" ({column_list}) FROM STDIN', stream)
+    return stream.row_count
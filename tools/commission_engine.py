@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""Batched commission calculation shared by the commission reports.
+
+All employees (or employee x period rows) are computed in one call on column
+arrays. NumPy is used when available; the pure Python path gives the same
+results and keeps the module installable without it.
+"""
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def compute_commissions(sales, targets, rates, category_sales=None, category_rates=None, tiers=None, cap=0.0):
+    """Return ``(earned, achievement)`` lists for the given employees.
+
+    :param sales: total sales per employee
+    :param targets: sales target per employee; no commission is earned below it
+    :param rates: flat commission rate (%) per employee
+    :param category_sales: optional rows x categories matrix with each employee's
+        sales in the categories that have their own rate
+    :param category_rates: rate (%) of each column of ``category_sales``; these
+        sales earn that rate instead of the employee's flat rate
+    :param tiers: optional ``[(min_sales, rate), ...]`` brackets applied to the
+        remaining sales: sales below the first bracket earn the employee's flat
+        rate, the part of the sales falling in each bracket earns its rate
+    :param cap: maximum commission per employee, 0 for no cap
+    """
+    tiers = sorted(tiers or [])
+    if numpy is not None:
+        return _compute_numpy(sales, targets, rates, category_sales, category_rates, tiers, cap)
+    return _compute_python(sales, targets, rates, category_sales, category_rates, tiers, cap)
+
+
+def _compute_numpy(sales, targets, rates, category_sales, category_rates, tiers, cap):
+    sales = numpy.asarray(sales, dtype=float)
+    targets = numpy.asarray(targets, dtype=float)
+    rates = numpy.asarray(rates, dtype=float)
+
+    base = sales.copy()
+    earned = numpy.zeros_like(sales)
+    if category_rates:
+        matrix = numpy.asarray(category_sales, dtype=float).reshape(len(sales), len(category_rates))
+        earned += matrix @ (numpy.asarray(category_rates, dtype=float) / 100)
+        base -= matrix.sum(axis=1)
+
+    if tiers:
+        bounds = numpy.array([tier[0] for tier in tiers] + [numpy.inf])
+        earned += numpy.minimum(base, bounds[0]) * rates / 100
+        for index, (_min_sales, rate) in enumerate(tiers):
+            in_bracket = numpy.clip(base, bounds[index], bounds[index + 1]) - bounds[index]
+            earned += in_bracket * rate / 100
+    else:
+        earned += base * rates / 100
+
+    if cap:
+        earned = numpy.minimum(earned, cap)
+    earned = numpy.where(sales >= targets, earned, 0.0)
+
+    achievement = numpy.zeros_like(sales)
+    numpy.divide(sales * 100, targets, out=achievement, where=targets > 0)
+    return earned.tolist(), achievement.tolist()
+
+
+def _compute_python(sales, targets, rates, category_sales, category_rates, tiers, cap):
+    earned_list, achievement_list = [], []
+    for row, (total, target, rate) in enumerate(zip(sales, targets, rates)):
+        base = total
+        earned = 0.0
+        if category_rates:
+            for amount, category_rate in zip(category_sales[row], category_rates):
+                earned += amount * category_rate / 100
+                base -= amount
+
+        if tiers:
+            earned += min(base, tiers[0][0]) * rate / 100
+            for index, (min_sales, tier_rate) in enumerate(tiers):
+                upper = tiers[index + 1][0] if index + 1 < len(tiers) else float('inf')
+                earned += (min(max(base, min_sales), upper) - min_sales) * tier_rate / 100
+        else:
+            earned += base * rate / 100
+
+        if cap:
+            earned = min(earned, cap)
+        earned_list.append(earned if total >= target else 0.0)
+        achievement_list.append(total / target * 100 if target > 0 else 0.0)
+    return earned_list, achievement_list
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""Column-oriented, compressed snapshots of generated report rows.
+
+A snapshot is written page by page. Each page holds ``page_size`` rows stored
+column by column as JSON and compressed with zlib, so a reader only inflates
+the pages it actually needs. The page index is kept in a footer so the writer
+can stream pages to a file without knowing the row count up front:
+
+    <page 0><page 1>...<footer JSON><footer length: 4 bytes><MAGIC>
+"""
+import io
+import json
+import struct
+import zlib
+from datetime import date, datetime
+
+MAGIC = b'PRSNAP01'
+_FOOTER_LENGTH = struct.Struct('>I')
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Cannot store {type(value).__name__} values in a report snapshot")
+
+
+class SnapshotWriter:
+    """Write rows (dicts or sequences in column order) to ``fileobj`` as a snapshot"""
+
+    def __init__(self, fileobj, columns, page_size=1000, level=6):
+        self.fileobj = fileobj
+        self.columns = list(columns)
+        self.page_size = page_size
+        self.level = level
+        self.row_count = 0
+        self._buffer = []
+        self._pages = []
+        self._offset = 0
+
+    def add(self, row):
+        if isinstance(row, dict):
+            row = [row.get(column) for column in self.columns]
+        self._buffer.append(row)
+        self.row_count += 1
+        if len(self._buffer) >= self.page_size:
+            self._flush_page()
+
+    def extend(self, rows):
+        for row in rows:
+            self.add(row)
+
+    def _flush_page(self):
+        if not self._buffer:
+            return
+        columns = [list(values) for values in zip(*self._buffer)]
+        payload = json.dumps(columns, default=_encode_value, separators=(',', ':')).encode()
+        blob = zlib.compress(payload, self.level)
+        self.fileobj.write(blob)
+        self._pages.append((self._offset, len(blob)))
+        self._offset += len(blob)
+        self._buffer = []
+
+    def close(self):
+        self._flush_page()
+        footer = json.dumps({
+            'columns': self.columns,
+            'page_size': self.page_size,
+            'rows': self.row_count,
+            'pages': self._pages,
+        }).encode()
+        self.fileobj.write(footer)
+        self.fileobj.write(_FOOTER_LENGTH.pack(len(footer)))
+        self.fileobj.write(MAGIC)
+
+
+def build_snapshot(columns, rows, page_size=1000):
+    """Return the snapshot of ``rows`` as bytes"""
+    buffer = io.BytesIO()
+    writer = SnapshotWriter(buffer, columns, page_size)
+    writer.extend(rows)
+    writer.close()
+    return buffer.getvalue()
+
+
+class SnapshotReader:
+    """Random access to the pages of a snapshot; pages are inflated on demand"""
+
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+        trailer_size = _FOOTER_LENGTH.size + len(MAGIC)
+        fileobj.seek(-trailer_size, io.SEEK_END)
+        trailer = fileobj.read(trailer_size)
+        if trailer[-len(MAGIC):] != MAGIC:
+            raise ValueError("Not a report snapshot")
+        footer_length, = _FOOTER_LENGTH.unpack(trailer[:_FOOTER_LENGTH.size])
+        fileobj.seek(-(trailer_size + footer_length), io.SEEK_END)
+        footer = json.loads(fileobj.read(footer_length))
+        self.columns = footer['columns']
+        self.page_size = footer['page_size']
+        self.row_count = footer['rows']
+        self._pages = footer['pages']
+
+    @classmethod
+    def from_bytes(cls, data):
+        return cls(io.BytesIO(data))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.fileobj.close()
+
+    @property
+    def page_count(self):
+        return len(self._pages)
+
+    def read_page(self, index):
+        """Return the rows of page ``index`` as dicts"""
+        offset, length = self._pages[index]
+        self.fileobj.seek(offset)
+        values = json.loads(zlib.decompress(self.fileobj.read(length)))
+        return [dict(zip(self.columns, row)) for row in zip(*values)]
+
+    def read_rows(self, start, count):
+        """Return ``count`` rows from row ``start``, inflating only the pages they span"""
+        end = min(start + count, self.row_count)
+        if start >= end:
+            return []
+        rows = []
+        first_page, last_page = start // self.page_size, (end - 1) // self.page_size
+        for index in range(first_page, last_page + 1):
+            rows += self.read_page(index)
+        skip = start - first_page * self.page_size
+        return rows[skip:skip + end - start]
+
+    def __iter__(self):
+        for index in range(self.page_count):
+            yield from self.read_page(index)